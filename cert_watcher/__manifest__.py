@@ -1,6 +1,6 @@
 {
     'name': 'Certificate Monitor',
-    'version': '18.0.1.0.3',
+    'version': '18.0.1.2.0',
     'category': 'Security',
     'summary': 'Monitor SSL certificates via HTTP requests without local storage',
     'description': """
@@ -15,9 +15,12 @@ Features:
 * Monitor SSL certificates for any domain via HTTP/HTTPS
 * Real-time certificate information retrieval
 * Certificate expiry tracking and alerts
+* Deduplicated expiry digests (30/14/7/1 days) queued once per recipient per probe run
 * Kanban view for easy domain management
+* Bulk domain import (host:port lists or zone files) with concurrent probing
+* Host discovery from Subject Alternative Names
 * Detailed certificate information display
-* HTTP to HTTPS redirect checking
+* HTTP to HTTPS redirect checking and scheduled fleet-wide redirect audit
 * No local certificate storage required
 * Automatic certificate status updates
 
@@ -27,7 +30,8 @@ Certificate Information:
 * Issuer information
 * Subject Alternative Names (SAN)
 * Serial numbers and signature algorithms
-* Response time monitoring
+* Response time monitoring, split into DNS, TCP connect, TLS handshake and parse phases
+* Latency percentiles (p50/p95/p99) per domain and per issuer
 * Reachability status
 
 Requirements:
@@ -39,12 +43,15 @@ Requirements:
     'author': 'Egeskov-group',
     'website': 'https://github.com/cert-monitor',
     'license': 'LGPL-3',
-    'depends': ['base', 'web'],
+    'depends': ['base', 'web', 'mail'],
     'data': [
         'security/ir.model.access.csv',
         'views/ssl_certificate_views.xml',
+        'views/ssl_certificate_latency_views.xml',
+        'wizard/ssl_certificate_import_wizard_views.xml',
         'views/menu_views.xml',
         'data/ir_cron_data.xml',
+        'data/expiry_alert_templates.xml',
     ],
     'external_dependencies': {
         'python': ['requests', 'cryptography'],
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+from odoo import http
+from odoo.http import request
+
+
+class CertWatcherController(http.Controller):
+
+    @http.route('/cert_watcher/import', type='json', auth='user')
+    def import_domains(self, domains, default_port=443, probe=True, discover_san=False):
+        """Bulk import domains to monitor and return the created records"""
+        certificate_model = request.env['ssl.certificate']
+        certificates = certificate_model.import_domains(domains, default_port, probe=probe)
+        if discover_san:
+            certificates |= certificate_model.discover_san_hosts(probe=probe)
+        return {
+            'created': len(certificates),
+            'certificates': [
+                {'id': cert.id, 'domain': cert.domain, 'port': cert.port}
+                for cert in certificates
+            ],
+        }
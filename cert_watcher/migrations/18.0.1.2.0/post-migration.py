@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tools import SQL
+
+
+def migrate(cr, version):
+    """Keep certificates imported before probe_pending existed queued for their first probe"""
+    cr.execute(SQL("UPDATE ssl_certificate SET probe_pending = TRUE WHERE last_check IS NULL"))
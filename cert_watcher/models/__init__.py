@@ -1 +1,3 @@
-from . import ssl_certificate
\ No newline at end of file
+from . import ssl_certificate
+from . import ssl_certificate_probe
+from . import ssl_certificate_latency_report
\ No newline at end of file
@@ -4,15 +4,34 @@ import requests
 import json
 import subprocess
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlparse
+
+from requests.adapters import HTTPAdapter
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools import SQL
 import logging
 
 _logger = logging.getLogger(__name__)
 
+DOMAIN_PATTERN = re.compile(
+    r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$'
+)
+# Zone-file records whose owner name is imported; any other record line is skipped
+ZONE_ADDRESS_TYPES = ('A', 'AAAA', 'CNAME')
+ZONE_RECORD_TYPES = ZONE_ADDRESS_TYPES + (
+    'MX', 'NS', 'TXT', 'SOA', 'SRV', 'PTR', 'CAA', 'DNAME', 'DS', 'DNSKEY', 'RRSIG', 'NSEC',
+    'NSEC3', 'NSEC3PARAM', 'TLSA', 'SSHFP', 'SPF', 'HINFO', 'NAPTR', 'HTTPS', 'SVCB', 'LOC', 'URI',
+)
+ZONE_CLASSES = ('IN', 'CH', 'HS')
+REDIRECT_STATUS_CODES = (301, 302, 303, 307, 308)
+DEFAULT_ALERT_THRESHOLDS = (30, 14, 7, 1)
+
+
 class SSLCertificate(models.Model):
     _name = 'ssl.certificate'
     _description = 'SSL Certificate Monitor'
@@ -101,18 +120,50 @@ class SSLCertificate(models.Model):
         compute='_compute_certificate_info',
         store=True
     )
+    dns_time = fields.Float(
+        string='DNS Time (ms)',
+        compute='_compute_certificate_info',
+        store=True
+    )
+    connect_time = fields.Float(
+        string='TCP Connect Time (ms)',
+        compute='_compute_certificate_info',
+        store=True
+    )
+    handshake_time = fields.Float(
+        string='TLS Handshake Time (ms)',
+        compute='_compute_certificate_info',
+        store=True
+    )
+    parse_time = fields.Float(
+        string='Certificate Parse Time (ms)',
+        compute='_compute_certificate_info',
+        store=True
+    )
+    probe_ids = fields.One2many(
+        'ssl.certificate.probe',
+        'certificate_id',
+        string='Probe History'
+    )
     
     # Last Check Information
     last_check = fields.Datetime(
         string='Last Check',
         compute='_compute_certificate_info',
-        store=True
+        store=True,
+        index=True
     )
     error_message = fields.Text(
         string='Error Message',
         compute='_compute_certificate_info',
         store=True
     )
+    probe_pending = fields.Boolean(
+        string='Probe Pending',
+        readonly=True,
+        index=True,
+        help='Queued by a bulk import for cron_probe_pending_certificates'
+    )
     
     # Raw Certificate Data
     certificate_data = fields.Text(
@@ -122,6 +173,81 @@ class SSLCertificate(models.Model):
         help='Raw certificate information as JSON'
     )
 
+    # Expiry Alerts
+    alert_partner_ids = fields.Many2many(
+        'res.partner',
+        string='Alert Recipients',
+        help='Contacts receiving the expiry digest for this certificate. '
+             'When empty, the addresses in the cert_watcher.alert_email_to system parameter are used.'
+    )
+    alert_threshold = fields.Integer(
+        string='Alert Threshold (days)',
+        compute='_compute_alert_threshold',
+        store=True,
+        help='Smallest alert threshold reached by the certificate, 0 once expired, -1 when none applies'
+    )
+    alert_sent_threshold = fields.Integer(
+        string='Last Alerted Threshold',
+        default=-1,
+        readonly=True
+    )
+    alert_sent_valid_until = fields.Datetime(
+        string='Alerted Expiry Date',
+        readonly=True,
+        help='Expiry date of the certificate the last alert was sent for'
+    )
+    alert_pending = fields.Boolean(
+        string='Alert Pending',
+        compute='_compute_alert_threshold',
+        store=True,
+        index=True
+    )
+
+    # HTTP Redirect Audit
+    http_status_code = fields.Integer(
+        string='HTTP Status',
+        readonly=True,
+        help='Status code of the first response to http://<domain>'
+    )
+    http_redirects_to_https = fields.Boolean(
+        string='Redirects to HTTPS',
+        readonly=True
+    )
+    http_redirect_count = fields.Integer(
+        string='Redirect Hops',
+        readonly=True
+    )
+    http_final_url = fields.Char(
+        string='Final URL',
+        readonly=True
+    )
+    http_final_status_code = fields.Integer(
+        string='Final HTTP Status',
+        readonly=True
+    )
+    http_redirect_chain = fields.Text(
+        string='Redirect Chain',
+        readonly=True
+    )
+    http_hsts = fields.Char(
+        string='HSTS Header',
+        readonly=True,
+        help='Strict-Transport-Security header returned by the final HTTPS response'
+    )
+    http_latency = fields.Float(
+        string='HTTP Latency (ms)',
+        readonly=True,
+        help='Total time to follow the redirect chain'
+    )
+    http_error = fields.Char(
+        string='HTTP Audit Error',
+        readonly=True
+    )
+    http_last_check = fields.Datetime(
+        string='Last HTTP Audit',
+        readonly=True
+    )
+
     @api.depends('domain', 'port')
     def _compute_certificate_info(self):
         """Fetch certificate information via HTTP/SSL"""
@@ -156,9 +282,49 @@ class SSLCertificate(models.Model):
             else:
                 record.state = 'valid'
 
+    @api.model
+    def _get_alert_thresholds(self):
+        """Alert thresholds in days, largest first, from cert_watcher.alert_thresholds"""
+        value = self.env['ir.config_parameter'].sudo().get_param('cert_watcher.alert_thresholds')
+        try:
+            thresholds = {int(days) for days in value.split(',') if days.strip()} if value else set()
+        except ValueError:
+            thresholds = set()
+        return sorted(thresholds or DEFAULT_ALERT_THRESHOLDS, reverse=True)
+
+    @api.depends('valid_until', 'days_until_expiry', 'alert_sent_threshold', 'alert_sent_valid_until')
+    def _compute_alert_threshold(self):
+        """Compute the alert threshold reached and whether a notification is due.
+
+        A notification is due once per certificate (identified by its expiry
+        date) and threshold, so a renewed certificate starts over.
+        """
+        thresholds = self._get_alert_thresholds()
+        now = fields.Datetime.now()
+        for record in self:
+            threshold = -1
+            if record.valid_until:
+                if record.valid_until < now:
+                    threshold = 0
+                else:
+                    reached = [days for days in thresholds if record.days_until_expiry <= days]
+                    threshold = reached[-1] if reached else -1
+            record.alert_threshold = threshold
+            if threshold < 0:
+                record.alert_pending = False
+            elif record.alert_sent_valid_until != record.valid_until:
+                record.alert_pending = True
+            else:
+                record.alert_pending = record.alert_sent_threshold < 0 or threshold < record.alert_sent_threshold
+
     def _reset_certificate_fields(self):
         """Reset all certificate fields to default values"""
-        self.update({
+        self.update(self._get_reset_certificate_values())
+
+    @api.model
+    def _get_reset_certificate_values(self):
+        """Default values of the fields computed by _compute_certificate_info"""
+        return {
             'issuer': False,
             'subject': False,
             'serial_number': False,
@@ -169,13 +335,32 @@ class SSLCertificate(models.Model):
             'san_domains': False,
             'is_reachable': False,
             'response_time': 0.0,
+            'dns_time': 0.0,
+            'connect_time': 0.0,
+            'handshake_time': 0.0,
+            'parse_time': 0.0,
             'certificate_data': False,
             'error_message': False,
-        })
+        }
+
+    @api.model
+    def _get_pending_probe_values(self, probe=True):
+        """Create values of a certificate stored without probing.
+
+        Computed fields given at create are not recomputed, so the record keeps
+        an empty last_check until it is probed: by cron_probe_pending_certificates
+        when ``probe`` is set, otherwise by the next full refresh.
+        """
+        return dict(self._get_reset_certificate_values(), last_check=False, probe_pending=probe)
 
     def _update_certificate_fields(self, cert_info):
         """Update certificate fields with fetched information"""
-        self.update({
+        self.update(self._prepare_certificate_values(cert_info))
+
+    @api.model
+    def _prepare_certificate_values(self, cert_info):
+        """Map the result of a probe onto certificate field values"""
+        return {
             'issuer': cert_info.get('issuer'),
             'subject': cert_info.get('subject'),
             'serial_number': cert_info.get('serial_number'),
@@ -186,24 +371,82 @@ class SSLCertificate(models.Model):
             'san_domains': cert_info.get('san_domains'),
             'is_reachable': cert_info.get('is_reachable', False),
             'response_time': cert_info.get('response_time', 0.0),
+            'dns_time': cert_info.get('dns_time', 0.0),
+            'connect_time': cert_info.get('connect_time', 0.0),
+            'handshake_time': cert_info.get('handshake_time', 0.0),
+            'parse_time': cert_info.get('parse_time', 0.0),
             'certificate_data': json.dumps(cert_info, indent=2, default=str),
             'error_message': cert_info.get('error_message'),
             'last_check': fields.Datetime.now(),
-        })
+            'probe_pending': False,
+        }
 
     def _fetch_certificate_info(self):
         """Fetch certificate information using SSL connection"""
-        start_time = datetime.now()
+        return self._probe_endpoint(self.domain, self.port)
+
+    @api.model
+    def _create_ssl_context(self):
+        """SSL context used to verify probed certificates"""
+        return ssl.create_default_context()
+
+    @api.model
+    def _probe_endpoint(self, domain, port, timeout=10):
+        """Probe a single host:port and return the certificate information.
+
+        Each phase (DNS, TCP connect, TLS handshake, certificate parse) is timed
+        separately with a monotonic clock and reported in milliseconds.
+
+        This method does not touch the environment or the database cursor so it
+        can safely run inside the worker threads of _probe_certificates.
+        """
+        timings = {}
+        start_time = phase_start = time.perf_counter()
+
+        def end_phase(name):
+            nonlocal phase_start
+            now = time.perf_counter()
+            timings[name] = (now - phase_start) * 1000
+            phase_start = now
+
+        def failure(is_reachable, error_message):
+            return dict(
+                timings,
+                is_reachable=is_reachable,
+                error_message=error_message,
+                response_time=(time.perf_counter() - start_time) * 1000,
+            )
         
         try:
             # Create SSL context
-            context = ssl.create_default_context()
+            context = self._create_ssl_context()
             
-            # Connect to the domain
-            with socket.create_connection((self.domain, self.port), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=self.domain) as ssock:
-                    # Calculate response time
-                    response_time = (datetime.now() - start_time).total_seconds() * 1000
+            # Resolve the domain
+            addresses = socket.getaddrinfo(domain, port, type=socket.SOCK_STREAM)
+            end_phase('dns_time')
+            
+            # Connect to the first reachable address
+            sock = None
+            last_error = None
+            for family, socktype, proto, _canonname, sockaddr in addresses:
+                try:
+                    sock = socket.socket(family, socktype, proto)
+                    sock.settimeout(timeout)
+                    sock.connect(sockaddr)
+                    break
+                except OSError as e:
+                    # socket() itself fails for a disabled address family (e.g. IPv6)
+                    last_error = e
+                    if sock is not None:
+                        sock.close()
+                    sock = None
+            if sock is None:
+                raise last_error or OSError(f'Could not connect to {domain}:{port}')
+            end_phase('connect_time')
+            
+            with sock:
+                with context.wrap_socket(sock, server_hostname=domain) as ssock:
+                    end_phase('handshake_time')
                     
                     # Get certificate
                     cert_der = ssock.getpeercert(binary_form=True)
@@ -222,7 +465,6 @@ class SSLCertificate(models.Model):
                     # Extract certificate information
                     cert_info = {
                         'is_reachable': True,
-                        'response_time': response_time,
                         'issuer': cert.issuer.rfc4514_string(),
                         'subject': cert.subject.rfc4514_string(),
                         'serial_number': str(cert.serial_number),
@@ -257,41 +499,134 @@ class SSLCertificate(models.Model):
                     
                     # Add raw certificate data
                     cert_info['raw_cert'] = cert_dict
+                    end_phase('parse_time')
                     
+                    cert_info.update(timings)
+                    cert_info['response_time'] = (time.perf_counter() - start_time) * 1000
                     return cert_info
                     
         except socket.timeout:
-            return {
-                'is_reachable': False,
-                'error_message': 'Connection timeout',
-                'response_time': (datetime.now() - start_time).total_seconds() * 1000
-            }
+            return failure(False, 'Connection timeout')
         except socket.gaierror as e:
-            return {
-                'is_reachable': False,
-                'error_message': f'DNS resolution failed: {str(e)}',
-                'response_time': (datetime.now() - start_time).total_seconds() * 1000
-            }
+            return failure(False, f'DNS resolution failed: {str(e)}')
         except ssl.SSLError as e:
-            return {
-                'is_reachable': True,
-                'error_message': f'SSL Error: {str(e)}',
-                'response_time': (datetime.now() - start_time).total_seconds() * 1000
-            }
+            return failure(True, f'SSL Error: {str(e)}')
         except Exception as e:
-            return {
-                'is_reachable': False,
-                'error_message': f'Unexpected error: {str(e)}',
-                'response_time': (datetime.now() - start_time).total_seconds() * 1000
-            }
+            return failure(False, f'Unexpected error: {str(e)}')
+
+    def _get_probe_timeout(self):
+        """Probe timeout in seconds, configurable via system parameter"""
+        timeout = self.env['ir.config_parameter'].sudo().get_param('cert_watcher.probe_timeout', 10)
+        try:
+            return max(0.1, float(timeout))
+        except (TypeError, ValueError):
+            return 10
+
+    def _get_probe_workers(self):
+        """Number of concurrent probes, configurable via system parameter"""
+        workers = self.env['ir.config_parameter'].sudo().get_param('cert_watcher.probe_workers', 20)
+        try:
+            return max(1, int(workers))
+        except (TypeError, ValueError):
+            return 20
+
+    def _probe_certificates(self):
+        """Probe all certificates in self concurrently.
+
+        Network I/O runs in a thread pool; results are written back from the
+        calling thread since the cursor is not thread-safe.
+        """
+        targets = [(record.id, record.domain, record.port or 443) for record in self if record.domain]
+        if not targets:
+            return {}
+        timeout = self._get_probe_timeout()
+
+        def probe(target):
+            record_id, domain, port = target
+            try:
+                return record_id, self._probe_endpoint(domain, port, timeout)
+            except Exception as e:
+                return record_id, {'is_reachable': False, 'error_message': f'Unexpected error: {str(e)}'}
+
+        with ThreadPoolExecutor(max_workers=min(self._get_probe_workers(), len(targets))) as executor:
+            results = dict(executor.map(probe, targets))
+
+        for record in self.browse(list(results)):
+            record.write(self._prepare_certificate_values(results[record.id]))
+        self.env['ssl.certificate.probe'].sudo()._log_probes(results)
+        self._send_expiry_alerts()
+        return results
+
+    @api.model
+    def _get_default_alert_emails(self):
+        """Fallback recipients from the cert_watcher.alert_email_to system parameter"""
+        value = self.env['ir.config_parameter'].sudo().get_param('cert_watcher.alert_email_to') or ''
+        return [email.strip() for email in value.split(',') if email.strip()]
+
+    @api.model
+    def _send_expiry_alerts(self):
+        """Queue one expiry digest per recipient for all certificates with a pending alert.
+
+        Only records flagged by the indexed alert_pending column are loaded, so
+        the cost follows the number of state transitions, not the table size.
+        """
+        self.env.flush_all()
+        pending = self.search([('alert_pending', '=', True)], order='alert_threshold, domain')
+        if not pending:
+            return self.env['mail.mail']
+
+        default_emails = self._get_default_alert_emails()
+        digests = {}
+        alerted = self.browse()
+        for record in pending:
+            recipients = [partner.email_formatted for partner in record.alert_partner_ids if partner.email]
+            recipients = recipients or default_emails
+            if not recipients:
+                # Stays pending until a recipient is configured
+                continue
+            alerted |= record
+            for email in recipients:
+                digests.setdefault(email, self.browse())
+                digests[email] |= record
+
+        mail_values = []
+        for email, certificates in digests.items():
+            body = self.env['ir.qweb']._render('cert_watcher.expiry_alert_digest', {
+                'certificates': certificates,
+            })
+            mail_values.append({
+                'subject': _('Certificate expiry digest: %d certificates need attention') % len(certificates),
+                'body_html': body,
+                'email_to': email,
+                'auto_delete': True,
+            })
+        mails = self.env['mail.mail'].sudo().create(mail_values)
+
+        if alerted:
+            # One statement for all sent markers, the alert_pending flags are then recomputed
+            self.env.cr.execute(SQL("""
+                UPDATE ssl_certificate
+                   SET alert_sent_threshold = alert_threshold,
+                       alert_sent_valid_until = valid_until,
+                       write_uid = %s,
+                       write_date = %s
+                 WHERE id = ANY(%s)
+            """, self.env.uid, self.env.cr.now(), alerted.ids))
+            alerted.invalidate_recordset(['alert_sent_threshold', 'alert_sent_valid_until', 'write_uid', 'write_date'])
+            alerted.modified(['alert_sent_threshold', 'alert_sent_valid_until'])
+        if pending - alerted:
+            _logger.warning(f"{len(pending - alerted)} expiry alerts left pending without recipients; "
+                            f"set alert recipients or cert_watcher.alert_email_to")
+        _logger.info(f"Queued {len(mails)} expiry digests covering {len(alerted)} certificates")
+        return mails
 
     def action_refresh_certificate(self):
         """Manually refresh certificate information"""
         self.ensure_one()
         
         try:
-            # Trigger recomputation
-            self._compute_certificate_info()
+            # Probe through the engine so the latency history is recorded
+            self._probe_certificates()
             
             # Force invalidate cache to ensure UI updates
             self.invalidate_recordset()
@@ -323,52 +658,134 @@ class SSLCertificate(models.Model):
         """Check if HTTP redirects to HTTPS"""
         self.ensure_one()
         
-        try:
-            # Check HTTP redirect
-            http_url = f"http://{self.domain}"
-            response = requests.get(http_url, allow_redirects=False, timeout=10)
-            
-            redirect_info = {
-                'status_code': response.status_code,
-                'redirects_to_https': False,
-                'location': response.headers.get('Location', ''),
-            }
-            
-            if response.status_code in [301, 302, 303, 307, 308]:
-                location = response.headers.get('Location', '')
-                if location.startswith('https://'):
-                    redirect_info['redirects_to_https'] = True
-            
-            message = _('HTTP Status: %s') % response.status_code
-            if redirect_info['redirects_to_https']:
-                message += _('\nRedirects to HTTPS: Yes')
-                notification_type = 'success'
-            else:
-                message += _('\nRedirects to HTTPS: No')
-                notification_type = 'warning'
-                
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'title': _('HTTP Redirect Check'),
-                    'message': message,
-                    'type': notification_type,
-                    'sticky': False,
-                }
-            }
-            
-        except Exception as e:
+        self._audit_http_redirects()
+        
+        if self.http_error:
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
                 'params': {
                     'title': _('HTTP Check Failed'),
-                    'message': _('Failed to check HTTP redirect: %s') % str(e),
+                    'message': _('Failed to check HTTP redirect: %s') % self.http_error,
                     'type': 'danger',
                     'sticky': False,
                 }
             }
+        
+        message = _('HTTP Status: %s') % self.http_status_code
+        if self.http_redirects_to_https:
+            message += _('\nRedirects to HTTPS: Yes')
+            notification_type = 'success'
+        else:
+            message += _('\nRedirects to HTTPS: No')
+            notification_type = 'warning'
+        if self.http_hsts:
+            message += _('\nHSTS: %s') % self.http_hsts
+            
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('HTTP Redirect Check'),
+                'message': message,
+                'type': notification_type,
+                'sticky': False,
+            }
+        }
+
+    @api.model
+    def _get_http_max_redirects(self):
+        """Maximum number of redirect hops followed by the HTTP audit"""
+        max_redirects = self.env['ir.config_parameter'].sudo().get_param('cert_watcher.http_max_redirects', 5)
+        try:
+            return max(0, int(max_redirects))
+        except (TypeError, ValueError):
+            return 5
+
+    @api.model
+    def _audit_http_endpoint(self, session, domain, max_redirects=5):
+        """Follow the redirect chain of http://<domain> and summarise it.
+
+        Like _probe_endpoint this does not touch the environment, so it can run
+        in worker threads sharing one pooled requests session.
+        """
+        url = f"http://{domain}"
+        chain = [url]
+        result = {
+            'http_status_code': 0,
+            'http_redirects_to_https': False,
+            'http_redirect_count': 0,
+            'http_final_url': url,
+            'http_final_status_code': 0,
+            'http_hsts': False,
+            'http_error': False,
+        }
+        start_time = time.monotonic()
+        try:
+            for hop in range(max_redirects + 1):
+                response = session.get(url, allow_redirects=False, timeout=10)
+                response.close()
+                if hop == 0:
+                    result['http_status_code'] = response.status_code
+                result['http_final_status_code'] = response.status_code
+                location = response.headers.get('Location')
+                if response.status_code not in REDIRECT_STATUS_CODES or not location:
+                    if url.startswith('https://'):
+                        result['http_hsts'] = response.headers.get('Strict-Transport-Security') or False
+                    break
+                url = urljoin(url, location)
+                chain.append(url)
+                result['http_redirect_count'] = hop + 1
+            else:
+                result['http_error'] = f'Too many redirects (more than {max_redirects})'
+        except requests.RequestException as e:
+            result['http_error'] = str(e)
+        except Exception as e:
+            # e.g. a malformed Location header: only this domain fails, not the whole audit
+            _logger.warning(f"HTTP redirect audit failed for {domain}: {e}", exc_info=True)
+            result['http_error'] = f'Unexpected error: {str(e)}'
+        result['http_final_url'] = url
+        result['http_redirects_to_https'] = result['http_redirect_count'] > 0 and url.startswith('https://')
+        result['http_redirect_chain'] = '\n'.join(chain)
+        result['http_latency'] = (time.monotonic() - start_time) * 1000
+        return result
+
+    def _audit_http_redirects(self):
+        """Run the HTTP to HTTPS redirect audit concurrently for all records in self"""
+        targets = [(record.id, record.domain) for record in self if record.domain]
+        if not targets:
+            return {}
+        
+        workers = min(self._get_probe_workers(), len(targets))
+        max_redirects = self._get_http_max_redirects()
+        
+        with requests.Session() as session:
+            adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            
+            def audit(target):
+                record_id, domain = target
+                return record_id, self._audit_http_endpoint(session, domain, max_redirects)
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = dict(executor.map(audit, targets))
+        
+        now = fields.Datetime.now()
+        for record in self.browse(list(results)):
+            record.write(dict(results[record.id], http_last_check=now))
+        return results
+
+    @api.model
+    def cron_audit_http_redirects(self):
+        """Cron job auditing HTTP to HTTPS redirects for all domains"""
+        certificates = self.search([])
+        _logger.info(f"Starting HTTP redirect audit for {len(certificates)} domains")
+        
+        results = certificates._audit_http_redirects()
+        missing = sum(1 for info in results.values() if not info['http_redirects_to_https'])
+        
+        _logger.info(f"HTTP redirect audit completed: {len(results) - missing} redirect to HTTPS, {missing} do not")
 
     @api.model
     def cron_refresh_certificates(self):
@@ -376,29 +793,203 @@ class SSLCertificate(models.Model):
         certificates = self.search([])
         _logger.info(f"Starting cron job to refresh {len(certificates)} certificates")
         
-        success_count = 0
-        error_count = 0
-        
-        for cert in certificates:
-            try:
-                cert._compute_certificate_info()
-                _logger.info(f"Refreshed certificate info for: {cert.domain}")
-                success_count += 1
-            except Exception as e:
-                _logger.error(f"Failed to refresh certificate for {cert.domain}: {e}")
-                error_count += 1
+        results = certificates._probe_certificates()
+        error_count = sum(1 for info in results.values() if info.get('error_message'))
         
-        _logger.info(f"Cron job completed: {success_count} successful, {error_count} failed")
+        _logger.info(f"Cron job completed: {len(results) - error_count} successful, {error_count} failed")
+        self.env['ssl.certificate.probe']._purge_old_probes()
+
+    @api.model
+    def cron_probe_pending_certificates(self, batch_size=500):
+        """Probe certificates that were imported with a probe requested"""
+        pending = self.search([('probe_pending', '=', True)], limit=batch_size)
+        if not pending:
+            return
+        _logger.info(f"Probing {len(pending)} pending certificates")
+        pending._probe_certificates()
+        if self.search_count([('probe_pending', '=', True)]):
+            self.env.ref('cert_watcher.ir_cron_ssl_certificate_probe_pending')._trigger()
+
+    @api.model
+    def _normalize_host(self, value):
+        """Normalize a host, host:port or URL entry to (domain, port or None)"""
+        value = (value or '').strip().lower()
+        if not value:
+            return None, None
+        if '://' not in value:
+            value = f"//{value}"
+        try:
+            parsed = urlparse(value)
+            domain, port = parsed.hostname, parsed.port
+        except ValueError:
+            return None, None
+        if not domain or (port is not None and not 1 <= port <= 65535):
+            return None, None
+        domain = domain.rstrip('.')
+        if not DOMAIN_PATTERN.match(domain):
+            return None, None
+        return domain, port
+
+    @api.model
+    def _parse_import_lines(self, text, default_port=443, origin=None):
+        """Parse host:port lines or zone-file records into a deduplicated list,
+        see _parse_import_entries"""
+        return self._parse_import_entries(text, default_port, origin)[0]
+
+    @api.model
+    def _parse_import_entries(self, text, default_port=443, origin=None):
+        """Parse host:port lines or zone-file records into a deduplicated list.
+
+        Supported entries:
+        - ``host``, ``host:port`` and ``https://host:port/path``
+        - zone-file records (``name [ttl] [IN] A|AAAA|CNAME value``); relative
+          names are completed with ``origin``, ``@`` stands for the origin and
+          records without a name (indented lines) belong to the previous name.
+          Other records (MX, NS, TXT, SOA, ...) are skipped.
+        Comments starting with ``#`` or ``;`` and wildcard names are skipped.
+
+        Returns:
+            tuple: ordered list of unique (domain, port) tuples, and the list of
+            entries rejected as invalid (bad host name, port outside 1-65535)
+        """
+        origin = (origin or '').strip().strip('.').lower()
+        entries = []
+        rejected = []
+        seen = set()
+        owner = None
+        in_parentheses = False
+        for line in (text or '').splitlines():
+            line = re.split(r'[#;]', line, maxsplit=1)[0]
+            if in_parentheses:
+                # Rest of a multi-line record (e.g. the SOA timers)
+                in_parentheses = ')' not in line
+                continue
+            in_parentheses = '(' in line and ')' not in line
+            continuation = line[:1].isspace()
+            line = line.strip()
+            if not line or line.startswith('$'):
+                if line.upper().startswith('$ORIGIN'):
+                    parts = line.split()
+                    origin = parts[1].strip('.').lower() if len(parts) > 1 else origin
+                continue
+            tokens = line.replace(',', ' ').split()
+            upper_tokens = [token.upper() for token in tokens]
+            record_type = next((token for token in upper_tokens if token in ZONE_RECORD_TYPES), None)
+            if len(tokens) > 1 and (record_type or any(token in ZONE_CLASSES for token in upper_tokens)):
+                # Zone-file record: only the owner name of address records is of interest
+                first = upper_tokens[0]
+                if not (continuation or first in ZONE_RECORD_TYPES or first in ZONE_CLASSES or first.isdigit()):
+                    owner = tokens[0]
+                if record_type not in ZONE_ADDRESS_TYPES or not owner:
+                    continue
+                name = owner
+                if name == '@':
+                    name = origin
+                elif not name.endswith('.') and origin:
+                    name = f"{name}.{origin}"
+                tokens = [name]
+            for token in tokens:
+                if token.startswith('*'):
+                    continue
+                domain, port = self._normalize_host(token)
+                if not domain:
+                    rejected.append(token)
+                    continue
+                key = (domain, port or default_port)
+                if key not in seen:
+                    seen.add(key)
+                    entries.append(key)
+        return entries, rejected
+
+    @api.model
+    def import_domains(self, entries, default_port=443, probe=True):
+        """Bulk import domains to monitor.
+
+        Args:
+            entries: text with one host[:port] per line, or a list of strings
+                or (domain, port) pairs
+            default_port: port used for entries without an explicit port
+            probe: enqueue the created records for probing, otherwise they
+                are left for the next full refresh
+        Returns:
+            ssl.certificate recordset of the newly created records
+        """
+        if isinstance(entries, str):
+            targets = self._parse_import_lines(entries, default_port)
+        else:
+            targets = []
+            seen = set()
+            for entry in entries:
+                if isinstance(entry, (list, tuple)):
+                    domain, port = self._normalize_host(entry[0])
+                    port = int(entry[1]) if len(entry) > 1 and entry[1] else port
+                    if port is not None and not 1 <= port <= 65535:
+                        continue
+                else:
+                    domain, port = self._normalize_host(entry)
+                if domain and (domain, port or default_port) not in seen:
+                    seen.add((domain, port or default_port))
+                    targets.append((domain, port or default_port))
+        if not targets:
+            return self.browse()
+
+        # Stored domains may differ in case or surrounding spaces from the normalized targets
+        self.flush_model(['domain', 'port'])
+        self.env.cr.execute(SQL(
+            "SELECT lower(trim(domain)), port FROM ssl_certificate WHERE lower(trim(domain)) = ANY(%s)",
+            list({domain for domain, _port in targets}),
+        ))
+        existing = set(self.env.cr.fetchall())
+        vals_list = [
+            dict(self._get_pending_probe_values(probe), domain=domain, port=port)
+            for domain, port in targets if (domain, port) not in existing
+        ]
+        if not vals_list:
+            return self.browse()
+
+        certificates = self.create(vals_list)
+        _logger.info(f"Imported {len(certificates)} domains ({len(targets) - len(vals_list)} already monitored)")
+        if probe:
+            self.env.ref('cert_watcher.ir_cron_ssl_certificate_probe_pending')._trigger()
+        return certificates
+
+    def _get_san_hosts(self):
+        """Return the concrete (non-wildcard) SAN hosts of the certificates in self"""
+        hosts = []
+        for record in self:
+            for name in (record.san_domains or '').splitlines():
+                name = name.strip().lower()
+                if name and not name.startswith('*') and name != (record.domain or '').lower():
+                    hosts.append((name, record.port or 443))
+        return hosts
+
+    @api.model
+    def discover_san_hosts(self, probe=True):
+        """Create certificates for hosts listed in SANs of already probed certificates"""
+        sources = self.search([('san_domains', '!=', False)])
+        return self.import_domains(sources._get_san_hosts(), probe=probe)
+
+    def action_discover_san_hosts(self):
+        """Discover new hosts from the SANs of the selected certificates"""
+        certificates = self.import_domains(self._get_san_hosts())
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('SAN Discovery'),
+                'message': _('%d new domains discovered and queued for probing.') % len(certificates),
+                'type': 'success' if certificates else 'info',
+                'sticky': False,
+            }
+        }
 
     @api.constrains('domain')
     def _check_domain_format(self):
         """Validate domain format"""
-        import re
         for record in self:
             if record.domain:
                 # Basic domain validation
-                domain_pattern = r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$'
-                if not re.match(domain_pattern, record.domain.strip().lower()):
+                if not DOMAIN_PATTERN.match(record.domain.strip().lower()):
                     raise ValidationError(_("Invalid domain format"))
 
     @api.constrains('port')
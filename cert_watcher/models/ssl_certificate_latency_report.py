@@ -0,0 +1,67 @@
+from odoo import models, fields, tools
+
+from .ssl_certificate_probe import PROBE_PHASES
+
+
+class SSLCertificateLatencyReport(models.Model):
+    _name = 'ssl.certificate.latency.report'
+    _description = 'SSL Probe Latency Report'
+    _auto = False
+    _order = 'window_days, scope, response_p95 desc'
+
+    window_days = fields.Integer(string='Window (days)', readonly=True)
+    scope = fields.Selection([
+        ('domain', 'Domain'),
+        ('issuer', 'Issuer'),
+    ], string='Scope', readonly=True)
+    certificate_id = fields.Many2one('ssl.certificate', string='Certificate', readonly=True)
+    issuer = fields.Char(string='Issuer', readonly=True)
+    probe_count = fields.Integer(string='Probes', readonly=True)
+
+    response_p50 = fields.Float(string='Total p50 (ms)', readonly=True)
+    response_p95 = fields.Float(string='Total p95 (ms)', readonly=True)
+    response_p99 = fields.Float(string='Total p99 (ms)', readonly=True)
+    dns_p50 = fields.Float(string='DNS p50 (ms)', readonly=True)
+    dns_p95 = fields.Float(string='DNS p95 (ms)', readonly=True)
+    dns_p99 = fields.Float(string='DNS p99 (ms)', readonly=True)
+    connect_p50 = fields.Float(string='Connect p50 (ms)', readonly=True)
+    connect_p95 = fields.Float(string='Connect p95 (ms)', readonly=True)
+    connect_p99 = fields.Float(string='Connect p99 (ms)', readonly=True)
+    handshake_p50 = fields.Float(string='Handshake p50 (ms)', readonly=True)
+    handshake_p95 = fields.Float(string='Handshake p95 (ms)', readonly=True)
+    handshake_p99 = fields.Float(string='Handshake p99 (ms)', readonly=True)
+    parse_p50 = fields.Float(string='Parse p50 (ms)', readonly=True)
+    parse_p95 = fields.Float(string='Parse p95 (ms)', readonly=True)
+    parse_p99 = fields.Float(string='Parse p99 (ms)', readonly=True)
+
+    def init(self):
+        # Windows are read at query time from the cert_watcher.latency_windows
+        # system parameter (comma separated number of days, default 1,7,30)
+        percentile_columns = ',\n'.join(
+            f"percentile_cont({fraction}) WITHIN GROUP (ORDER BY p.{phase}) AS {phase.split('_')[0]}_p{label}"
+            for phase in PROBE_PHASES
+            for fraction, label in ((0.5, 50), (0.95, 95), (0.99, 99))
+        )
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(f"""
+            CREATE OR REPLACE VIEW {self._table} AS (
+                WITH windows AS (
+                    SELECT DISTINCT trim(days)::integer AS window_days
+                      FROM unnest(string_to_array(COALESCE(
+                               (SELECT value FROM ir_config_parameter WHERE key = 'cert_watcher.latency_windows'),
+                               '1,7,30'), ',')) AS days
+                     WHERE trim(days) ~ '^[0-9]+$'
+                )
+                SELECT row_number() OVER () AS id,
+                       w.window_days,
+                       CASE WHEN GROUPING(p.certificate_id) = 1 THEN 'issuer' ELSE 'domain' END AS scope,
+                       p.certificate_id,
+                       p.issuer,
+                       count(*) AS probe_count,
+                       {percentile_columns}
+                  FROM ssl_certificate_probe p
+                  JOIN windows w ON p.probe_date >= (now() AT TIME ZONE 'UTC') - w.window_days * interval '1 day'
+                 WHERE p.is_reachable
+              GROUP BY w.window_days, GROUPING SETS ((p.certificate_id, p.issuer), (p.issuer))
+            )
+        """)
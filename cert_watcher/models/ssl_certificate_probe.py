@@ -0,0 +1,131 @@
+from datetime import timedelta
+
+from odoo import models, fields, api, _
+import logging
+
+_logger = logging.getLogger(__name__)
+
+PROBE_PHASES = ('dns_time', 'connect_time', 'handshake_time', 'parse_time', 'response_time')
+
+
+class SSLCertificateProbe(models.Model):
+    _name = 'ssl.certificate.probe'
+    _description = 'SSL Certificate Probe Measurement'
+    _order = 'probe_date desc, id desc'
+    _rec_name = 'certificate_id'
+
+    certificate_id = fields.Many2one(
+        'ssl.certificate',
+        string='Certificate',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    domain = fields.Char(
+        related='certificate_id.domain',
+        string='Domain'
+    )
+    issuer = fields.Char(
+        string='Issuer',
+        index=True,
+        help='Issuer at the time of the probe'
+    )
+    probe_date = fields.Datetime(
+        string='Probe Date',
+        required=True,
+        default=fields.Datetime.now,
+        index=True
+    )
+    is_reachable = fields.Boolean(string='Reachable')
+    error_message = fields.Char(string='Error Message')
+
+    # Phase timings, all in milliseconds
+    dns_time = fields.Float(string='DNS (ms)')
+    connect_time = fields.Float(string='TCP Connect (ms)')
+    handshake_time = fields.Float(string='TLS Handshake (ms)')
+    parse_time = fields.Float(string='Certificate Parse (ms)')
+    response_time = fields.Float(string='Total (ms)')
+
+    @api.model
+    def _log_probes(self, results):
+        """Store one measurement per probe result.
+
+        Args:
+            results: dict mapping ssl.certificate ids to _probe_endpoint results
+        """
+        if not results:
+            return self.browse()
+        now = fields.Datetime.now()
+        vals_list = []
+        for certificate_id, cert_info in results.items():
+            vals = {
+                'certificate_id': certificate_id,
+                'issuer': cert_info.get('issuer'),
+                'probe_date': now,
+                'is_reachable': cert_info.get('is_reachable', False),
+                'error_message': (cert_info.get('error_message') or '')[:255] or False,
+            }
+            vals.update({phase: cert_info.get(phase, 0.0) for phase in PROBE_PHASES})
+            vals_list.append(vals)
+        return self.create(vals_list)
+
+    @api.model
+    def _purge_old_probes(self):
+        """Remove measurements older than cert_watcher.probe_retention_days"""
+        retention = self.env['ir.config_parameter'].sudo().get_param('cert_watcher.probe_retention_days', 90)
+        try:
+            retention = int(retention)
+        except (TypeError, ValueError):
+            retention = 90
+        if retention <= 0:
+            return
+        limit_date = fields.Datetime.now() - timedelta(days=retention)
+        self.env.cr.execute("DELETE FROM ssl_certificate_probe WHERE probe_date < %s", (limit_date,))
+        _logger.info(f"Purged {self.env.cr.rowcount} probe measurements older than {retention} days")
+
+    @api.model
+    def get_latency_percentiles(self, group_by='domain', window_hours=24, percentiles=(0.5, 0.95, 0.99)):
+        """Return latency percentiles per domain or issuer over a time window.
+
+        Args:
+            group_by: 'domain' or 'issuer'
+            window_hours: size of the window ending now
+            percentiles: percentiles to compute, as fractions
+        Returns:
+            list of dicts with the group key, the probe count and, for each
+            phase, a dict mapping 'p50', 'p95'... to milliseconds
+        """
+        if group_by not in ('domain', 'issuer'):
+            raise ValueError(_("group_by must be 'domain' or 'issuer'"))
+        self.flush_model()
+        key = 'p.certificate_id' if group_by == 'domain' else 'p.issuer'
+        percentiles = [float(p) for p in percentiles]
+        columns = ', '.join(
+            f"percentile_cont(%(percentiles)s::float8[]) WITHIN GROUP (ORDER BY p.{phase})"
+            for phase in PROBE_PHASES
+        )
+        self.env.cr.execute(f"""
+            SELECT {key}, count(*), {columns}
+              FROM ssl_certificate_probe p
+             WHERE p.is_reachable
+               AND p.probe_date >= %(date_from)s
+          GROUP BY {key}
+        """, {
+            'percentiles': percentiles,
+            'date_from': fields.Datetime.now() - timedelta(hours=window_hours),
+        })
+        labels = ['p%g' % round(p * 100, 2) for p in percentiles]
+        rows = self.env.cr.fetchall()
+        if group_by == 'domain':
+            certificates = self.env['ssl.certificate'].browse([row[0] for row in rows])
+            names = dict(zip(certificates.ids, certificates.mapped('domain')))
+        result = []
+        for row in rows:
+            entry = {
+                group_by: names.get(row[0]) if group_by == 'domain' else row[0],
+                'probe_count': row[1],
+            }
+            for phase, values in zip(PROBE_PHASES, row[2:]):
+                entry[phase] = dict(zip(labels, values))
+            result.append(entry)
+        return result
@@ -0,0 +1,2 @@
+from . import test_ssl_certificate_probe
+from . import test_probe_benchmark
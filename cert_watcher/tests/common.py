@@ -0,0 +1,31 @@
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase
+
+from .tls_harness import HOSTNAME, TLSHarness
+
+
+class CertWatcherTLSCase(TransactionCase):
+    """Base class running probes against the local TLS harness"""
+
+    harness_options = {}
+    probe_timeout = 0.5
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.harness = TLSHarness(**cls.harness_options).start()
+        cls.addClassCleanup(cls.harness.stop)
+        Certificate = cls.env['ssl.certificate']
+        context_patcher = patch.object(
+            type(Certificate), '_create_ssl_context', lambda self: cls.harness.client_context())
+        context_patcher.start()
+        cls.addClassCleanup(context_patcher.stop)
+        cls.env['ir.config_parameter'].sudo().set_param('cert_watcher.probe_timeout', cls.probe_timeout)
+
+    def _create_certificates(self, ports):
+        """Create certificates on the harness host without probing them"""
+        Certificate = self.env['ssl.certificate']
+        return Certificate.create([
+            dict(Certificate._get_pending_probe_values(), domain=HOSTNAME, port=port) for port in ports
+        ])
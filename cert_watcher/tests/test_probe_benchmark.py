@@ -0,0 +1,65 @@
+import logging
+import time
+
+from odoo.tests import tagged
+
+from .common import CertWatcherTLSCase
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('-standard', 'cert_watcher_benchmark', 'post_install', '-at_install')
+class TestProbeBenchmark(CertWatcherTLSCase):
+    """Sweep throughput and tail latency of the probe engine.
+
+    Not part of the standard suite, run with::
+
+        odoo-bin -d <db> -i cert_watcher --test-tags cert_watcher_benchmark --stop-after-init
+    """
+
+    harness_options = {'extra_valid_servers': 9}
+    probe_timeout = 5
+
+    # Regression guards, deliberately loose so they hold on shared CI runners
+    min_throughput = 20.0
+    max_p99_ms = 1000.0
+
+    def _percentile(self, values, fraction):
+        values = sorted(values)
+        index = min(len(values) - 1, max(0, round(fraction * (len(values) - 1))))
+        return values[index]
+
+    def _sweep(self, endpoints):
+        ports = self.harness.valid_ports
+        certificates = self._create_certificates([ports[i % len(ports)] for i in range(endpoints)])
+        start = time.perf_counter()
+        results = certificates._probe_certificates()
+        elapsed = time.perf_counter() - start
+
+        latencies = [info['response_time'] for info in results.values()]
+        stats = {
+            'endpoints': endpoints,
+            'throughput': endpoints / elapsed,
+            'p50': self._percentile(latencies, 0.5),
+            'p95': self._percentile(latencies, 0.95),
+            'p99': self._percentile(latencies, 0.99),
+        }
+        _logger.info(
+            "Probe sweep of %(endpoints)d endpoints: %(throughput).1f probes/s, "
+            "p50 %(p50).1fms, p95 %(p95).1fms, p99 %(p99).1fms", stats)
+
+        self.assertTrue(all(info.get('is_reachable') and not info.get('error_message') for info in results.values()))
+        return stats
+
+    def test_sweep_10(self):
+        self._sweep(10)
+
+    def test_sweep_100(self):
+        stats = self._sweep(100)
+        self.assertGreaterEqual(stats['throughput'], self.min_throughput)
+        self.assertLessEqual(stats['p99'], self.max_p99_ms)
+
+    def test_sweep_1000(self):
+        stats = self._sweep(1000)
+        self.assertGreaterEqual(stats['throughput'], self.min_throughput)
+        self.assertLessEqual(stats['p99'], self.max_p99_ms)
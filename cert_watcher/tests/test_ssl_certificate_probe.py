@@ -0,0 +1,154 @@
+from odoo.tests import tagged
+
+from .common import CertWatcherTLSCase
+from .tls_harness import CA_NAME
+
+
+@tagged('post_install', '-at_install')
+class TestSSLCertificateProbe(CertWatcherTLSCase):
+
+    def _probe(self, scenario):
+        certificate = self._create_certificates([self.harness.ports[scenario]])
+        certificate._probe_certificates()
+        return certificate
+
+    def test_valid_certificate(self):
+        certificate = self._probe('valid')
+        self.assertEqual(certificate.state, 'valid')
+        self.assertTrue(certificate.is_reachable)
+        self.assertFalse(certificate.error_message)
+        self.assertIn(CA_NAME, certificate.issuer)
+        self.assertIn('localhost', certificate.san_domains)
+        self.assertGreaterEqual(certificate.days_until_expiry, 88)
+        self.assertTrue(certificate.last_check)
+
+    def test_phase_timings(self):
+        certificate = self._probe('valid')
+        for phase in ('dns_time', 'connect_time', 'handshake_time', 'parse_time'):
+            self.assertGreater(certificate[phase], 0, phase)
+        phases = certificate.dns_time + certificate.connect_time + certificate.handshake_time + certificate.parse_time
+        self.assertLessEqual(phases, certificate.response_time)
+        self.assertEqual(len(certificate.probe_ids), 1)
+        self.assertEqual(certificate.probe_ids.handshake_time, certificate.handshake_time)
+
+    def test_near_expiry_certificate(self):
+        certificate = self._probe('near_expiry')
+        self.assertEqual(certificate.state, 'expiring_soon')
+        self.assertLessEqual(certificate.days_until_expiry, 5)
+        self.assertEqual(certificate.alert_threshold, 7)
+
+    def test_expired_certificate(self):
+        certificate = self._probe('expired')
+        self.assertEqual(certificate.state, 'error')
+        self.assertIn('certificate has expired', certificate.error_message)
+
+    def test_self_signed_certificate(self):
+        certificate = self._probe('self_signed')
+        self.assertEqual(certificate.state, 'error')
+        self.assertIn('self-signed', certificate.error_message)
+
+    def test_wrong_host_certificate(self):
+        certificate = self._probe('wrong_host')
+        self.assertEqual(certificate.state, 'error')
+        self.assertIn('Hostname mismatch', certificate.error_message)
+
+    def test_slow_handshake(self):
+        certificate = self._probe('slow_handshake')
+        self.assertEqual(certificate.state, 'unreachable')
+        self.assertEqual(certificate.error_message, 'Connection timeout')
+        self.assertLess(certificate.response_time, self.harness.handshake_delay * 1000)
+
+    def test_closed_port(self):
+        certificate = self._probe('closed_port')
+        self.assertEqual(certificate.state, 'unreachable')
+        self.assertFalse(certificate.is_reachable)
+        self.assertIn('refused', certificate.error_message)
+
+    def test_concurrent_sweep(self):
+        ports = self.harness.ports
+        certificates = self._create_certificates([ports[scenario] for scenario in ports])
+        results = certificates._probe_certificates()
+        self.assertEqual(set(results), set(certificates.ids))
+        states = dict(zip(ports.values(), certificates.mapped('state')))
+        self.assertEqual(states[ports['valid']], 'valid')
+        self.assertEqual(states[ports['closed_port']], 'unreachable')
+
+    def test_expiry_alert_deduplication(self):
+        self.env['ir.config_parameter'].sudo().set_param('cert_watcher.alert_email_to', 'ops@example.com')
+        certificate = self._probe('near_expiry')
+        self.assertFalse(certificate.alert_pending)
+        self.assertEqual(certificate.alert_sent_threshold, 7)
+        mails = self.env['mail.mail'].search([('email_to', '=', 'ops@example.com')])
+        self.assertEqual(len(mails), 1)
+        self.assertIn('localhost', mails.body_html)
+
+        certificate._probe_certificates()
+        self.assertEqual(self.env['mail.mail'].search_count([('email_to', '=', 'ops@example.com')]), 1)
+
+    def test_import_domains(self):
+        text = "localhost:%d\nLOCALHOST:%d\n*.example.com\n# comment\nlocalhost:%d" % (
+            self.harness.ports['valid'], self.harness.ports['valid'], self.harness.ports['near_expiry'])
+        certificates = self.env['ssl.certificate'].import_domains(text)
+        self.assertEqual(len(certificates), 2)
+        # Stored unprobed: the search flushes, so a pending probe compute would fill last_check
+        self.assertEqual(self.env['ssl.certificate'].search_count([
+            ('id', 'in', certificates.ids), ('last_check', '=', False), ('is_reachable', '=', False),
+            ('probe_pending', '=', True),
+        ]), 2)
+        self.assertFalse(certificates.probe_ids)
+        self.assertFalse(self.env['ssl.certificate'].import_domains(text))
+
+        self.env['ssl.certificate'].cron_probe_pending_certificates()
+        self.assertEqual(set(certificates.mapped('state')), {'valid', 'expiring_soon'})
+        self.assertFalse(any(certificates.mapped('probe_pending')))
+
+    def test_import_domains_without_probe(self):
+        certificates = self.env['ssl.certificate'].import_domains(
+            "localhost:%d" % self.harness.ports['valid'], probe=False)
+        self.assertFalse(certificates.probe_pending)
+        # Left for the daily refresh, not for the pending probe cron
+        self.env['ssl.certificate'].cron_probe_pending_certificates()
+        self.assertFalse(certificates.last_check)
+        self.assertFalse(certificates.probe_ids)
+
+    def test_import_invalid_ports(self):
+        entries, rejected = self.env['ssl.certificate']._parse_import_entries(
+            "example.com:0\nexample.com:65536\nexample.com:-1\nexample.com:8443\nexample.com:65535")
+        self.assertEqual(entries, [('example.com', 8443), ('example.com', 65535)])
+        self.assertEqual(rejected, ['example.com:0', 'example.com:65536', 'example.com:-1'])
+        self.assertFalse(self.env['ssl.certificate'].import_domains([('example.com', 70000)], probe=False))
+
+    def test_parse_zone_file(self):
+        zone = "\n".join([
+            "$ORIGIN example.com.",
+            "@ IN SOA ns1.example.com. admin.example.com. (",
+            "        2024010101 ; serial",
+            "        3600 )",
+            "@ IN NS ns1.example.com.",
+            "@ IN MX 10 mail.example.com.",
+            "@ 3600 IN A 192.0.2.1",
+            "    IN AAAA 2001:db8::1",
+            "www IN CNAME example.com.",
+            "txt IN TXT \"v=spf1 -all\"",
+            "api 300 A 192.0.2.2",
+            "    IN MX 10 mail",
+        ])
+        self.assertEqual(self.env['ssl.certificate']._parse_import_lines(zone), [
+            ('example.com', 443), ('www.example.com', 443), ('api.example.com', 443),
+        ])
+
+    def test_import_existing_domain_case(self):
+        self.env['ssl.certificate'].create(dict(
+            self.env['ssl.certificate']._get_pending_probe_values(), domain='Example.com', port=443))
+        self.assertFalse(self.env['ssl.certificate'].import_domains("example.com\nEXAMPLE.COM:443", probe=False))
+
+    def test_expiry_alert_without_recipient(self):
+        self.env['ir.config_parameter'].sudo().set_param('cert_watcher.alert_email_to', '')
+        certificate = self._probe('near_expiry')
+        self.assertTrue(certificate.alert_pending)
+        self.assertEqual(certificate.alert_sent_threshold, -1)
+
+        self.env['ir.config_parameter'].sudo().set_param('cert_watcher.alert_email_to', 'ops@example.com')
+        self.env['ssl.certificate']._send_expiry_alerts()
+        self.assertFalse(certificate.alert_pending)
+        self.assertEqual(certificate.alert_sent_threshold, 7)
@@ -0,0 +1,188 @@
+"""Local TLS servers with generated certificates for offline probe tests.
+
+The harness only depends on the standard library and ``cryptography`` so it can
+also be used from a plain Python shell to reproduce probe issues.
+"""
+
+import os
+import shutil
+import socket
+import socketserver
+import ssl
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+HOSTNAME = 'localhost'
+CA_NAME = 'Cert Watcher Test CA'
+
+
+class _TLSHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        if self.server.handshake_delay:
+            time.sleep(self.server.handshake_delay)
+        try:
+            with self.server.ssl_context.wrap_socket(self.request, server_side=True) as ssock:
+                # Wait for the client to close the connection
+                ssock.settimeout(5)
+                try:
+                    ssock.recv(1)
+                except (OSError, ssl.SSLError):
+                    pass
+        except (OSError, ssl.SSLError):
+            # Clients rejecting our certificate abort the handshake
+            pass
+
+
+class _TLSServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 256
+
+    def __init__(self, ssl_context, handshake_delay=0):
+        self.ssl_context = ssl_context
+        self.handshake_delay = handshake_delay
+        super().__init__(('127.0.0.1', 0), _TLSHandler)
+
+
+class TLSHarness:
+    """Start local TLS endpoints for the standard probe scenarios.
+
+    Usage::
+
+        with TLSHarness() as harness:
+            port = harness.ports['valid']
+            context = ssl.create_default_context(cafile=harness.ca_file)
+
+    Scenarios: ``valid``, ``expired``, ``near_expiry``, ``self_signed``,
+    ``wrong_host`` and ``slow_handshake`` are served on ``localhost``;
+    ``closed_port`` is a port nothing listens on.
+    """
+
+    def __init__(self, handshake_delay=2.0, near_expiry_days=5, extra_valid_servers=0):
+        self.handshake_delay = handshake_delay
+        self.near_expiry_days = near_expiry_days
+        self.extra_valid_servers = extra_valid_servers
+        self.ports = {}
+        self.valid_ports = []
+        self._servers = []
+        self._directory = None
+
+    # Certificate generation
+
+    def _new_key(self):
+        return ec.generate_private_key(ec.SECP256R1())
+
+    def _build_certificate(self, subject_cn, hostnames, not_before, not_after, key, issuer_name=None,
+                           issuer_key=None, is_ca=False):
+        subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, subject_cn)])
+        builder = (
+            x509.CertificateBuilder()
+            .subject_name(subject)
+            .issuer_name(issuer_name or subject)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(not_before)
+            .not_valid_after(not_after)
+            .add_extension(x509.BasicConstraints(ca=is_ca, path_length=None), critical=True)
+        )
+        if hostnames:
+            builder = builder.add_extension(
+                x509.SubjectAlternativeName([x509.DNSName(name) for name in hostnames]), critical=False)
+        return builder.sign(issuer_key or key, hashes.SHA256())
+
+    def _write_pem(self, name, certificate, key=None):
+        cert_path = os.path.join(self._directory, f'{name}.crt')
+        with open(cert_path, 'wb') as f:
+            f.write(certificate.public_bytes(serialization.Encoding.PEM))
+        if key is None:
+            return cert_path, None
+        key_path = os.path.join(self._directory, f'{name}.key')
+        with open(key_path, 'wb') as f:
+            f.write(key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.TraditionalOpenSSL,
+                serialization.NoEncryption(),
+            ))
+        return cert_path, key_path
+
+    def _issue(self, name, hostnames, not_before, not_after, self_signed=False):
+        key = self._new_key()
+        if self_signed:
+            certificate = self._build_certificate(name, hostnames, not_before, not_after, key)
+        else:
+            certificate = self._build_certificate(
+                name, hostnames, not_before, not_after, key,
+                issuer_name=self.ca_certificate.subject, issuer_key=self.ca_key)
+        return self._write_pem(name, certificate, key)
+
+    # Servers
+
+    def _serve(self, cert_path, key_path, handshake_delay=0):
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_path, key_path)
+        server = _TLSServer(context, handshake_delay)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self._servers.append(server)
+        return server.server_address[1]
+
+    @staticmethod
+    def _closed_port():
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    def start(self):
+        self._directory = tempfile.mkdtemp(prefix='cert_watcher_tls_')
+        now = datetime.now(timezone.utc)
+
+        self.ca_key = self._new_key()
+        self.ca_certificate = self._build_certificate(
+            CA_NAME, None, now - timedelta(days=1), now + timedelta(days=3650), self.ca_key, is_ca=True)
+        self.ca_file = self._write_pem('ca', self.ca_certificate)[0]
+
+        scenarios = {
+            'valid': self._issue('valid', [HOSTNAME], now - timedelta(days=1), now + timedelta(days=90)),
+            'expired': self._issue('expired', [HOSTNAME], now - timedelta(days=90), now - timedelta(days=1)),
+            'near_expiry': self._issue(
+                'near_expiry', [HOSTNAME], now - timedelta(days=60), now + timedelta(days=self.near_expiry_days)),
+            'self_signed': self._issue(
+                'self_signed', [HOSTNAME], now - timedelta(days=1), now + timedelta(days=90), self_signed=True),
+            'wrong_host': self._issue(
+                'wrong_host', ['wrong-host.example.test'], now - timedelta(days=1), now + timedelta(days=90)),
+        }
+        for name, (cert_path, key_path) in scenarios.items():
+            self.ports[name] = self._serve(cert_path, key_path)
+        cert_path, key_path = scenarios['valid']
+        self.ports['slow_handshake'] = self._serve(cert_path, key_path, self.handshake_delay)
+        self.valid_ports = [self.ports['valid']] + [
+            self._serve(cert_path, key_path) for _i in range(self.extra_valid_servers)
+        ]
+        self.ports['closed_port'] = self._closed_port()
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+        if self._directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+    def client_context(self):
+        """Client context trusting the harness CA"""
+        return ssl.create_default_context(cafile=self.ca_file)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -0,0 +1 @@
+from . import ssl_certificate_import_wizard
\ No newline at end of file
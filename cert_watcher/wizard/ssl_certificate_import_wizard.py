@@ -0,0 +1,74 @@
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError, ValidationError
+
+
+class SSLCertificateImportWizard(models.TransientModel):
+    _name = 'ssl.certificate.import.wizard'
+    _description = 'SSL Certificate Bulk Import Wizard'
+
+    domain_list = fields.Text(
+        string='Domains',
+        help='One host, host:port or URL per line. Zone-file records (A, AAAA, CNAME) are also accepted.'
+    )
+    default_port = fields.Integer(
+        string='Default Port',
+        default=443,
+        help='Port used for entries without an explicit port'
+    )
+    zone_origin = fields.Char(
+        string='Zone Origin',
+        help='Domain appended to relative names when importing a zone file (e.g., example.com)'
+    )
+    discover_san = fields.Boolean(
+        string='Discover from SANs',
+        default=False,
+        help='Also add hosts listed in the Subject Alternative Names of already probed certificates'
+    )
+    probe = fields.Boolean(
+        string='Probe After Import',
+        default=True,
+        help='Queue the imported domains for a concurrent certificate probe. '
+             'Otherwise they are first probed by the daily certificate refresh.'
+    )
+
+    @api.constrains('default_port')
+    def _check_default_port(self):
+        for wizard in self:
+            if wizard.default_port < 1 or wizard.default_port > 65535:
+                raise ValidationError(_("Port must be between 1 and 65535"))
+
+    def action_import(self):
+        """Import the domain list and optionally discover SAN hosts"""
+        self.ensure_one()
+        if not self.domain_list and not self.discover_san:
+            raise UserError(_('Please enter at least one domain or enable SAN discovery.'))
+
+        certificate_model = self.env['ssl.certificate']
+        entries, rejected = certificate_model._parse_import_entries(
+            self.domain_list, self.default_port, self.zone_origin)
+        certificates = certificate_model.import_domains(entries, self.default_port, probe=self.probe)
+        # Entries of the list only: SAN hosts are never counted as skipped
+        duplicates = len(entries) - len(certificates)
+        if self.discover_san:
+            certificates |= certificate_model.discover_san_hosts(probe=self.probe)
+
+        message = _('%(imported)d domains imported, %(duplicates)d entries skipped as duplicates.') % {
+            'imported': len(certificates),
+            'duplicates': duplicates,
+        }
+        if rejected:
+            message += '\n' + _('%(count)d invalid entries skipped: %(entries)s') % {
+                'count': len(rejected),
+                'entries': ', '.join(rejected[:10]) + (', ...' if len(rejected) > 10 else ''),
+            }
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Bulk Import'),
+                'message': message,
+                'type': 'success' if certificates and not rejected else 'warning',
+                'sticky': bool(rejected),
+                'next': {'type': 'ir.actions.act_window_close'},
+            }
+        }
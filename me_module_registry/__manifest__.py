@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': "me_module_registry",
-    'version': '18.0.1.1.1',
+    'version': '18.0.1.8.0',
     'license': "OPL-1",
 
     'summary': """
@@ -20,6 +20,15 @@
         - **GitHub Integration**: Automatic synchronization from GitHub repositories
         - **Version Management**: Track module versions across different branches and Odoo versions
         - **Library Organization**: Group modules by repository/library
+        - **Dependency Graph**: Indexed dependency edges with transitive closure and impact queries
+        - **Catalogue Search**: Ranked full-text search with trigram matching on module names
+        - **Installability Resolver**: Check a set of modules against an Odoo series and pick the version to install from each library
+        - **Catalogue**: Flat per Odoo series read model of the latest module versions, also served as JSON
+        - **Catalogue Transfer**: Streaming NDJSON (optionally gzipped) export and import of the whole registry
+        - **Sync Runs**: Per-phase timings and counts of every repository sync, with live progress in the backend
+        - **Series Statistics**: Stored module counts per Odoo series and library, refreshed after each sync
+        - **Snapshots**: Append-only history of the modules per branch, stored as deltas, with a diff between any two sync runs
+        - **Change Feed**: Ordered, append-only log of module versions created, bumped, removed and changing status, paged or long-polled by cursor as JSON
         
         Structure:
         - Module Templates contain static info shared across all versions
@@ -37,7 +46,7 @@
     'category': 'Uncategorized',
 
     # any module necessary for this one to work correctly
-    'depends': ['base','github_integration','me_odoo_version'],
+    'depends': ['base','bus','github_integration','me_odoo_version'],
 
     # always loaded
     'data': [
@@ -47,8 +56,18 @@
         'views/module_template_views.xml',
         'views/module_registry_views.xml',
         'views/module_library_views.xml',
+        'views/module_dependency_views.xml',
+        'views/module_sync_run_views.xml',
+        'views/module_catalogue_views.xml',
+        'views/odoo_version_views.xml',
+        'views/module_registry_event_views.xml',
         'views/menu_views.xml',
     ],
+    'assets': {
+        'web.assets_backend': [
+            'me_module_registry/static/src/js/sync_progress_service.js',
+        ],
+    },
     # only loaded in demonstration mode
     'demo': [],
 
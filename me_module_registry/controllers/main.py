@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields, http
+from odoo.http import content_disposition, request
+from werkzeug.exceptions import BadRequest, Forbidden, NotFound
+from werkzeug.wsgi import wrap_file
+import tempfile
+
+
+class ModuleRegistryController(http.Controller):
+
+    @http.route('/module_registry/catalogue', type='http', auth='user', methods=['GET'])
+    def catalogue(self, odoo_version=None, repository=None, version_status=None, limit=200, offset=0):
+        """Flat catalogue rows (one per module and Odoo series) as JSON"""
+        try:
+            limit, offset = int(limit), int(offset)
+        except ValueError:
+            raise BadRequest('limit and offset must be integers')
+        return request.make_json_response(request.env['module.catalogue'].get_rows(
+            odoo_version=odoo_version, repository=repository, version_status=version_status,
+            limit=limit, offset=offset))
+
+    @http.route('/module_registry/catalogue/export', type='http', auth='user', methods=['GET'])
+    def catalogue_export(self, compress=None):
+        """Download the catalogue as newline-delimited JSON, gzipped with compress=1"""
+        if not request.env.user.has_group('base.group_system'):
+            raise Forbidden()
+        compress = compress in ('1', 'true')
+        export = tempfile.TemporaryFile()
+        request.env['module.transfer'].export_ndjson(export, compress=compress)
+        export.seek(0)
+        filename = 'module_catalogue.ndjson' + ('.gz' if compress else '')
+        return request.make_response(wrap_file(request.httprequest.environ, export), headers=[
+            ('Content-Type', 'application/gzip' if compress else 'application/x-ndjson'),
+            ('Content-Disposition', content_disposition(filename)),
+        ])
+
+    @http.route('/module_registry/catalogue/import', type='http', auth='user', methods=['POST'], csrf=False)
+    def catalogue_import(self, file=None):
+        """Load an exported catalogue file (plain or gzipped) uploaded as "file" """
+        if not request.env.user.has_group('base.group_system'):
+            raise Forbidden()
+        if file is None:
+            raise BadRequest('missing file')
+        return request.make_json_response(request.env['module.transfer'].import_ndjson(file.stream))
+
+    @http.route('/module_registry/sync_runs/diff', type='http', auth='user', methods=['GET'])
+    def sync_run_diff(self, from_run=None, to_run=None):
+        """Modules added, removed, bumped and downgraded per branch between two sync runs of a repository"""
+        try:
+            run_from = request.env['module.sync.run'].browse(int(from_run)).exists()
+            run_to = request.env['module.sync.run'].browse(int(to_run)).exists()
+        except (TypeError, ValueError):
+            raise BadRequest('from_run and to_run must be sync run ids')
+        if not run_from or not run_to:
+            raise NotFound()
+        return request.make_json_response({
+            'repository': run_to.repository_id.full_name,
+            'from_run': run_from.id,
+            'to_run': run_to.id,
+            'branches': request.env['module.snapshot'].diff_runs(run_from, run_to),
+        })
+
+    @http.route('/module_registry/snapshot', type='http', auth='user', methods=['GET'])
+    def snapshot(self, repository=None, branch=None, at=None):
+        """Modules per branch of a repository as synced at a point in time (default: now)"""
+        repository = request.env['github.repository'].search([('full_name', '=', repository)], limit=1)
+        if not repository:
+            raise NotFound()
+        try:
+            at = fields.Datetime.to_datetime(at)
+        except ValueError:
+            raise BadRequest('at must be a date or datetime')
+        return request.make_json_response({
+            'repository': repository.full_name,
+            'at': at,
+            'branches': request.env['module.snapshot'].get_repository_contents(repository, at, branch),
+        })
+
+    @http.route('/module_registry/events', type='http', auth='user', methods=['GET'])
+    def events(self, since=0, limit=100):
+        """Registry change events after the cursor since, as JSON
+
+        Clients waiting for new events listen to the "me_module_registry.events" bus channel instead
+        of polling this route, and read from their cursor when notified.
+        """
+        try:
+            since, limit = int(since), int(limit)
+        except ValueError:
+            raise BadRequest('since and limit must be integers')
+        return request.make_json_response(request.env['module.registry.event'].get_events(since=since, limit=limit))
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Build the dependency edge index for versions synced before it existed"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['module.registry'].rebuild_dependency_index()
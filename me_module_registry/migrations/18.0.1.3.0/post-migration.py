@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+FORMATTED_COLUMNS = [
+    'depends_formatted',
+    'external_dependencies_formatted',
+    'data_files_formatted',
+    'demo_files_formatted',
+    'assets_formatted',
+    'manifest_data_formatted',
+]
+
+
+def migrate(cr, version):
+    """The formatted fields are rendered on read now, drop their stored copies"""
+    cr.execute(
+        "ALTER TABLE module_registry "
+        + ", ".join(f"DROP COLUMN IF EXISTS {column}" for column in FORMATTED_COLUMNS)
+    )
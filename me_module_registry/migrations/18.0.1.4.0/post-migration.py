@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+MANIFEST_COLUMNS = [
+    'manifest_data',
+    'depends',
+    'external_dependencies',
+    'data_files',
+    'demo_files',
+    'assets',
+]
+
+
+def migrate(cr, version):
+    """Move the per-version manifest copies into the content-addressed manifest table"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    cr.execute("SELECT id, manifest_data FROM module_registry WHERE manifest_id IS NULL")
+    manifest_ids = {}
+    for registry_id, manifest_data in cr.fetchall():
+        manifest = env['module.manifest']._get_or_create(manifest_data or {})
+        manifest_ids.setdefault(manifest.id, []).append(registry_id)
+    for manifest_id, registry_ids in manifest_ids.items():
+        cr.execute("UPDATE module_registry SET manifest_id = %s WHERE id = ANY(%s)", [manifest_id, registry_ids])
+    cr.execute(
+        "ALTER TABLE module_registry "
+        + ", ".join(f"DROP COLUMN IF EXISTS {column}" for column in MANIFEST_COLUMNS)
+    )
+    # Dependency edges are derived from the manifests, rebuild them now that they are linked
+    env.invalidate_all()
+    env['module.registry'].rebuild_dependency_index()
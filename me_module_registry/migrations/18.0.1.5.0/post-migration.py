@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Fill the materialized catalogue from the existing module versions"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['module.catalogue']._refresh()
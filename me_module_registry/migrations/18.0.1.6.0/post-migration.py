@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Fill the stored module counts of the Odoo versions"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['module.series.stats']._refresh()
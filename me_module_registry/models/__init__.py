@@ -1,6 +1,16 @@
 # -*- coding: utf-8 -*-
 
 from . import module_template
+from . import module_manifest
 from . import module_registry
+from . import module_dependency
+from . import module_resolver
+from . import module_catalogue
+from . import module_transfer
 from . import module_library
+from . import module_sync_run
+from . import module_snapshot
+from . import module_registry_event
+from . import module_series_stats
+from . import odoo_version
 from . import github_repository
\ No newline at end of file
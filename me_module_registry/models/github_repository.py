@@ -4,6 +4,8 @@ from odoo import api, fields, models, _
 import logging
 import os
 
+from ..tools.sync_lock import repository_lock
+
 _logger = logging.getLogger(__name__)
 
 
@@ -17,8 +19,10 @@ class GitHubRepository(models.Model):
 
     @api.depends('module_ids')
     def _compute_module_count(self):
+        counts = dict(self.env['module.registry']._read_group(
+            [('github_repository_id', 'in', self._origin.ids)], ['github_repository_id'], ['__count']))
         for repo in self:
-            repo.module_count = len(repo.module_ids)
+            repo.module_count = counts.get(repo._origin, 0)
 
     def action_sync_modules(self):
         """Action to sync modules from this repository"""
@@ -31,8 +35,18 @@ class GitHubRepository(models.Model):
                 sticky=True
             )
         
+        # Repositories already being synced are left to the running sync
+        busy = self.browse()
         for repo in self:
-            self.env['module.registry'].sync_modules_from_repository(repo.id)
+            if self.env['module.registry'].sync_modules_from_repository(repo.id) is None:
+                busy |= repo
+        if busy:
+            return self._show_notification(
+                'Warning',
+                _('Module sync completed for %d repositories, already running for: %s')
+                % (len(self - busy), ', '.join(busy.mapped('full_name'))),
+                'warning'
+            )
         
         return self._show_notification(
             'Success',
@@ -101,16 +115,13 @@ class GitHubRepository(models.Model):
                 'warning'
             )
         
-        # Get the local path and remove it
-        module_registry = self.env['module.registry']
-        repo_path = module_registry._get_repository_local_path(self)
-        
-        if os.path.exists(repo_path):
-            import shutil
-            shutil.rmtree(repo_path, ignore_errors=True)
-        
-        # Trigger sync which will re-clone
-        module_registry.sync_modules_from_repository(self.id)
+        # The sync removes the clone under its lock, then clones again
+        if self.env['module.registry'].sync_modules_from_repository(self.id, reclone=True) is None:
+            return self._show_notification(
+                'Warning',
+                _('Repository "%s" is already being synced, try again when it is done.') % self.full_name,
+                'warning'
+            )
         
         return self._show_notification(
             'Success',
@@ -123,7 +134,19 @@ class GitHubRepository(models.Model):
         module_registry = self.env['module.registry']
         repo_path = module_registry._get_repository_local_path(self)
         
-        if os.path.exists(repo_path):
+        with repository_lock(self.env.cr, self.id, repo_path) as acquired:
+            if not acquired:
+                return self._show_notification(
+                    'Warning',
+                    _('Repository "%s" is being synced, its local clone is in use.') % self.full_name,
+                    'warning'
+                )
+            if not os.path.exists(repo_path):
+                return self._show_notification(
+                    'Info',
+                    _('No local clone found for "%s"') % self.full_name,
+                    'info'
+                )
             import shutil
             shutil.rmtree(repo_path, ignore_errors=True)
             return self._show_notification(
@@ -131,12 +154,6 @@ class GitHubRepository(models.Model):
                 _('Local clone of "%s" has been removed') % self.full_name,
                 'success'
             )
-        else:
-            return self._show_notification(
-                'Info',
-                _('No local clone found for "%s"') % self.full_name,
-                'info'
-            )
 
     def get_local_clone_info(self):
         """Get information about the local clone of this repository"""
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Columns copied from the latest version of each (template, series), updated on refresh
+CATALOGUE_COLUMNS = (
+    'registry_id', 'library_id', 'github_repository_id', 'technical_name', 'name', 'summary',
+    'author', 'category', 'license', 'application', 'repository_name', 'odoo_version', 'version',
+    'github_branch', 'version_status', 'installable', 'sync_status', 'last_sync',
+    'version_count', 'dependency_count',
+)
+CATALOGUE_MAX_LIMIT = 1000
+
+
+class ModuleCatalogue(models.Model):
+    _name = 'module.catalogue'
+    _description = 'Module Catalogue (Materialized)'
+    _rec_name = 'technical_name'
+    _order = 'technical_name, odoo_version desc'
+
+    # A flat read model for dashboards and tooling: one row per (template, Odoo series)
+    # holding the latest version and the template fields, so reads need no joins or
+    # related fields. Rows are only written by _refresh, at the end of every sync.
+
+    template_id = fields.Many2one('module.template', 'Module Template', required=True,
+                                  ondelete='cascade', index=True, readonly=True)
+    odoo_version_id = fields.Many2one('odoo.version', 'Odoo Version', required=True,
+                                      ondelete='cascade', index=True, readonly=True)
+    registry_id = fields.Many2one('module.registry', 'Latest Version', ondelete='cascade', readonly=True)
+    library_id = fields.Many2one('module.library', 'Module Library', index=True, readonly=True)
+    github_repository_id = fields.Many2one('github.repository', 'GitHub Repository', index=True, readonly=True)
+
+    # Template
+    technical_name = fields.Char('Technical Name', index=True, readonly=True)
+    name = fields.Char('Module Name', readonly=True)
+    summary = fields.Text('Summary', readonly=True)
+    author = fields.Char('Author', readonly=True)
+    category = fields.Char('Category', readonly=True)
+    license = fields.Char('License', readonly=True)
+    application = fields.Boolean('Application', readonly=True)
+    repository_name = fields.Char('Repository', readonly=True)
+
+    # Latest version in the series
+    odoo_version = fields.Char('Odoo Series', index=True, readonly=True)
+    version = fields.Char('Module Version', readonly=True)
+    github_branch = fields.Char('GitHub Branch', readonly=True)
+    version_status = fields.Selection(
+        selection=lambda self: self.env['module.registry']._fields['version_status'].selection,
+        string='Version Status', readonly=True)
+    installable = fields.Boolean('Installable', readonly=True)
+    sync_status = fields.Selection(
+        selection=lambda self: self.env['module.registry']._fields['sync_status'].selection,
+        string='Sync Status', readonly=True)
+    last_sync = fields.Datetime('Last Sync', readonly=True)
+    version_count = fields.Integer('Versions in Series', readonly=True)
+    dependency_count = fields.Integer('Dependencies', readonly=True)
+
+    _sql_constraints = [
+        ('unique_template_series', 'unique(template_id, odoo_version_id)',
+         'A module template has one catalogue row per Odoo version!'),
+    ]
+
+    @api.model
+    def _refresh(self, template_ids=None):
+        """Bring the catalogue rows of these templates up to date (all templates when None)
+
+        One upsert writes the rows whose latest version or template data changed, then
+        the rows of series a template no longer has a version in are deleted.
+        """
+        if template_ids is not None and not template_ids:
+            return
+        self.env.flush_all()
+        template_filter = SQL("AND r.template_id = ANY(%s)", list(template_ids)) if template_ids is not None else SQL()
+        now = self.env.cr.now()
+        columns = [SQL.identifier(column) for column in CATALOGUE_COLUMNS]
+        self.env.cr.execute(SQL("""
+            INSERT INTO module_catalogue (template_id, odoo_version_id, %(columns)s,
+                                          create_uid, create_date, write_uid, write_date)
+            SELECT DISTINCT ON (r.template_id, r.odoo_version_id)
+                   r.template_id, r.odoo_version_id,
+                   r.id, t.library_id, t.github_repository_id, t.technical_name, t.name, t.summary,
+                   t.author, t.category, t.license, t.application, g.full_name, v.name, r.version,
+                   r.github_branch, r.version_status, r.installable, r.sync_status, r.last_sync,
+                   count(*) OVER (PARTITION BY r.template_id, r.odoo_version_id),
+                   (SELECT count(*) FROM module_dependency d WHERE d.registry_id = r.id),
+                   %(uid)s, %(now)s, %(uid)s, %(now)s
+              FROM module_registry r
+              JOIN module_template t ON t.id = r.template_id
+              JOIN odoo_version v ON v.id = r.odoo_version_id
+         LEFT JOIN github_repository g ON g.id = t.github_repository_id
+             WHERE TRUE %(template_filter)s
+          ORDER BY r.template_id, r.odoo_version_id, %(version_order)s, r.id DESC
+                ON CONFLICT (template_id, odoo_version_id) DO UPDATE
+               SET %(updates)s, write_uid = EXCLUDED.write_uid, write_date = EXCLUDED.write_date
+             WHERE (%(current)s) IS DISTINCT FROM (%(excluded)s)
+        """,
+            columns=SQL(", ").join(columns),
+            uid=self.env.uid,
+            now=now,
+            template_filter=template_filter,
+            version_order=self.env['module.registry']._get_version_order_sql('r'),
+            updates=SQL(", ").join(SQL("%s = EXCLUDED.%s", column, column) for column in columns),
+            current=SQL(", ").join(SQL("module_catalogue.%s", column) for column in columns),
+            excluded=SQL(", ").join(SQL("EXCLUDED.%s", column) for column in columns),
+        ))
+        upserted = self.env.cr.rowcount
+        template_filter = SQL("AND c.template_id = ANY(%s)", list(template_ids)) if template_ids is not None else SQL()
+        self.env.cr.execute(SQL("""
+            DELETE FROM module_catalogue c
+             WHERE NOT EXISTS (SELECT 1 FROM module_registry r
+                                WHERE r.template_id = c.template_id
+                                  AND r.odoo_version_id = c.odoo_version_id)
+                   %s
+        """, template_filter))
+        self.invalidate_model()
+        _logger.info(f"Refreshed module catalogue: {upserted} rows written, {self.env.cr.rowcount} removed")
+
+    @api.model
+    def get_rows(self, odoo_version=None, repository=None, version_status=None, limit=200, offset=0):
+        """Catalogue rows as plain dicts, for the JSON endpoint
+
+        Args:
+            odoo_version: Odoo series name (e.g. "18.0")
+            repository: repository full name (e.g. "OCA/web")
+            version_status: version status of the latest version (e.g. "active")
+            limit: number of rows, at most CATALOGUE_MAX_LIMIT
+            offset: number of rows skipped
+        Returns:
+            dict with the total number of matching rows and the requested page
+        """
+        domain = []
+        if odoo_version:
+            domain.append(('odoo_version', '=', odoo_version))
+        if repository:
+            domain.append(('repository_name', '=', repository))
+        if version_status:
+            domain.append(('version_status', '=', version_status))
+        limit = min(max(0, limit), CATALOGUE_MAX_LIMIT)
+        field_names = ['template_id', 'odoo_version_id', *CATALOGUE_COLUMNS]
+        # A limit of 0 means no limit to search_fetch
+        rows = self.search_fetch(domain, field_names, limit=limit, offset=max(0, offset)) if limit else self.browse()
+        return {
+            'total': self.search_count(domain),
+            'rows': [
+                {
+                    name: row[name].id if isinstance(row[name], models.BaseModel) else row[name]
+                    for name in field_names
+                }
+                for row in rows
+            ],
+        }
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models, _
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class ModuleDependency(models.Model):
+    _name = 'module.dependency'
+    _description = 'Module Dependency Edge'
+    _rec_name = 'depends_name'
+    _order = 'registry_id, depends_name'
+
+    # A normalized copy of module.registry.depends: one row per (version, dependency).
+    # target_id is the version of the dependency resolved within the same Odoo series;
+    # it stays empty for modules that are not in the registry (e.g. Odoo core modules).
+
+    registry_id = fields.Many2one('module.registry', 'Module Version',
+                                  required=True, ondelete='cascade', index=True)
+    template_id = fields.Many2one('module.template', 'Module Template',
+                                  related='registry_id.template_id', store=True, index=True)
+    odoo_version_id = fields.Many2one('odoo.version', 'Odoo Version',
+                                      related='registry_id.odoo_version_id', store=True)
+    depends_name = fields.Char('Dependency', required=True)
+    target_id = fields.Many2one('module.registry', 'Resolved Version',
+                                ondelete='set null', index=True, readonly=True)
+
+    _sql_constraints = [
+        ('unique_registry_depends', 'unique(registry_id, depends_name)',
+         'A module version can only depend once on the same module!'),
+    ]
+
+    def init(self):
+        # Forward lookups go by dependency name within a series, reverse lookups by target
+        create_index(self.env.cr, 'module_dependency_name_version_index', self._table,
+                     ['depends_name', 'odoo_version_id'])
+
+    @api.model
+    def _resolve_targets(self, odoo_version_ids=None):
+        """Resolve edge targets to the latest registry version of the dependency
+        within the same Odoo series.
+
+        Args:
+            odoo_version_ids: restrict resolution to these series (all when None)
+        """
+        self.env.flush_all()
+        version_filter = SQL("AND d.odoo_version_id = ANY(%s)", list(odoo_version_ids)) if odoo_version_ids else SQL()
+        self.env.cr.execute(SQL("""
+            WITH candidates AS (
+                SELECT DISTINCT ON (t.technical_name, r.odoo_version_id)
+                       t.technical_name, r.odoo_version_id, r.id
+                  FROM module_registry r
+                  JOIN module_template t ON t.id = r.template_id
+                 WHERE r.installable
+              ORDER BY t.technical_name, r.odoo_version_id,
+                       r.is_latest_version DESC NULLS LAST, r.last_sync DESC NULLS LAST, r.id DESC
+            )
+            UPDATE module_dependency d
+               SET target_id = c.id
+              FROM candidates c
+             WHERE c.technical_name = d.depends_name
+               AND c.odoo_version_id = d.odoo_version_id
+               AND d.target_id IS DISTINCT FROM c.id
+               %s
+        """, version_filter))
+        resolved = self.env.cr.rowcount
+        self.env.cr.execute(SQL("""
+            UPDATE module_dependency d
+               SET target_id = NULL
+             WHERE d.target_id IS NOT NULL
+               AND NOT EXISTS (
+                    SELECT 1
+                      FROM module_registry r
+                      JOIN module_template t ON t.id = r.template_id
+                     WHERE r.id = d.target_id
+                       AND r.installable
+                       AND t.technical_name = d.depends_name
+                       AND r.odoo_version_id = d.odoo_version_id)
+               %s
+        """, version_filter))
+        self.invalidate_model(['target_id'])
+        _logger.info(f"Resolved {resolved} dependency edges, cleared {self.env.cr.rowcount} stale targets")
+
+    @api.model
+    def get_closure(self, registry_ids, reverse=False, max_depth=50):
+        """Transitive dependency closure of module versions in a single recursive query.
+
+        Args:
+            registry_ids: ids of module.registry records to start from
+            reverse: False for "what does X pull in", True for "what breaks if X is dropped"
+            max_depth: safety limit against dependency cycles
+        Returns:
+            dict with 'depth' ({registry_id: distance}, start records excluded)
+            and 'unresolved' (technical names without a registry version, forward only)
+        """
+        if not registry_ids:
+            return {'depth': {}, 'unresolved': []}
+        self.env.flush_all()
+        # Forward: follow version -> resolved dependency; reverse: resolved dependency -> version
+        source, target = ('target_id', 'registry_id') if reverse else ('registry_id', 'target_id')
+        self.env.cr.execute(SQL("""
+            WITH RECURSIVE closure(id, depth) AS (
+                SELECT unnest(%(ids)s::integer[]), 0
+                 UNION
+                SELECT d.%(target)s, c.depth + 1
+                  FROM closure c
+                  JOIN module_dependency d ON d.%(source)s = c.id
+                 WHERE d.target_id IS NOT NULL
+                   AND c.depth < %(max_depth)s
+            )
+            SELECT id, min(depth) FROM closure GROUP BY id
+        """, ids=list(registry_ids), source=SQL.identifier(source), target=SQL.identifier(target),
+            max_depth=max_depth))
+        depth = {row[0]: row[1] for row in self.env.cr.fetchall() if row[1] > 0}
+        unresolved = []
+        if not reverse:
+            self.env.cr.execute(SQL("""
+                SELECT DISTINCT depends_name
+                  FROM module_dependency
+                 WHERE registry_id = ANY(%s) AND target_id IS NULL
+              ORDER BY depends_name
+            """, list(set(registry_ids) | set(depth))))
+            unresolved = [row[0] for row in self.env.cr.fetchall()]
+        return {'depth': depth, 'unresolved': unresolved}
@@ -1,10 +1,77 @@
 # -*- coding: utf-8 -*-
 
 from odoo import api, fields, models, _
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from datetime import datetime, timedelta
+from fnmatch import fnmatchcase
 import logging
+import re
 
 _logger = logging.getLogger(__name__)
 
+MANIFEST_FILE = '__manifest__.py'
+DEFAULT_ADDON_INCLUDE = '*'
+DEFAULT_ADDON_EXCLUDE = '.*\n*/.*\nsetup/*\n*/tests/*\n*/node_modules/*'
+# Release branches only: 18.0, v17.0, main... but not 18.0-fix-foo
+DEFAULT_BRANCH_INCLUDE = r'^(main|master|develop|v?\d+\.\d+)$'
+
+
+def filter_manifest_paths(file_paths, include, exclude):
+    """Select the manifest files of the module directories matching the globs
+
+    Plain function so branch scans can run it outside of the ORM (see module.registry).
+
+    Args:
+        file_paths: iterable of file paths relative to the repository root
+        include: globs of module directories to keep
+        exclude: globs of module directories to skip
+    Returns:
+        list of __manifest__.py paths, in sorted order
+    """
+    manifest_paths = []
+    for path in file_paths:
+        directory, __, filename = path.rpartition('/')
+        # A manifest at the repository root has no technical name to register
+        if filename != MANIFEST_FILE or not directory:
+            continue
+        if (any(fnmatchcase(directory, pattern) for pattern in include)
+                and not any(fnmatchcase(directory, pattern) for pattern in exclude)):
+            manifest_paths.append(path)
+    return sorted(manifest_paths)
+
+
+def select_branches(branch_dates, policy, default_branch=None, now=None):
+    """Apply a branch policy to the branches of a repository
+
+    Args:
+        branch_dates: dict {branch name: last commit datetime (naive UTC) or None when unknown}
+        policy: dict from module.library._get_branch_policy
+        default_branch: always selected when present in the repository
+        now: reference time for the age limit (defaults to the current time)
+    Returns:
+        sorted list of the branch names to sync
+    """
+    include = re.compile(policy['include']) if policy['include'] else None
+    exclude = re.compile(policy['exclude']) if policy['exclude'] else None
+    selected = [
+        name for name in branch_dates
+        if (not include or include.search(name)) and not (exclude and exclude.search(name))
+    ]
+    if policy['max_age_days']:
+        cutoff = (now or datetime.utcnow()) - timedelta(days=policy['max_age_days'])
+        selected = [name for name in selected if branch_dates[name] is None or branch_dates[name] >= cutoff]
+    if policy['max_count']:
+        selected = sorted(selected, key=lambda name: branch_dates[name] or datetime.min,
+                          reverse=True)[:policy['max_count']]
+    if default_branch and default_branch in branch_dates and default_branch not in selected:
+        selected.append(default_branch)
+    return sorted(selected)
+
+
+def branch_policy_needs_dates(policy):
+    return bool(policy['max_age_days'] or policy['max_count'])
+
 
 class ModuleLibrary(models.Model):
     _name = 'module.library'
@@ -29,26 +96,42 @@ class ModuleLibrary(models.Model):
         ('manual', 'Manual Only')
     ], 'Sync Frequency', default='manual')
     
+    # Module discovery (globs on module directories relative to the repository root, "*" spans directories)
+    addon_include_globs = fields.Text('Include Paths', default=DEFAULT_ADDON_INCLUDE,
+                                      help='Module directories to sync, one glob per line (e.g. addons/*)')
+    addon_exclude_globs = fields.Text('Exclude Paths', default=DEFAULT_ADDON_EXCLUDE,
+                                      help='Module directories to skip, one glob per line (e.g. */tests/*)')
+    
+    # Branch policy (the repository default branch is always synced)
+    branch_include_regex = fields.Char('Branch Include Pattern', default=DEFAULT_BRANCH_INCLUDE,
+                                       help='Regular expression the branch names to sync must match')
+    branch_exclude_regex = fields.Char('Branch Exclude Pattern',
+                                       help='Branches matching this regular expression are skipped')
+    branch_max_age_days = fields.Integer('Max Branch Age (Days)', default=0,
+                                         help='Skip branches without a commit in this many days (0 for no limit)')
+    branch_max_count = fields.Integer('Max Branches', default=0,
+                                      help='Only sync this many most recently committed branches (0 for no limit)')
+    
     # Templates and versions in this library
     template_ids = fields.One2many('module.template', 'library_id', 'Module Templates')
     version_ids = fields.One2many('module.registry', 'library_id', 'Module Versions')
     module_ids = fields.One2many('module.registry', 'library_id', 'Module Versions')  # Alias for views
     
     # Computed fields
-    template_count = fields.Integer('Template Count', compute='_compute_counts', store=True)
-    version_count = fields.Integer('Version Count', compute='_compute_counts', store=True)
-    module_count = fields.Integer('Module Count', compute='_compute_counts', store=True)
-    active_version_count = fields.Integer('Active Versions', compute='_compute_counts', store=True)
-    supported_odoo_versions = fields.Char('Supported Odoo Versions', compute='_compute_counts', store=True)
+    template_count = fields.Integer('Template Count', compute='_compute_library_stats', store=True)
+    version_count = fields.Integer('Version Count', compute='_compute_library_stats', store=True)
+    module_count = fields.Integer('Module Count', compute='_compute_library_stats', store=True)
+    active_version_count = fields.Integer('Active Versions', compute='_compute_library_stats', store=True)
+    supported_odoo_versions = fields.Char('Supported Odoo Versions', compute='_compute_library_stats', store=True)
     
     # Sync info
-    last_sync = fields.Datetime('Last Sync', compute='_compute_sync_info', store=True)
+    last_sync = fields.Datetime('Last Sync', compute='_compute_library_stats', store=True)
     sync_status = fields.Selection([
         ('success', 'Success'),
         ('error', 'Error'),
         ('pending', 'Pending'),
         ('never', 'Never Synced')
-    ], 'Sync Status', compute='_compute_sync_info', store=True)
+    ], 'Sync Status', compute='_compute_library_stats', store=True)
     
     # Repository info (related fields)
     repository_name = fields.Char('Repository', related='github_repository_id.full_name', store=True)
@@ -59,45 +142,131 @@ class ModuleLibrary(models.Model):
          'Each repository can only have one library entry!'),
     ]
 
-    @api.depends('template_ids', 'version_ids.version_status', 'version_ids.odoo_version_id')
-    def _compute_counts(self):
+    @api.depends('template_ids', 'template_ids.last_sync', 'template_ids.sync_status',
+                 'version_ids.version_status', 'version_ids.odoo_version_id',
+                 'version_ids.last_sync', 'version_ids.sync_status')
+    def _compute_library_stats(self):
+        # Counts and sync info come from the same aggregate query: read it once
+        stats = self._read_library_stats()
         for library in self:
-            versions = library.version_ids
-            library.template_count = len(library.template_ids)
-            library.version_count = len(versions)
+            values = stats.get(library._origin.id)
+            if not values:
+                library.template_count = 0
+                library.version_count = 0
+                library.module_count = 0
+                library.active_version_count = 0
+                library.supported_odoo_versions = ''
+                library.last_sync = False
+                library.sync_status = 'never'
+                continue
+            library.template_count = values['template_count']
+            library.version_count = values['version_count']
             library.module_count = library.template_count  # Module count = template count (unique modules)
-            library.active_version_count = len(versions.filtered(lambda v: v.version_status == 'active'))
+            library.active_version_count = values['active_version_count']
             
             # Get supported Odoo versions
-            odoo_versions = versions.mapped('odoo_version_id.name')
-            library.supported_odoo_versions = ', '.join(sorted(set(filter(None, odoo_versions))))
+            library.supported_odoo_versions = ', '.join(sorted(values['odoo_version_names']))
 
-    @api.depends('template_ids.last_sync', 'version_ids.last_sync')
-    def _compute_sync_info(self):
-        for library in self:
-            # Get all sync dates
-            sync_dates = (library.template_ids.mapped('last_sync') + 
-                         library.version_ids.mapped('last_sync'))
-            library.last_sync = max(filter(None, sync_dates)) if sync_dates else False
-            
-            # Compute sync status
-            if not library.template_ids and not library.version_ids:
-                library.sync_status = 'never'
+            library.last_sync = values['last_sync']
+            # Any error wins, then anything not synced successfully is pending
+            if values['has_error']:
+                library.sync_status = 'error'
+            elif values['all_success']:
+                library.sync_status = 'success'
             else:
-                all_statuses = (library.template_ids.mapped('sync_status') + 
-                              library.version_ids.mapped('sync_status'))
-                library.sync_status = self._determine_sync_status(all_statuses)
-
-    def _determine_sync_status(self, statuses):
-        """Determine overall sync status from individual statuses"""
-        if 'error' in statuses:
-            return 'error'
-        elif 'pending' in statuses:
-            return 'pending'
-        elif all(status == 'success' for status in statuses):
-            return 'success'
-        else:
-            return 'pending'
+                library.sync_status = 'pending'
+
+    def _read_library_stats(self):
+        """Aggregate the templates and versions of the libraries in one grouped query
+
+        Returns:
+            dict {library id: dict of counts, Odoo version names, last sync and status flags}
+            for the libraries having templates or versions
+        """
+        library_ids = [library_id for library_id in self._origin.ids if library_id]
+        if not library_ids:
+            return {}
+        self.env['module.template'].flush_model(['library_id', 'last_sync', 'sync_status'])
+        self.env['module.registry'].flush_model(
+            ['library_id', 'version_status', 'odoo_version_id', 'last_sync', 'sync_status'])
+        self.env['odoo.version'].flush_model(['name'])
+        self.env.cr.execute(SQL("""
+            WITH entries AS (
+                SELECT t.library_id, 1 AS is_template, NULL::integer AS odoo_version_id,
+                       FALSE AS is_active, t.last_sync, t.sync_status
+                  FROM module_template t
+                 WHERE t.library_id = ANY(%(ids)s)
+                 UNION ALL
+                SELECT r.library_id, 0, r.odoo_version_id,
+                       r.version_status = 'active', r.last_sync, r.sync_status
+                  FROM module_registry r
+                 WHERE r.library_id = ANY(%(ids)s)
+            )
+            SELECT w.library_id,
+                   sum(w.is_template),
+                   count(*) - sum(w.is_template),
+                   count(*) FILTER (WHERE w.is_active),
+                   array_agg(DISTINCT v.name) FILTER (WHERE v.name IS NOT NULL),
+                   max(w.last_sync),
+                   bool_or(w.sync_status = 'error'),
+                   bool_and(coalesce(w.sync_status = 'success', FALSE))
+              FROM entries w
+         LEFT JOIN odoo_version v ON v.id = w.odoo_version_id
+          GROUP BY w.library_id
+        """, ids=library_ids))
+        return {
+            library_id: {
+                'template_count': template_count,
+                'version_count': version_count,
+                'active_version_count': active_version_count,
+                'odoo_version_names': odoo_version_names or [],
+                'last_sync': last_sync,
+                'has_error': has_error,
+                'all_success': all_success,
+            }
+            for (library_id, template_count, version_count, active_version_count, odoo_version_names,
+                 last_sync, has_error, all_success) in self.env.cr.fetchall()
+        }
+
+    @api.constrains('branch_include_regex', 'branch_exclude_regex')
+    def _check_branch_regex(self):
+        for library in self:
+            for pattern in (library.branch_include_regex, library.branch_exclude_regex):
+                try:
+                    re.compile(pattern or '')
+                except re.error as e:
+                    raise ValidationError(_('Invalid branch pattern "%s": %s') % (pattern, e))
+
+    @api.constrains('branch_max_age_days', 'branch_max_count')
+    def _check_branch_limits(self):
+        for library in self:
+            if library.branch_max_age_days < 0 or library.branch_max_count < 0:
+                raise ValidationError(_('Branch limits cannot be negative'))
+
+    def _get_branch_policy(self):
+        """Branch policy of the library, the defaults when there is no library yet"""
+        if not self:
+            return {'include': DEFAULT_BRANCH_INCLUDE, 'exclude': False, 'max_age_days': 0, 'max_count': 0}
+        self.ensure_one()
+        return {
+            'include': self.branch_include_regex,
+            'exclude': self.branch_exclude_regex,
+            'max_age_days': self.branch_max_age_days,
+            'max_count': self.branch_max_count,
+        }
+
+    def _get_addon_globs(self):
+        """Include and exclude globs of the library, the defaults when there is no library yet"""
+        def split(value):
+            return [pattern.strip() for pattern in (value or '').replace(',', '\n').splitlines() if pattern.strip()]
+        if not self:
+            return split(DEFAULT_ADDON_INCLUDE), split(DEFAULT_ADDON_EXCLUDE)
+        self.ensure_one()
+        return split(self.addon_include_globs) or split(DEFAULT_ADDON_INCLUDE), split(self.addon_exclude_globs)
+
+    def _filter_manifest_paths(self, file_paths):
+        """Select the manifest files of the module directories matching the library globs"""
+        return filter_manifest_paths(file_paths, *self._get_addon_globs())
 
     @api.model
     def create_library_for_repository(self, repository_id):
@@ -136,9 +305,12 @@ class ModuleLibrary(models.Model):
 
     def action_sync_repository(self):
         """Sync modules from the repository"""
+        busy = self.browse()
         for library in self:
             if library.github_repository_id.odoo_module_repo:
-                self.env['module.registry'].sync_modules_from_repository(library.github_repository_id.id)
+                # Libraries already being synced are left to the running sync
+                if self.env['module.registry'].sync_modules_from_repository(library.github_repository_id.id) is None:
+                    busy |= library
             else:
                 return {
                     'type': 'ir.actions.client',
@@ -151,6 +323,19 @@ class ModuleLibrary(models.Model):
                     }
                 }
         
+        if busy:
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': _('Warning'),
+                    'message': _('Repository sync completed for %d libraries, already running for: %s')
+                               % (len(self - busy), ', '.join(busy.mapped('name'))),
+                    'type': 'warning',
+                    'sticky': False,
+                }
+            }
+        
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
@@ -188,6 +373,16 @@ class ModuleLibrary(models.Model):
         """View modules in this library (backward compatibility)"""
         return self.action_view_templates()
 
+    def action_view_sync_runs(self):
+        """View the sync runs of this library"""
+        return {
+            'name': _('Sync Runs of %s') % self.name,
+            'type': 'ir.actions.act_window',
+            'res_model': 'module.sync.run',
+            'view_mode': 'list,form',
+            'domain': [('repository_id', '=', self.github_repository_id.id)],
+        }
+
     def action_open_repository(self):
         """Open repository on GitHub"""
         return {
@@ -206,8 +401,10 @@ class ModuleLibrary(models.Model):
         
         for library in auto_libraries:
             try:
-                self.env['module.registry'].sync_modules_from_repository(library.github_repository_id.id)
-                _logger.info(f"Auto-synced library: {library.name}")
+                if self.env['module.registry'].sync_modules_from_repository(library.github_repository_id.id) is None:
+                    _logger.info(f"Library {library.name} is already being synced, auto-sync skipped")
+                else:
+                    _logger.info(f"Auto-synced library: {library.name}")
             except Exception as e:
                 _logger.error(f"Error auto-syncing library {library.name}: {str(e)}")
 
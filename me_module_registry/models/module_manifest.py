@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+from ..tools.sync_lock import MANIFEST_GC_LOCK, try_serialized_section
+import hashlib
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class ModuleManifest(models.Model):
+    _name = 'module.manifest'
+    _description = 'Module Manifest (Content Addressed)'
+    _rec_name = 'checksum'
+
+    # Manifests are stored once per distinct content and shared by every module
+    # version (across branches and repositories) with a byte-identical manifest.
+
+    checksum = fields.Char('Checksum', required=True, readonly=True, help='SHA-256 of the canonical manifest JSON')
+    manifest_data = fields.Json('Manifest Data', readonly=True)
+    registry_ids = fields.One2many('module.registry', 'manifest_id', 'Module Versions')
+
+    _sql_constraints = [
+        ('unique_checksum', 'unique(checksum)', 'A manifest can only be stored once!'),
+    ]
+
+    @api.model
+    def _manifest_checksum(self, manifest_dict):
+        canonical = json.dumps(manifest_dict or {}, sort_keys=True, separators=(',', ':'),
+                               ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @api.model
+    def _get_or_create(self, manifest_dict):
+        """Return the manifest record for this content, storing it on first sight"""
+        checksum = self._manifest_checksum(manifest_dict)
+        # Keeps _gc_unused_manifests from deleting the manifest before the module
+        # versions referring to it are committed
+        self.env.cr.execute(SQL("SELECT pg_advisory_xact_lock_shared(%s)", MANIFEST_GC_LOCK))
+        manifest = self.search([('checksum', '=', checksum)], limit=1)
+        if manifest:
+            return manifest
+        # Syncs of other repositories may store the same manifest concurrently: the insert
+        # gives way to theirs instead of failing on the unique checksum. Under repeatable
+        # read, a row committed after our snapshot makes PostgreSQL raise a serialization
+        # failure instead, which module.registry._create_or_update_module retries.
+        now = self.env.cr.now()
+        self.env.cr.execute(SQL("""
+            INSERT INTO module_manifest (checksum, manifest_data, create_uid, create_date, write_uid, write_date)
+                 VALUES (%(checksum)s, %(data)s::jsonb, %(uid)s, %(now)s, %(uid)s, %(now)s)
+            ON CONFLICT (checksum) DO NOTHING
+              RETURNING id
+        """, checksum=checksum, data=json.dumps(manifest_dict or {}, default=str), uid=self.env.uid, now=now))
+        row = self.env.cr.fetchone()
+        if not row:
+            # Inserted and committed by a concurrent transaction visible to ours
+            self.env.cr.execute(SQL("SELECT id FROM module_manifest WHERE checksum = %s", checksum))
+            row = self.env.cr.fetchone()
+        return self.browse(row[0])
+
+    @api.autovacuum
+    def _gc_unused_manifests(self):
+        """Delete manifests no module version refers to anymore
+
+        Skipped while a sync transaction holds manifests it has not committed references
+        to yet: the next run collects them.
+        """
+        self.env.flush_all()
+        with try_serialized_section(self.env.cr, MANIFEST_GC_LOCK) as acquired:
+            if not acquired:
+                _logger.info("Module manifests in use by a running sync, garbage collection skipped")
+                return
+            self.env.cr.execute(SQL("""
+                DELETE FROM module_manifest m
+                 WHERE NOT EXISTS (SELECT 1 FROM module_registry r WHERE r.manifest_id = m.id)
+            """))
+            if self.env.cr.rowcount:
+                _logger.info(f"Deleted {self.env.cr.rowcount} unused module manifests")
+            self.env.cr.commit()
+        self.invalidate_model()
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
 from odoo import api, fields, models, _
+from odoo.tools import SQL
+from odoo.tools.lru import LRU
 import logging
 import requests
 import json
@@ -11,9 +13,30 @@ import subprocess
 import shutil
 import tempfile
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from urllib.parse import quote
+
+from psycopg2.errors import SerializationFailure
+from requests.adapters import HTTPAdapter
+
+from ..tools.manifest_parser import ManifestParseError, parse_manifest
+from ..tools.sync_lock import SERIES_STATS_LOCK, file_lock, repository_lock, serialized_section
+from .module_library import branch_policy_needs_dates, filter_manifest_paths, select_branches
 
 _logger = logging.getLogger(__name__)
 
+# Stored aggregates over module versions, recomputed once at the end of a sync
+SYNC_AGGREGATE_COMPUTES = {
+    'github.repository': ('_compute_module_count',),
+    'module.library': ('_compute_library_stats',),
+    'module.template': ('_compute_version_stats',),
+}
+
+# Rendered formatted fields of the most recently displayed manifests, by manifest checksum
+FORMATTED_CACHE_SIZE = 256
+_formatted_cache = LRU(FORMATTED_CACHE_SIZE)
+
 
 class ModuleRegistry(models.Model):
     _name = 'module.registry'
@@ -62,8 +85,9 @@ class ModuleRegistry(models.Model):
     deprecation_date = fields.Date('Deprecation Date')
     end_of_life_date = fields.Date('End of Life Date')
     
-    # Version-specific manifest data
-    manifest_data = fields.Json('Full Manifest Data', readonly=True)
+    # Version-specific manifest data (stored once per distinct content in module.manifest)
+    manifest_id = fields.Many2one('module.manifest', 'Manifest', readonly=True, index=True, ondelete='restrict')
+    manifest_data = fields.Json('Full Manifest Data', related='manifest_id.manifest_data')
     
     # Module status and compatibility
     installable = fields.Boolean('Installable', default=True, readonly=True)
@@ -90,14 +114,16 @@ class ModuleRegistry(models.Model):
     application = fields.Boolean('Application', related='template_id.application', readonly=True)
     github_path = fields.Char('Path in Repository', related='template_id.github_path', readonly=True)
     
-    # Dependencies (from GitHub manifest - readonly)
-    depends = fields.Text(string='Dependencies', readonly=True, help='JSON list of module dependencies from GitHub manifest')
-    external_dependencies = fields.Text(string='External Dependencies', readonly=True, help='JSON list of external dependencies from GitHub manifest')
+    # Dependencies (derived from the manifest)
+    depends = fields.Text(string='Dependencies', compute='_compute_manifest_fields', help='JSON list of module dependencies from GitHub manifest')
+    external_dependencies = fields.Text(string='External Dependencies', compute='_compute_manifest_fields', help='JSON list of external dependencies from GitHub manifest')
     
-    # Module files and assets (from GitHub manifest - readonly)
-    data_files = fields.Text(string='Data Files', readonly=True, help='JSON list of data files from GitHub manifest')
-    demo_files = fields.Text(string='Demo Files', readonly=True, help='JSON list of demo files from GitHub manifest')
-    assets = fields.Text(string='Assets', readonly=True, help='JSON dict of assets from GitHub manifest')
+    # Module files and assets (derived from the manifest)
+    data_files = fields.Text(string='Data Files', compute='_compute_manifest_fields', help='JSON list of data files from GitHub manifest')
+    demo_files = fields.Text(string='Demo Files', compute='_compute_manifest_fields', help='JSON list of demo files from GitHub manifest')
+    assets = fields.Text(string='Assets', compute='_compute_manifest_fields', help='JSON dict of assets from GitHub manifest')
+    dependency_ids = fields.One2many('module.dependency', 'registry_id', string='Dependency Edges', readonly=True)
+    dependent_ids = fields.One2many('module.dependency', 'target_id', string='Dependent Edges', readonly=True)
     
     # Metadata (system managed - readonly)
     last_sync = fields.Datetime(string='Last Sync', default=fields.Datetime.now, readonly=True)
@@ -113,19 +139,21 @@ class ModuleRegistry(models.Model):
     full_name = fields.Char(string='Full Name', compute='_compute_full_name', store=True)
     github_url = fields.Char(string='GitHub URL', compute='_compute_github_url', store=True)
     
-    # Formatted display fields
-    depends_formatted = fields.Html(string='Dependencies', compute='_compute_formatted_fields', store=True)
-    external_dependencies_formatted = fields.Html(string='External Dependencies', compute='_compute_formatted_fields', store=True)
-    data_files_formatted = fields.Html(string='Data Files', compute='_compute_formatted_fields', store=True)
-    demo_files_formatted = fields.Html(string='Demo Files', compute='_compute_formatted_fields', store=True)
-    assets_formatted = fields.Text(string='Assets (Formatted)', compute='_compute_formatted_fields', store=True)
-    manifest_data_formatted = fields.Text(string='Manifest Data (Formatted)', compute='_compute_formatted_fields', store=True)
+    # Formatted display fields (rendered on read, see _compute_formatted_fields)
+    depends_formatted = fields.Html(string='Dependencies', compute='_compute_formatted_fields')
+    external_dependencies_formatted = fields.Html(string='External Dependencies', compute='_compute_formatted_fields')
+    data_files_formatted = fields.Html(string='Data Files', compute='_compute_formatted_fields')
+    demo_files_formatted = fields.Html(string='Demo Files', compute='_compute_formatted_fields')
+    assets_formatted = fields.Text(string='Assets (Formatted)', compute='_compute_formatted_fields')
+    manifest_data_formatted = fields.Text(string='Manifest Data (Formatted)', compute='_compute_formatted_fields')
     
     # Version analysis computed fields
     is_latest_version = fields.Boolean(string='Is Latest Version', compute='_compute_version_analysis', store=True)
     has_newer_version = fields.Boolean(string='Has Newer Version', compute='_compute_version_analysis', store=True)
     newer_versions_count = fields.Integer(string='Newer Versions Count', compute='_compute_version_analysis', store=True)
     all_versions_ids = fields.Many2many('module.registry', compute='_compute_all_versions', string='All Versions')
+    catalogue_search = fields.Char('Catalogue Search', compute='_compute_catalogue_search',
+                                   search='_search_catalogue_search')
     version_family_count = fields.Integer(string='Version Family Count', compute='_compute_version_analysis', store=True)
     
     _sql_constraints = [
@@ -133,6 +161,26 @@ class ModuleRegistry(models.Model):
          'Version must be unique per template and branch!'),
     ]
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env['module.resolver']._invalidate_snapshots()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self.env['module.resolver']._invalidate_snapshots()
+        if 'version_status' not in vals:
+            return super().write(vals)
+        previous_status = {version.id: version.version_status for version in self}
+        result = super().write(vals)
+        for version in self.filtered(lambda v: v.version_status != previous_status[v.id]):
+            self.env['module.registry.event']._append(
+                'status_changed', version, previous_status=previous_status[version.id])
+        return result
+
+    def unlink(self):
+        self.env['module.resolver']._invalidate_snapshots()
+        return super().unlink()
+
     @api.depends('template_id', 'version')
     def _compute_display_name(self):
         for version in self:
@@ -161,26 +209,39 @@ class ModuleRegistry(models.Model):
             else:
                 version.full_name = f"{version.template_id.technical_name or 'Unknown'} v{version.version or 'Unknown'}"
 
-    @api.depends('depends', 'external_dependencies', 'data_files', 'demo_files', 'assets', 'manifest_data')
+    @api.depends('manifest_id')
+    def _compute_manifest_fields(self):
+        for module in self:
+            manifest = module.manifest_data or {}
+            module.depends = json.dumps(manifest.get('depends', []))
+            module.external_dependencies = json.dumps(manifest.get('external_dependencies', {}))
+            module.data_files = json.dumps(manifest.get('data', []))
+            module.demo_files = json.dumps(manifest.get('demo', []))
+            module.assets = json.dumps(manifest.get('assets', {}))
+
+    @api.depends('manifest_id')
     def _compute_formatted_fields(self):
+        # Rendered from the manifest only: versions sharing a manifest share the entry,
+        # and a manifest change is a new checksum
         for module in self:
-            # Format dependencies
-            module.depends_formatted = module._format_list_field(module.depends, 'Dependencies')
-            
-            # Format external dependencies
-            module.external_dependencies_formatted = module._format_external_deps(module.external_dependencies)
-            
-            # Format data files
-            module.data_files_formatted = module._format_list_field(module.data_files, 'Data Files')
-            
-            # Format demo files
-            module.demo_files_formatted = module._format_list_field(module.demo_files, 'Demo Files')
-            
-            # Format assets
-            module.assets_formatted = module._format_json_field(module.assets, 'Assets')
-            
-            # Format manifest data
-            module.manifest_data_formatted = module._format_manifest_data(module.manifest_data)
+            checksum = module.manifest_id.checksum
+            values = _formatted_cache.get(checksum) if checksum else None
+            if values is None:
+                values = module._get_formatted_values()
+                if checksum:
+                    _formatted_cache[checksum] = values
+            module.update(values)
+
+    def _get_formatted_values(self):
+        self.ensure_one()
+        return {
+            'depends_formatted': self._format_list_field(self.depends, 'Dependencies'),
+            'external_dependencies_formatted': self._format_external_deps(self.external_dependencies),
+            'data_files_formatted': self._format_list_field(self.data_files, 'Data Files'),
+            'demo_files_formatted': self._format_list_field(self.demo_files, 'Demo Files'),
+            'assets_formatted': self._format_json_field(self.assets, 'Assets'),
+            'manifest_data_formatted': self._format_manifest_data(self.manifest_data),
+        }
 
     def _format_list_field(self, json_field, title):
         """Format a JSON list field for nice HTML display"""
@@ -314,6 +375,12 @@ class ModuleRegistry(models.Model):
         
         return newer_versions
 
+    def _compute_catalogue_search(self):
+        self.catalogue_search = False
+
+    def _search_catalogue_search(self, operator, value):
+        return self.env['module.template']._get_catalogue_search_domain('template_id', operator, value)
+
     def _compute_all_versions(self):
         for version in self:
             if version.template_id:
@@ -357,6 +424,19 @@ class ModuleRegistry(models.Model):
         
         return tuple(parts)
 
+    @api.model
+    def _get_version_order_sql(self, alias):
+        """SQL ORDER BY terms sorting the versions of table alias newest first, like _parse_version:
+        the first four numbers of the version string (zero padded), then final releases before pre-releases"""
+        return SQL("""
+            (ARRAY(SELECT m.part[1]::numeric
+                     FROM regexp_matches(%(version)s, '[0-9]+', 'g') WITH ORDINALITY AS m(part, position)
+                    ORDER BY m.position)
+             || ARRAY[0, 0, 0, 0]::numeric[])[1:4] DESC,
+            lower(%(version)s) !~ '(alpha|beta|rc|dev|pre)' DESC,
+            %(version)s DESC
+        """, version=SQL.identifier(alias, 'version'))
+
     def _get_module_repos_path(self):
         """Get the path where module repositories are stored in filestore"""
         filestore_path = self.env['ir.attachment']._filestore()
@@ -458,152 +538,157 @@ class ModuleRegistry(models.Model):
             _logger.error(f"Failed to update repository at {repo_path}: {error_msg}")
             raise
 
-    def _get_local_repository_branches(self, repo_path):
-        """Get all branches from a local git repository"""
+    def _get_local_repository_branches(self, repo_path, repository):
+        """Get the branches to sync from a local git repository, per the library branch policy"""
         try:
-            # Get all remote branches
+            # All remote branches with their last commit date, in one call
             result = subprocess.run([
-                'git', 'branch', '-r'
-            ], cwd=repo_path, check=True, capture_output=True, text=True)
-            
-            branches = []
-            for line in result.stdout.strip().split('\n'):
-                if line.strip() and not line.strip().startswith('origin/HEAD'):
-                    # Extract branch name (remove 'origin/' prefix)
-                    branch_name = line.strip().replace('origin/', '')
-                    # Include main branches and version branches
-                    if (branch_name in ['main', 'master', 'develop'] or 
-                        re.match(r'^\d+\.\d+$', branch_name) or  # Version branches like 18.0, 17.0
-                        re.match(r'^v?\d+\.\d+', branch_name)):  # Version branches like v18.0, 18.0-dev
-                        branches.append(branch_name)
+                'git', 'for-each-ref', '--format=%(refname:strip=3)%09%(committerdate:unix)', 'refs/remotes/origin'
+            ], cwd=repo_path, check=True, capture_output=True, text=True, timeout=30)
             
-            # Always include default branch if not already included
-            if not branches:
-                branches = ['main']  # Fallback
-                
-            return branches
+            branch_dates = {}
+            for line in result.stdout.splitlines():
+                branch_name, __, timestamp = line.partition('\t')
+                if branch_name and branch_name != 'HEAD':
+                    branch_dates[branch_name] = datetime.utcfromtimestamp(int(timestamp)) if timestamp else None
             
         except subprocess.CalledProcessError as e:
             _logger.error(f"Failed to get branches from {repo_path}: {e.stderr}")
-            return ['main']  # Fallback
+            branch_dates = {}
         except Exception as e:
             _logger.error(f"Error getting branches from {repo_path}: {str(e)}")
-            return ['main']  # Fallback
+            branch_dates = {}
+        
+        branches = self._select_repository_branches(repository, branch_dates)
+        return branches or [repository.default_branch or 'main']  # Fallback
 
-    def _discover_modules_in_local_branch(self, repository, repo_path, branch):
-        """Discover all Odoo modules in a specific branch of a local repository"""
+    def _select_repository_branches(self, repository, branch_dates):
+        """Apply the branch policy of the repository library"""
+        policy = self._get_repository_library(repository)._get_branch_policy()
+        branches = select_branches(branch_dates, policy, repository.default_branch)
+        _logger.info(f"Branch policy selected {len(branches)} of {len(branch_dates)} branches "
+                     f"in {repository.full_name}: {', '.join(branches)}")
+        return branches
+
+    def _get_repository_library(self, repository):
+        """Library of a repository, empty on the first sync (discovery then uses the default globs)"""
+        return self.env['module.library'].search([('github_repository_id', '=', repository.id)], limit=1)
+
+    def _get_repository_info(self, repository):
+        """Plain copy of the repository fields used to build module data outside of the ORM"""
+        return {
+            'full_name': repository.full_name,
+            'html_url': repository.html_url,
+            'default_branch': repository.default_branch,
+        }
+
+    def _discover_modules_in_local_branch(self, repo_path, branch, addon_globs, repository_info, tracker):
+        """Discover all Odoo modules in a specific branch of a local repository.
+
+        Lists the whole branch tree with one git ls-tree and reads the selected manifests
+        with one git cat-file --batch, without checking the branch out. Does not touch the
+        ORM, so several branches can be scanned in parallel threads.
+
+        Args:
+            addon_globs: (include, exclude) globs from module.library._get_addon_globs
+            repository_info: dict from _get_repository_info
+            tracker: SyncTracker of the run, collects the scan and parse timings
+        """
         try:
-            # Checkout the branch
-            subprocess.run([
-                'git', 'checkout', f'origin/{branch}'
-            ], cwd=repo_path, check=True, capture_output=True, text=True, timeout=30)
-            
+            with tracker.phase('scan'):
+                head_sha = self._get_local_branch_head(repo_path, branch)
+                file_paths = self._list_local_branch_files(repo_path, branch)
+                manifest_paths = filter_manifest_paths(file_paths, *addon_globs)
+                contents = self._read_local_branch_files(repo_path, branch, manifest_paths)
+
             modules_found = []
-            
-            # Scan root directory for modules
-            modules_found.extend(self._scan_local_directory_for_modules(repo_path, repository, "", branch))
-            
-            # Also check common module directories
-            common_dirs = ['addons', 'modules', 'odoo-addons', 'src']
-            for dir_name in common_dirs:
-                dir_path = os.path.join(repo_path, dir_name)
-                if os.path.exists(dir_path) and os.path.isdir(dir_path):
-                    modules_found.extend(self._scan_local_directory_for_modules(dir_path, repository, dir_name, branch))
-            
+            with tracker.phase('parse'):
+                for manifest_path, content in contents.items():
+                    module_path = manifest_path.rsplit('/', 1)[0]
+                    module_data = self._parse_manifest_content(content, repository_info, module_path, branch)
+                    if module_data:
+                        modules_found.append(module_data)
+                    else:
+                        tracker.count('error')
+            tracker.scanned(branch, head_sha)
             return modules_found
             
         except subprocess.TimeoutExpired:
-            _logger.error(f"Timeout while checking out branch {branch} in {repo_path}")
+            _logger.error(f"Timeout while reading branch {branch} in {repo_path}")
             return []
         except subprocess.CalledProcessError as e:
             error_msg = e.stderr if e.stderr else str(e)
-            _logger.warning(f"Failed to checkout branch {branch} in {repo_path}: {error_msg}")
+            _logger.warning(f"Failed to read branch {branch} in {repo_path}: {error_msg}")
             return []
         except Exception as e:
             _logger.error(f"Error discovering modules in local branch {branch}: {str(e)}")
             return []
 
-    def _scan_local_directory_for_modules(self, directory_path, repository, base_path="", branch=None):
-        """Scan a local directory for Odoo modules"""
-        modules_found = []
-        
-        try:
-            if not os.path.exists(directory_path):
-                return modules_found
-                
-            for item in os.listdir(directory_path):
-                item_path = os.path.join(directory_path, item)
-                
-                if os.path.isdir(item_path):
-                    # Check if this directory contains a __manifest__.py file
-                    manifest_path = os.path.join(item_path, '__manifest__.py')
-                    
-                    if os.path.exists(manifest_path):
-                        # This is an Odoo module
-                        module_path = f"{base_path}/{item}" if base_path else item
-                        module_data = self._parse_manifest_from_local_file(manifest_path, repository, module_path, branch)
-                        if module_data:
-                            modules_found.append(module_data)
-                            
-        except Exception as e:
-            _logger.warning(f"Error scanning local directory {directory_path}: {str(e)}")
-            
-        return modules_found
+    def _get_local_branch_head(self, repo_path, branch):
+        """Commit sha of the fetched head of a branch"""
+        result = subprocess.run([
+            'git', 'rev-parse', '--verify', f'origin/{branch}^{{commit}}'
+        ], cwd=repo_path, check=True, capture_output=True, text=True, timeout=30)
+        return result.stdout.strip()
+
+    def _list_local_branch_files(self, repo_path, branch):
+        """All file paths of a branch, from a single recursive tree listing"""
+        result = subprocess.run([
+            'git', 'ls-tree', '-r', '-z', '--name-only', f'origin/{branch}'
+        ], cwd=repo_path, check=True, capture_output=True, timeout=60)
+        return [path for path in result.stdout.decode('utf-8', 'replace').split('\0') if path]
+
+    def _read_local_branch_files(self, repo_path, branch, paths):
+        """Read several files of a branch in one git cat-file --batch call
+
+        Returns:
+            dict {path: decoded content} for the paths present in the branch
+        """
+        if not paths:
+            return {}
+        request = ''.join(f"origin/{branch}:{path}\n" for path in paths).encode('utf-8')
+        result = subprocess.run([
+            'git', 'cat-file', '--batch'
+        ], cwd=repo_path, input=request, check=True, capture_output=True, timeout=120)
+
+        # Output per object: "<sha> <type> <size>\n<content>\n" or "<name> missing\n"
+        output = result.stdout
+        contents = {}
+        position = 0
+        for path in paths:
+            end_of_header = output.index(b'\n', position)
+            header = output[position:end_of_header]
+            position = end_of_header + 1
+            if header.endswith(b' missing'):
+                continue
+            size = int(header.rsplit(b' ', 1)[1])
+            contents[path] = output[position:position + size].decode('utf-8', 'replace')
+            position += size + 1
+        return contents
 
-    def _parse_manifest_from_local_file(self, manifest_path, repository, module_path, branch=None):
-        """Parse __manifest__.py content from local file"""
+    def _parse_manifest_content(self, content, repository_info, module_path, branch=None):
+        """Parse __manifest__.py source into module data"""
         try:
-            with open(manifest_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Remove comments and parse
-            content = re.sub(r'#.*', '', content)
-            import ast
-            manifest_dict = ast.literal_eval(content)
-            
-            # Build module data similar to GitHub API version
-            version_str = manifest_dict.get('version', '')
-            technical_name = module_path.split('/')[-1]
-            url_branch = branch or repository.default_branch
-            
-            # Create URLs that point to GitHub (for consistency with existing data)
-            manifest_url = f"{repository.html_url}/blob/{url_branch}/{module_path}/__manifest__.py"
-            readme_url = f"{repository.html_url}/blob/{url_branch}/{module_path}/README.md"
-            
-            module_data = {
-                'technical_name': technical_name,
-                'name': manifest_dict.get('name', technical_name),
-                'version': version_str,
-                'odoo_version': self._extract_odoo_version(version_str),
-                'summary': manifest_dict.get('summary', ''),
-                'description': manifest_dict.get('description', ''),
-                'author': manifest_dict.get('author', ''),
-                'website': manifest_dict.get('website', ''),
-                'license': manifest_dict.get('license', ''),
-                'category': manifest_dict.get('category', 'Uncategorized'),
-                'installable': manifest_dict.get('installable', True),
-                'auto_install': manifest_dict.get('auto_install', False),
-                'application': manifest_dict.get('application', False),
-                'depends': json.dumps(manifest_dict.get('depends', [])),
-                'external_dependencies': json.dumps(manifest_dict.get('external_dependencies', {})),
-                'data_files': json.dumps(manifest_dict.get('data', [])),
-                'demo_files': json.dumps(manifest_dict.get('demo', [])),
-                'assets': json.dumps(manifest_dict.get('assets', {})),
-                'manifest_data': manifest_dict,
-                'github_path': module_path,
-                'manifest_url': manifest_url,
-                'readme_url': readme_url,
-            }
-            
-            return module_data
-            
+            manifest_dict = parse_manifest(content)
+        except ManifestParseError as e:
+            _logger.warning(f"Invalid manifest for {module_path} in branch {branch}: {str(e)}")
+            return None
+        try:
+            return self._build_module_data(manifest_dict, repository_info, module_path, branch)
         except Exception as e:
-            _logger.error(f"Error parsing local manifest {manifest_path}: {str(e)}")
+            _logger.error(f"Error parsing manifest for {module_path} in branch {branch}: {str(e)}")
             return None
 
     @api.model
-    def sync_modules_from_repository(self, repository_id):
-        """Sync all modules from a GitHub repository across multiple branches"""
+    def sync_modules_from_repository(self, repository_id, reclone=False):
+        """Sync all modules from a GitHub repository across multiple branches.
+
+        Every execution is recorded as a module.sync.run with its phase timings and counts.
+        With reclone, the local clone is removed first (under the sync lock) and cloned again.
+
+        Returns:
+            see _run_sync; None when a sync of the repository is already running
+        """
         repository = self.env['github.repository'].browse(repository_id)
         if not repository.exists():
             return False
@@ -612,80 +697,171 @@ class ModuleRegistry(models.Model):
             _logger.warning(f"Repository {repository.full_name} is not marked as an Odoo module repository. Skipping sync.")
             return False
 
-        try:
+        def sync(tracker):
+            if reclone:
+                _logger.info(f"Force re-cloning repository {repository.full_name}")
+                shutil.rmtree(self._get_repository_local_path(repository), ignore_errors=True)
             # Use local cloning for odoo_module_repo=True repositories
             if repository.odoo_module_repo:
-                return self._sync_modules_from_local_clone(repository)
+                self._sync_modules_from_local_clone(repository, tracker)
             else:
                 # Fallback to GitHub API for non-module repos (shouldn't happen due to check above)
                 github_token = self.env['ir.config_parameter'].sudo().get_param('github_integration.token')
-                return self._sync_modules_from_github_api(repository, github_token)
-        except Exception as e:
-            _logger.error(f"Error syncing modules from repository {repository.full_name}: {str(e)}")
-            return False
+                self._sync_modules_from_github_api(repository, github_token, tracker)
+
+        return self._run_sync(repository, sync)
+
+    @api.model
+    def _run_sync(self, repository, sync):
+        """Run sync(tracker), which upserts module versions of the repository, as a module.sync.run
 
-    def _sync_modules_from_local_clone(self, repository):
+        The run records the phase timings and counts; the template, library and repository
+        aggregates and the catalogue are brought up to date once, at the end.
+
+        Returns:
+            True when sync completed, False when it raised, None when another sync of the
+            repository was running: the request is coalesced into that sync
+        """
+        clone_path = self._get_repository_local_path(repository)
+        with repository_lock(self.env.cr, repository.id, clone_path) as acquired:
+            if not acquired:
+                _logger.info(f"Repository {repository.full_name} is already being synced, skipping")
+                return None
+            tracker = self.env['module.sync.run']._start(repository, self._get_repository_library(repository))
+            self.env.cr.commit()
+            error = None
+            try:
+                # Every upsert would otherwise recompute the template, library and repository
+                # aggregates on the next flush, i.e. at least once per committed batch
+                with self.env.protecting(self._get_sync_aggregate_targets(repository)):
+                    sync(tracker)
+            except Exception as e:
+                _logger.error(f"Error syncing modules from repository {repository.full_name}: {str(e)}")
+                # Batches are committed as they go, only the current one is lost
+                self.env.cr.rollback()
+                error = str(e)
+            # Also after a failure: the batches committed so far have changed the aggregates
+            try:
+                with tracker.phase('recompute'):
+                    self._recompute_sync_aggregates(repository)
+                    templates = self.env['module.template'].search([('github_repository_id', '=', repository.id)])
+                    self.env['module.catalogue']._refresh(templates.ids)
+                    with serialized_section(self.env.cr, SERIES_STATS_LOCK):
+                        self.env['module.series.stats']._refresh(
+                            list({template.library_id.id for template in templates}))
+                        self.env.cr.commit()
+            except Exception as e:
+                _logger.error(f"Error refreshing the aggregates of repository {repository.full_name}: {str(e)}")
+                # The run must not stay running: record the failure on it
+                self.env.cr.rollback()
+                error = '\n'.join(filter(None, [error, str(e)]))
+            tracker.run._finish(tracker, error)
+            # Before the lock is released, so the next sync starts from the final state
+            self.env.cr.commit()
+            return not error
+
+    def _get_sync_aggregate_targets(self, repository):
+        """Aggregate fields a sync of the repository changes, with the records holding them
+
+        New templates created during the sync are not included until the sync is over;
+        they only hold the few versions of this sync, so computing them as usual is cheap.
+
+        Returns:
+            list of (fields, records) tuples, as accepted by env.protecting
+        """
+        records_by_model = {
+            'github.repository': repository,
+            'module.library': self._get_repository_library(repository),
+            'module.template': self.env['module.template'].search([('github_repository_id', '=', repository.id)]),
+        }
+        return [
+            ([field for field in self.env[model_name]._fields.values()
+              if field.store and field.compute in SYNC_AGGREGATE_COMPUTES[model_name]], records)
+            for model_name, records in records_by_model.items()
+        ]
+
+    def _recompute_sync_aggregates(self, repository):
+        """Recompute the aggregates suspended during a sync, each field once for all its records"""
+        for fields_to_compute, records in self._get_sync_aggregate_targets(repository):
+            for field in fields_to_compute:
+                self.env.add_to_compute(field, records)
+        self.env.flush_all()
+
+    def _sync_modules_from_local_clone(self, repository, tracker):
         """Sync modules using local git clone instead of GitHub API"""
         _logger.info(f"Syncing repository {repository.full_name} using local clone")
         
         # Get or create local clone
-        repo_path = self._get_or_create_local_clone(repository)
+        with tracker.phase('clone'):
+            repo_path = self._get_or_create_local_clone(repository)
         if not repo_path:
-            return False
-            
-        try:
-            # Get all branches from local repository
-            branches = self._get_local_repository_branches(repo_path)
-            _logger.info(f"Found {len(branches)} branches in local repository {repository.full_name}")
+            _logger.warning(f"No local clone of {repository.full_name}, falling back to the GitHub API")
+            github_token = self.env['ir.config_parameter'].sudo().get_param('github_integration.token')
+            return self._sync_modules_from_github_api(repository, github_token, tracker)
             
-            total_modules = 0
-            for branch in branches:
-                modules_found = self._discover_modules_in_local_branch(repository, repo_path, branch)
+        # Get all branches from local repository
+        with tracker.phase('branches'):
+            branches = self._get_local_repository_branches(repo_path, repository)
+        _logger.info(f"Found {len(branches)} branches in local repository {repository.full_name}")
+        tracker.flush(mode='clone', branch_count=len(branches))
+        
+        # Branches are scanned in worker threads straight from their refs; each finished
+        # branch is handed to this thread, the only one using the cursor, for the upserts
+        # while the remaining branches are still being scanned.
+        addon_globs = self._get_repository_library(repository)._get_addon_globs()
+        repository_info = self._get_repository_info(repository)
+        workers = min(self._get_branch_scan_workers(), len(branches)) or 1
+        total_modules = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._discover_modules_in_local_branch,
+                                repo_path, branch, addon_globs, repository_info, tracker): branch
+                for branch in branches
+            }
+            for future in as_completed(futures):
+                branch = futures[future]
+                modules_found = future.result()
                 _logger.info(f"Found {len(modules_found)} modules in branch {branch} of repository {repository.full_name}")
-                
-                # Process modules in smaller batches to avoid large transaction issues
-                batch_size = 10
-                for i in range(0, len(modules_found), batch_size):
-                    batch = modules_found[i:i + batch_size]
-                    
-                    for module_data in batch:
-                        module_data['github_branch'] = branch
-                        self._create_or_update_module(module_data, repository)
-                    
-                    # Commit after each batch to avoid large transactions
-                    try:
-                        self.env.cr.commit()
-                    except Exception as commit_e:
-                        _logger.warning(f"Error committing batch for branch {branch}: {str(commit_e)}")
-                        self.env.cr.rollback()
-                
+                self._write_branch_modules(modules_found, branch, repository, tracker)
                 total_modules += len(modules_found)
-            
-            _logger.info(f"Total modules synced: {total_modules} across {len(branches)} branches")
-            return True
-        except Exception as e:
-            _logger.error(f"Error syncing modules from local clone {repository.full_name}: {str(e)}")
-            return False
-
-    def _sync_modules_from_github_api(self, repository, github_token):
-        """Original GitHub API sync method (fallback)"""
-        # Get all branches from the repository
-        branches = self._get_repository_branches(repository, github_token)
-        _logger.info(f"Found {len(branches)} branches in repository {repository.full_name}")
         
-        total_modules = 0
-        for branch in branches:
-            modules_found = self._discover_modules_in_repository_branch(repository, branch, github_token)
-            _logger.info(f"Found {len(modules_found)} modules in branch {branch} of repository {repository.full_name}")
-            
-            # Process modules in smaller batches to avoid large transaction issues
-            batch_size = 10
-            for i in range(0, len(modules_found), batch_size):
+        with tracker.phase('recompute'):
+            self.env['module.dependency']._resolve_targets()
+        _logger.info(f"Total modules synced: {total_modules} across {len(branches)} branches")
+        return True
+
+    def _get_branch_scan_workers(self):
+        """Number of branches scanned in parallel, configurable via system parameter"""
+        workers = self.env['ir.config_parameter'].sudo().get_param('me_module_registry.branch_scan_workers', 4)
+        try:
+            return max(1, int(workers))
+        except (TypeError, ValueError):
+            return 4
+
+    def _write_branch_modules(self, modules_found, branch, repository, tracker):
+        """Upsert the modules found in a branch, committing in small batches"""
+        # Process modules in smaller batches to avoid large transaction issues
+        batch_size = 10
+        with tracker.phase('upsert'):
+            # At least one (possibly empty) batch, so the branch is always recorded on the run
+            for i in range(0, max(len(modules_found), 1), batch_size):
                 batch = modules_found[i:i + batch_size]
                 
                 for module_data in batch:
                     module_data['github_branch'] = branch
-                    self._create_or_update_module(module_data, repository)
+                    tracker.count(self._create_or_update_module(module_data, repository))
+                
+                if i + batch_size >= len(modules_found):
+                    # A branch whose scan failed part way would look emptied: no snapshot
+                    if branch in tracker.heads:
+                        self.env['module.snapshot']._record(
+                            tracker.run, branch, modules_found, tracker.heads[branch])
+                    # The branch progress is committed (and pushed on the bus) with its last batch
+                    tracker.flush(
+                        branches_done=tracker.run.branches_done + 1,
+                        current_branch=branch,
+                        module_count=tracker.run.module_count + len(modules_found),
+                    )
                 
                 # Commit after each batch to avoid large transactions
                 try:
@@ -693,121 +869,269 @@ class ModuleRegistry(models.Model):
                 except Exception as commit_e:
                     _logger.warning(f"Error committing batch for branch {branch}: {str(commit_e)}")
                     self.env.cr.rollback()
+
+    def _sync_modules_from_github_api(self, repository, github_token, tracker):
+        """GitHub API sync (fallback when the repository cannot be cloned)"""
+        with self._get_github_session(github_token) as session:
+            # Get all branches from the repository
+            with tracker.phase('branches'):
+                branches = self._get_repository_branches(repository, github_token, session=session)
+            _logger.info(f"Found {len(branches)} branches in repository {repository.full_name}")
+            tracker.flush(mode='api', branch_count=len(branches))
             
-            total_modules += len(modules_found)
+            total_modules = 0
+            for branch in branches:
+                modules_found = self._discover_modules_in_repository_branch(
+                    repository, branch, tracker, github_token, session=session)
+                _logger.info(f"Found {len(modules_found)} modules in branch {branch} of repository {repository.full_name}")
+                self._write_branch_modules(modules_found, branch, repository, tracker)
+                total_modules += len(modules_found)
         
+        with tracker.phase('recompute'):
+            self.env['module.dependency']._resolve_targets()
         _logger.info(f"Total modules synced: {total_modules} across {len(branches)} branches")
         return True
 
-    def _get_repository_branches(self, repository, github_token=None):
-        """Get all branches from a GitHub repository"""
-        headers = {'Accept': 'application/vnd.github.v3+json'}
+    def _get_github_api_workers(self):
+        """Number of concurrent GitHub API requests, configurable via system parameter"""
+        workers = self.env['ir.config_parameter'].sudo().get_param('me_module_registry.github_api_workers', 8)
+        try:
+            return max(1, int(workers))
+        except (TypeError, ValueError):
+            return 8
+
+    def _get_github_session(self, github_token=None):
+        """HTTP session with keep-alive connections sized for the concurrent blob fetches"""
+        session = requests.Session()
+        session.headers['Accept'] = 'application/vnd.github.v3+json'
         if github_token:
-            headers['Authorization'] = f'token {github_token}'
+            session.headers['Authorization'] = f'token {github_token}'
+        workers = self._get_github_api_workers()
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=workers))
+        return session
 
-        api_url = f"https://api.github.com/repos/{repository.full_name}/branches"
-        branches = []
+    def _get_repository_branches(self, repository, github_token=None, session=None):
+        """Get the branches to sync from a GitHub repository, per the library branch policy"""
+        http = session or self._get_github_session(github_token)
+        policy = self._get_repository_library(repository)._get_branch_policy()
+        branch_dates = {}
         
         try:
-            response = requests.get(api_url, headers=headers, timeout=30)
-            if response.status_code == 200:
-                branch_data = response.json()
-                # Focus on main branches and version branches
-                for branch in branch_data:
-                    branch_name = branch['name']
-                    # Include main branches and version-like branches (e.g., 18.0, 17.0, main, master)
-                    if (branch_name in ['main', 'master', 'develop'] or 
-                        re.match(r'^\d+\.\d+$', branch_name) or  # Version branches like 18.0, 17.0
-                        re.match(r'^v?\d+\.\d+', branch_name)):  # Version branches like v18.0, 18.0-dev
-                        branches.append(branch_name)
-                
-                # Always include default branch if not already included
-                if repository.default_branch and repository.default_branch not in branches:
-                    branches.append(repository.default_branch)
+            if github_token and branch_policy_needs_dates(policy):
+                branch_dates = self._get_branch_dates_graphql(http, repository)
             else:
-                _logger.warning(f"Could not fetch branches for {repository.full_name}: {response.status_code}")
-                # Fallback to default branch
-                branches = [repository.default_branch] if repository.default_branch else ['main']
+                api_url = f"https://api.github.com/repos/{repository.full_name}/branches?per_page=100"
+                while api_url:
+                    response = http.get(api_url, timeout=30)
+                    if response.status_code != 200:
+                        _logger.warning(f"Could not fetch branches for {repository.full_name}: {response.status_code}")
+                        break
+                    branch_dates.update((branch['name'], None) for branch in response.json())
+                    api_url = response.links.get('next', {}).get('url')
+                if branch_policy_needs_dates(policy):
+                    # Without GraphQL, only look up the dates of the branches passing the name filters
+                    candidates = select_branches(branch_dates, dict(policy, max_age_days=0, max_count=0))
+                    branch_dates = {name: self._get_branch_date(http, repository, name) for name in candidates}
                 
         except Exception as e:
             _logger.error(f"Error fetching branches for {repository.full_name}: {str(e)}")
-            # Fallback to default branch
-            branches = [repository.default_branch] if repository.default_branch else ['main']
-            
-        return branches
+        finally:
+            if session is None:
+                http.close()
+        
+        branches = self._select_repository_branches(repository, branch_dates)
+        return branches or [repository.default_branch or 'main']  # Fallback
 
-    def _discover_modules_in_repository_branch(self, repository, branch, github_token=None):
-        """Discover all Odoo modules in a specific branch of a GitHub repository"""
-        headers = {'Accept': 'application/vnd.github.v3+json'}
-        if github_token:
-            headers['Authorization'] = f'token {github_token}'
+    def _get_branch_dates_graphql(self, session, repository):
+        """All branch names with their last commit date, 100 per GraphQL request"""
+        owner, name = repository.full_name.split('/', 1)
+        query = """
+            query($owner: String!, $name: String!, $cursor: String) {
+              repository(owner: $owner, name: $name) {
+                refs(refPrefix: "refs/heads/", first: 100, after: $cursor) {
+                  pageInfo { hasNextPage endCursor }
+                  nodes { name target { ... on Commit { committedDate } } }
+                }
+              }
+            }
+        """
+        branch_dates = {}
+        cursor = None
+        while True:
+            response = session.post('https://api.github.com/graphql', timeout=30, json={
+                'query': query,
+                'variables': {'owner': owner, 'name': name, 'cursor': cursor},
+            })
+            response.raise_for_status()
+            refs = response.json()['data']['repository']['refs']
+            for node in refs['nodes']:
+                committed = (node.get('target') or {}).get('committedDate')
+                branch_dates[node['name']] = self._parse_github_datetime(committed)
+            if not refs['pageInfo']['hasNextPage']:
+                return branch_dates
+            cursor = refs['pageInfo']['endCursor']
 
-        # Get repository contents for specific branch
-        api_url = f"https://api.github.com/repos/{repository.full_name}/contents"
-        modules_found = []
-        
-        try:
-            # First, check root directory for modules
-            modules_found.extend(self._scan_directory_for_modules(api_url, repository, headers, "", branch))
-            
-            # Also check common module directories
-            common_dirs = ['addons', 'modules', 'odoo-addons', 'src']
-            for dir_name in common_dirs:
-                dir_url = f"{api_url}/{dir_name}"
-                modules_found.extend(self._scan_directory_for_modules(dir_url, repository, headers, dir_name, branch))
-                
-        except Exception as e:
-            _logger.error(f"Error discovering modules in {repository.full_name} branch {branch}: {str(e)}")
-            
-        return modules_found
+    def _get_branch_date(self, session, repository, branch):
+        """Last commit date of one branch over REST, None when unknown"""
+        response = session.get(
+            f"https://api.github.com/repos/{repository.full_name}/branches/{quote(branch, safe='')}", timeout=30)
+        if response.status_code != 200:
+            return None
+        commit = response.json().get('commit', {}).get('commit', {})
+        return self._parse_github_datetime((commit.get('committer') or {}).get('date'))
 
-    def _scan_directory_for_modules(self, api_url, repository, headers, base_path="", branch=None):
-        """Scan a directory for Odoo modules in a specific branch"""
+    def _parse_github_datetime(self, value):
+        """GitHub ISO 8601 timestamp (e.g. 2024-05-01T12:00:00Z) to a naive UTC datetime"""
+        if not value:
+            return None
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+
+    def _discover_modules_in_repository_branch(self, repository, branch, tracker, github_token=None, session=None):
+        """Discover all Odoo modules in a specific branch of a GitHub repository.
+
+        One recursive trees request locates every manifest. The manifests are then read with
+        GraphQL in batches when a token is configured, or as concurrent blob requests otherwise.
+        """
+        http = session or self._get_github_session(github_token)
         modules_found = []
         
-        # Add branch parameter to API URL if specified
-        branch_param = f"?ref={branch}" if branch else ""
-        
         try:
-            response = requests.get(f"{api_url}{branch_param}", headers=headers, timeout=30)
-            if response.status_code != 200:
-                return modules_found
+            with tracker.phase('scan'):
+                head_sha = self._get_branch_head(http, repository, branch)
+                blob_shas = self._get_branch_tree(http, repository, branch)
+                manifest_paths = self._get_repository_library(repository)._filter_manifest_paths(blob_shas)
+                repository_info = self._get_repository_info(repository)
+                contents = {}
+                if github_token:
+                    contents = self._fetch_files_graphql(http, repository, branch, manifest_paths)
+                # Anything GraphQL could not return (or everything without a token) goes through REST
+                remaining = {path: blob_shas[path] for path in manifest_paths if path not in contents}
+                contents.update(self._fetch_blobs(http, repository, remaining))
+
+            with tracker.phase('parse'):
+                for manifest_path in manifest_paths:
+                    if manifest_path not in contents:
+                        continue
+                    module_data = self._parse_manifest_content(
+                        contents[manifest_path], repository_info, manifest_path.rsplit('/', 1)[0], branch)
+                    if module_data:
+                        modules_found.append(module_data)
+                    else:
+                        tracker.count('error')
+            tracker.scanned(branch, head_sha)
                 
-            contents = response.json()
-            
-            for item in contents:
-                if item['type'] == 'dir':
-                    # Check if this directory contains a __manifest__.py file
-                    manifest_url = f"{api_url}/{item['name']}/__manifest__.py{branch_param}"
-                    manifest_response = requests.get(manifest_url, headers=headers, timeout=10)
-                    
-                    if manifest_response.status_code == 200:
-                        # This is an Odoo module
-                        module_path = f"{base_path}/{item['name']}" if base_path else item['name']
-                        module_data = self._parse_manifest_from_github(manifest_response.json(), repository, module_path, branch)
-                        if module_data:
-                            modules_found.append(module_data)
-                            
         except Exception as e:
-            _logger.warning(f"Error scanning directory {api_url} in branch {branch}: {str(e)}")
+            _logger.error(f"Error discovering modules in {repository.full_name} branch {branch}: {str(e)}")
+        finally:
+            if session is None:
+                http.close()
             
         return modules_found
 
-    def _parse_manifest_from_github(self, manifest_file_data, repository, module_path, branch=None):
-        """Parse __manifest__.py content from GitHub API response"""
-        try:
-            manifest_dict = self._decode_and_parse_manifest(manifest_file_data['content'])
-            return self._build_module_data(manifest_dict, manifest_file_data, repository, module_path, branch)
-        except Exception as e:
-            _logger.error(f"Error parsing manifest for {module_path} in branch {branch}: {str(e)}")
+    def _get_branch_head(self, session, repository, branch):
+        """Commit sha of the head of a branch, None when unknown"""
+        response = session.get(
+            f"https://api.github.com/repos/{repository.full_name}/commits/{quote(branch, safe='')}",
+            headers={'Accept': 'application/vnd.github.sha'}, timeout=30)
+        if response.status_code != 200:
             return None
+        return response.text.strip()
+
+    def _get_branch_tree(self, session, repository, branch):
+        """File paths and blob shas of a branch, from the recursive trees API
+
+        GitHub truncates very large recursive trees; the top-level folders are then listed
+        one by one (concurrently) so monorepos are still fully covered.
+
+        Returns:
+            dict {path: blob sha}
+        """
+        api_url = f"https://api.github.com/repos/{repository.full_name}/git/trees"
+        response = session.get(f"{api_url}/{quote(branch, safe='')}?recursive=1", timeout=30)
+        response.raise_for_status()
+        tree = response.json()
+        blob_shas = {item['path']: item['sha'] for item in tree.get('tree', []) if item['type'] == 'blob'}
+        if not tree.get('truncated'):
+            return blob_shas
+
+        _logger.info(f"Tree of {repository.full_name} branch {branch} is truncated, listing top-level folders")
+        response = session.get(f"{api_url}/{quote(branch, safe='')}", timeout=30)
+        response.raise_for_status()
+        folders = [item for item in response.json().get('tree', []) if item['type'] == 'tree']
+
+        def list_folder(folder):
+            folder_response = session.get(f"{api_url}/{folder['sha']}?recursive=1", timeout=30)
+            folder_response.raise_for_status()
+            subtree = folder_response.json()
+            if subtree.get('truncated'):
+                _logger.warning(f"Folder {folder['path']} of {repository.full_name} is truncated, "
+                                f"some modules may be missed")
+            return {f"{folder['path']}/{item['path']}": item['sha']
+                    for item in subtree.get('tree', []) if item['type'] == 'blob'}
+
+        if folders:
+            with ThreadPoolExecutor(max_workers=min(self._get_github_api_workers(), len(folders))) as executor:
+                for folder_blobs in executor.map(list_folder, folders):
+                    blob_shas.update(folder_blobs)
+        return blob_shas
+
+    def _fetch_files_graphql(self, session, repository, branch, paths, batch_size=100):
+        """Read many files of a branch with aliased GraphQL object lookups, batch_size files per request
+
+        Returns:
+            dict {path: text} for the files GraphQL returned (binary or failed batches are left out)
+        """
+        owner, name = repository.full_name.split('/', 1)
+        contents = {}
+        for offset in range(0, len(paths), batch_size):
+            batch = paths[offset:offset + batch_size]
+            objects = ' '.join(
+                f'f{index}: object(expression: {json.dumps(f"{branch}:{path}")}) {{ ... on Blob {{ text }} }}'
+                for index, path in enumerate(batch)
+            )
+            query = f'query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {objects} }} }}'
+            try:
+                response = session.post('https://api.github.com/graphql', timeout=60, json={
+                    'query': query,
+                    'variables': {'owner': owner, 'name': name},
+                })
+                data = response.json().get('data') if response.status_code == 200 else None
+            except Exception as e:
+                _logger.warning(f"GraphQL manifest fetch failed for {repository.full_name} branch {branch}: {str(e)}")
+                data = None
+            if not data or not data.get('repository'):
+                continue
+            for index, path in enumerate(batch):
+                blob = data['repository'].get(f'f{index}')
+                if blob and blob.get('text') is not None:
+                    contents[path] = blob['text']
+        return contents
+
+    def _fetch_blobs(self, session, repository, blob_shas):
+        """Fetch blobs concurrently over the pooled session
 
-    def _decode_and_parse_manifest(self, base64_content):
-        """Decode and parse manifest content"""
-        import ast
-        content = base64.b64decode(base64_content).decode('utf-8')
-        content = re.sub(r'#.*', '', content)  # Remove comments
-        return ast.literal_eval(content)
+        Args:
+            blob_shas: dict {path: blob sha}
+        Returns:
+            dict {path: decoded content}
+        """
+        if not blob_shas:
+            return {}
+        api_url = f"https://api.github.com/repos/{repository.full_name}/git/blobs"
+
+        def fetch(item):
+            path, sha = item
+            try:
+                response = session.get(f"{api_url}/{sha}", timeout=10)
+                if response.status_code != 200:
+                    return path, None
+                return path, base64.b64decode(response.json()['content']).decode('utf-8', 'replace')
+            except Exception as e:
+                _logger.warning(f"Error fetching {path} from {repository.full_name}: {str(e)}")
+                return path, None
+
+        with ThreadPoolExecutor(max_workers=min(self._get_github_api_workers(), len(blob_shas))) as executor:
+            return {path: content for path, content in executor.map(fetch, blob_shas.items()) if content is not None}
 
     def _extract_odoo_version(self, version_str):
         """Extract Odoo version from version string using improved parsing"""
@@ -825,11 +1149,12 @@ class ModuleRegistry(models.Model):
         match = re.match(r'^(\\d+\\.\\d+)', version_str)
         return match.group(1) if match else '18.0'
 
-    def _build_module_data(self, manifest_dict, manifest_file_data, repository, module_path, branch):
+    def _build_module_data(self, manifest_dict, repository_info, module_path, branch):
         """Build module data dictionary from manifest"""
         version_str = manifest_dict.get('version', '')
         technical_name = module_path.split('/')[-1]
-        url_branch = branch or repository.default_branch
+        url_branch = branch or repository_info['default_branch']
+        html_url = repository_info['html_url']
         
         return {
             'technical_name': technical_name,
@@ -845,45 +1170,155 @@ class ModuleRegistry(models.Model):
             'installable': manifest_dict.get('installable', True),
             'auto_install': manifest_dict.get('auto_install', False),
             'application': manifest_dict.get('application', False),
-            'depends': json.dumps(manifest_dict.get('depends', [])),
-            'external_dependencies': json.dumps(manifest_dict.get('external_dependencies', {})),
-            'data_files': json.dumps(manifest_dict.get('data', [])),
-            'demo_files': json.dumps(manifest_dict.get('demo', [])),
-            'assets': json.dumps(manifest_dict.get('assets', {})),
             'manifest_data': manifest_dict,
             'github_path': module_path,
-            'manifest_url': manifest_file_data['html_url'],
-            'readme_url': f"{repository.html_url}/blob/{url_branch}/{module_path}/README.md",
+            'manifest_url': f"{html_url}/blob/{url_branch}/{module_path}/__manifest__.py",
+            'readme_url': f"{html_url}/blob/{url_branch}/{module_path}/README.md",
         }
 
-    def _create_or_update_module(self, module_data, repository):
-        """Create or update a module version record"""
+    def _create_or_update_module(self, module_data, repository, retry=True):
+        """Create or update a module version record
+
+        Returns:
+            'created', 'updated', 'unchanged' or 'error'
+        """
         # Use a savepoint to handle potential transaction errors
         try:
             with self.env.cr.savepoint():
                 odoo_version = self._find_odoo_version(module_data['odoo_version'])
                 if not odoo_version:
                     _logger.error(f"unable to determine Odoo version for {module_data['technical_name']}")
-                    return
+                    return 'error'
                 
                 template = self.env['module.template'].find_or_create_template(module_data, repository)
                 version_data = self._prepare_version_data(module_data, template, odoo_version, repository)
                 
                 existing_version = self._find_existing_version(template, module_data, repository)
                 
+                if existing_version and not self._is_version_changed(existing_version, version_data):
+                    existing_version.write({'last_sync': version_data['last_sync']})
+                    return 'unchanged'
                 if existing_version:
+                    # Same manifest checksum: nothing derived from the manifest needs refreshing
+                    manifest_changed = existing_version.manifest_id.id != version_data['manifest_id']
                     existing_version.write(version_data)
+                    status = 'updated'
                     _logger.info(f"Updated version {module_data['technical_name']} v{module_data['version']} "
                                f"from {repository.full_name} ({module_data.get('github_branch', 'default')})")
                 else:
-                    self.create(version_data)
+                    manifest_changed = True
+                    existing_version = self.create(version_data)
+                    status = 'created'
                     _logger.info(f"Created version {module_data['technical_name']} v{module_data['version']} "
                                f"from {repository.full_name} ({module_data.get('github_branch', 'default')})")
+                    existing_version._log_created_event()
+                if manifest_changed:
+                    existing_version._sync_dependency_edges()
+                return status
                     
         except Exception as e:
+            if retry and isinstance(e, SerializationFailure):
+                # A concurrent sync stored a row we need (e.g. a shared manifest) after our
+                # snapshot was taken; a new transaction sees it
+                self.env.cr.commit()
+                return self._create_or_update_module(module_data, repository, retry=False)
             _logger.error(f"Error creating/updating module version {module_data.get('technical_name', 'unknown')}: {str(e)}")
             # Handle sync error in a separate transaction to avoid transaction abort issues
             self._handle_sync_error_safe(module_data, repository, str(e))
+            return 'error'
+
+    def _log_created_event(self):
+        """Change feed event of a new version: bumped when it supersedes a version of the branch"""
+        self.ensure_one()
+        previous_versions = self._get_branch_versions(self) - self
+        previous = max(previous_versions, key=lambda version: self._parse_version(version.version), default=None)
+        if previous and self._parse_version(self.version) > self._parse_version(previous.version):
+            self.env['module.registry.event']._append('bumped', self, previous_version=previous.version)
+        else:
+            self.env['module.registry.event']._append('created', self)
+
+    def _is_version_changed(self, version, version_data):
+        """Whether writing version_data would change anything but the sync timestamp"""
+        if version.sync_status != 'success':
+            return True
+        for field_name, value in version_data.items():
+            if field_name in ('last_sync', 'sync_status', 'sync_error'):
+                continue
+            current = version[field_name]
+            if isinstance(current, models.BaseModel):
+                current = current.id
+            if (current or False) != (value or False):
+                return True
+        return False
+
+    def _get_depends_list(self):
+        """Return the dependency technical names of this version"""
+        self.ensure_one()
+        try:
+            depends = json.loads(self.depends) if self.depends else []
+        except (json.JSONDecodeError, TypeError):
+            return []
+        return [name for name in depends if isinstance(name, str) and name]
+
+    def _sync_dependency_edges(self):
+        """Bring the module.dependency edges in line with the depends of each version.
+
+        Targets are resolved separately, once per sync (see module.dependency._resolve_targets).
+        """
+        to_create = []
+        to_unlink = self.env['module.dependency']
+        for version in self:
+            wanted = set(version._get_depends_list())
+            current = {edge.depends_name: edge for edge in version.dependency_ids}
+            for name, edge in current.items():
+                if name not in wanted:
+                    to_unlink |= edge
+            to_create.extend(
+                {'registry_id': version.id, 'depends_name': name}
+                for name in sorted(wanted - set(current))
+            )
+        if to_unlink:
+            to_unlink.unlink()
+        if to_create:
+            self.env['module.dependency'].create(to_create)
+
+    def _get_dependency_closure_ids(self, reverse=False):
+        """Ids of all versions reached transitively from self"""
+        return list(self.env['module.dependency'].get_closure(self.ids, reverse=reverse)['depth'])
+
+    def action_view_dependency_closure(self):
+        """View every module version this version pulls in"""
+        self.ensure_one()
+        closure = self.env['module.dependency'].get_closure(self.ids)
+        action = {
+            'name': _('Dependencies of %s') % self.display_name,
+            'type': 'ir.actions.act_window',
+            'res_model': 'module.registry',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', list(closure['depth']))],
+        }
+        if closure['unresolved']:
+            action['help'] = _('Not in the registry: %s') % ', '.join(closure['unresolved'])
+        return action
+
+    def action_view_impacted_modules(self):
+        """View every module version that would break if this version was dropped"""
+        self.ensure_one()
+        return {
+            'name': _('Modules depending on %s') % self.display_name,
+            'type': 'ir.actions.act_window',
+            'res_model': 'module.registry',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', self._get_dependency_closure_ids(reverse=True))],
+        }
+
+    @api.model
+    def rebuild_dependency_index(self):
+        """Rebuild all dependency edges from the stored depends and resolve them"""
+        versions = self.search([])
+        for offset in range(0, len(versions), 1000):
+            versions[offset:offset + 1000]._sync_dependency_edges()
+        self.env['module.dependency']._resolve_targets()
 
     def _find_odoo_version(self, version_name):
         """Find or create Odoo version record"""
@@ -898,14 +1333,9 @@ class ModuleRegistry(models.Model):
             'github_branch': module_data.get('github_branch', repository.default_branch),
             'installable': module_data.get('installable', True),
             'auto_install': module_data.get('auto_install', False),
-            'manifest_data': module_data.get('manifest_data', {}),
+            'manifest_id': self.env['module.manifest']._get_or_create(module_data.get('manifest_data', {})).id,
             'manifest_url': module_data.get('manifest_url', ''),
             'readme_url': module_data.get('readme_url', ''),
-            'depends': module_data.get('depends', '[]'),
-            'external_dependencies': module_data.get('external_dependencies', '{}'),
-            'data_files': module_data.get('data_files', '[]'),
-            'demo_files': module_data.get('demo_files', '[]'),
-            'assets': module_data.get('assets', '{}'),
             'last_sync': fields.Datetime.now(),
             'sync_status': 'success',
             'sync_error': False,
@@ -968,13 +1398,9 @@ class ModuleRegistry(models.Model):
                     else:
                         # Create a minimal error record if no existing version found
                         try:
-                            odoo_version = new_env['odoo.version'].search([
-                                ('name', '=', self._extract_odoo_version(module_data.get('version', '')))
-                            ], limit=1)
-                            if not odoo_version:
-                                odoo_version = new_env['odoo.version'].find_version(
-                                    self._extract_odoo_version(module_data.get('version', ''))
-                                )
+                            odoo_version = new_env['odoo.version'].find_version(
+                                module_data.get('odoo_version') or self._extract_odoo_version(module_data.get('version', ''))
+                            )
                             
                             new_env['module.registry'].create({
                                 'template_id': template.id,
@@ -1046,6 +1472,8 @@ class ModuleRegistry(models.Model):
             'version_status': 'deprecated',
             'deprecation_date': fields.Date.today()
         })
+        self.env['module.catalogue']._refresh(self.template_id.ids)
+        self.env['module.series.stats']._refresh(list({version.library_id.id for version in self}))
         
         return {
             'type': 'ir.actions.client',
@@ -1063,6 +1491,8 @@ class ModuleRegistry(models.Model):
             'version_status': 'obsolete',
             'end_of_life_date': fields.Date.today()
         })
+        self.env['module.catalogue']._refresh(self.template_id.ids)
+        self.env['module.series.stats']._refresh(list({version.library_id.id for version in self}))
         
         return {
             'type': 'ir.actions.client',
@@ -1099,22 +1529,34 @@ class ModuleRegistry(models.Model):
             for item in os.listdir(repos_path):
                 item_path = os.path.join(repos_path, item)
                 if os.path.isdir(item_path) and item not in marked_repo_names:
-                    _logger.info(f"Cleaning up local repository clone: {item}")
-                    shutil.rmtree(item_path, ignore_errors=True)
+                    with file_lock(item_path) as acquired:
+                        if not acquired:
+                            _logger.info(f"Skipping cleanup of {item}, a sync is using it")
+                            continue
+                        _logger.info(f"Cleaning up local repository clone: {item}")
+                        shutil.rmtree(item_path, ignore_errors=True)
         except Exception as e:
             _logger.error(f"Error during repository cleanup: {str(e)}")
 
     def action_force_reclone(self):
         """Force re-clone of the repository (useful for troubleshooting)"""
-        for module in self:
-            if module.github_repository_id and module.github_repository_id.odoo_module_repo:
-                repo_path = self._get_repository_local_path(module.github_repository_id)
-                if os.path.exists(repo_path):
-                    _logger.info(f"Force re-cloning repository {module.github_repository_id.full_name}")
-                    shutil.rmtree(repo_path, ignore_errors=True)
-                
-                # Trigger sync which will re-clone
-                self.sync_modules_from_repository(module.github_repository_id.id)
+        busy = self.env['github.repository']
+        for repository in self.github_repository_id.filtered('odoo_module_repo'):
+            # The clone is removed by the sync itself, under its lock
+            if self.sync_modules_from_repository(repository.id, reclone=True) is None:
+                busy |= repository
+        
+        if busy:
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': _('Warning'),
+                    'message': _('Already being synced, try again when it is done: %s')
+                               % ', '.join(busy.mapped('full_name')),
+                    'type': 'warning',
+                }
+            }
         
         return {
             'type': 'ir.actions.client',
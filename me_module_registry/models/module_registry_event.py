@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Transaction level advisory lock taken before appending events, see _append
+EVENT_FEED_LOCK = 0x6d655f6576
+EVENT_MAX_LIMIT = 1000
+# Bus channel notified of the new events on commit, with the cursor of the last one
+EVENT_BUS_CHANNEL = 'me_module_registry.events'
+
+
+class ModuleRegistryEvent(models.Model):
+    _name = 'module.registry.event'
+    _description = 'Module Registry Change Event'
+    _order = 'id'
+
+    # Append-only change feed of the registry for downstream consumers. The record id is
+    # the cursor: a consumer keeps the id of the last event it processed and asks for the
+    # events after it. Module identity is copied on the event, so it stays readable after
+    # the module version is gone. Instead of polling, consumers can listen to
+    # EVENT_BUS_CHANNEL and read from their cursor when notified.
+
+    event_type = fields.Selection([
+        ('created', 'Created'),
+        ('bumped', 'Bumped'),
+        ('removed', 'Removed'),
+        ('status_changed', 'Status Changed'),
+    ], 'Event', required=True, readonly=True)
+    registry_id = fields.Many2one('module.registry', 'Module Version', ondelete='set null', readonly=True)
+    repository = fields.Char('Repository', readonly=True)
+    technical_name = fields.Char('Technical Name', readonly=True)
+    github_branch = fields.Char('GitHub Branch', readonly=True)
+    odoo_version = fields.Char('Odoo Series', readonly=True)
+    version = fields.Char('Module Version', readonly=True)
+    previous_version = fields.Char('Previous Version', readonly=True)
+    version_status = fields.Char('Version Status', readonly=True)
+    previous_status = fields.Char('Previous Status', readonly=True)
+
+    @api.model
+    def _append(self, event_type, versions, **values):
+        """Append one event per module version
+
+        Event writers are serialized with a transaction level advisory lock, held until
+        commit: ids are then committed in increasing order, so a consumer that has seen
+        an id can never miss a smaller one committed later. The bus notification is sent
+        on commit too.
+        """
+        if not versions:
+            return self.browse()
+        self.env.cr.execute(SQL("SELECT pg_advisory_xact_lock(%s)", EVENT_FEED_LOCK))
+        events = self.create([
+            dict({
+                'event_type': event_type,
+                'registry_id': version.id,
+                'repository': version.github_repository_id.full_name,
+                'technical_name': version.template_id.technical_name,
+                'github_branch': version.github_branch,
+                'odoo_version': version.odoo_version_id.name,
+                'version': version.version,
+                'version_status': version.version_status,
+            }, **values)
+            for version in versions
+        ])
+        self.env['bus.bus']._sendone(EVENT_BUS_CHANNEL, 'module_registry/events', {'cursor': events[-1].id})
+        return events
+
+    @api.model
+    def get_events(self, since=0, limit=100):
+        """Events after the cursor since, oldest first
+
+        Returns:
+            dict with the events and the cursor to pass as since next time (unchanged
+            when there are no new events)
+        """
+        field_names = ['event_type', 'registry_id', 'repository', 'technical_name', 'github_branch',
+                       'odoo_version', 'version', 'previous_version', 'version_status', 'previous_status',
+                       'create_date']
+        events = self.search_fetch([('id', '>', since)], field_names, limit=min(limit, EVENT_MAX_LIMIT))
+        return {
+            'cursor': events[-1:].id or since,
+            'events': [
+                dict({name: event[name] for name in field_names},
+                     cursor=event.id, registry_id=event.registry_id.id)
+                for event in events
+            ],
+        }
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, models, _
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+from collections import defaultdict, deque
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Bumped after every commit that changed module.registry, see _invalidate_snapshots
+SNAPSHOT_GENERATION_SEQUENCE = 'module_resolver_snapshot_generation'
+# {(database, odoo.version id): (generation, snapshot)}, one snapshot per series
+_snapshots = {}
+
+
+class ModuleResolver(models.AbstractModel):
+    _name = 'module.resolver'
+    _description = 'Module Installability Resolver'
+
+    # The resolver works on an in-memory snapshot of one Odoo series: every candidate
+    # version of every technical name with its dependency names, loaded in a single
+    # query. Each process keeps the last snapshot of every series, tagged with the
+    # generation of module.registry it was loaded at. The generation is a sequence that
+    # transactions writing module.registry bump after their commit, the way Odoo signals
+    # its own caches between workers: reading it is a single row lookup, and a sync
+    # bumps it once per committed batch.
+
+    def init(self):
+        self.env.cr.execute(SQL("CREATE SEQUENCE IF NOT EXISTS %s", SQL.identifier(SNAPSHOT_GENERATION_SEQUENCE)))
+
+    @api.model
+    def _invalidate_snapshots(self):
+        """Drop the cached snapshots once the current transaction is committed"""
+        if self.env.cr.postcommit.data.get('module.resolver.invalidate'):
+            return
+        self.env.cr.postcommit.data['module.resolver.invalidate'] = True
+
+        @self.env.cr.postcommit.add
+        def bump_generation():
+            # Sequences are not transactional: no commit needed
+            self.env.cr.execute(SQL("SELECT nextval(%s)", SNAPSHOT_GENERATION_SEQUENCE))
+
+    @api.model
+    def _get_snapshot(self, odoo_version_id):
+        if self.env.cr.postcommit.data.get('module.resolver.invalidate'):
+            # This transaction has changed module.registry: its snapshot is its own
+            self.env.flush_all()
+            return self._load_snapshot(odoo_version_id)
+        self.env.cr.execute(SQL("SELECT last_value FROM %s", SQL.identifier(SNAPSHOT_GENERATION_SEQUENCE)))
+        generation = self.env.cr.fetchone()[0]
+        key = (self.env.cr.dbname, odoo_version_id)
+        cached = _snapshots.get(key)
+        if cached and cached[0] == generation:
+            return cached[1]
+        # The sequence is read outside of transactions: load from a transaction started
+        # after reading it, so the snapshot holds at least the commits it counts
+        with self.env.registry.cursor() as cr:
+            snapshot = self.with_env(self.env(cr=cr))._load_snapshot(odoo_version_id)
+        _snapshots[key] = (generation, snapshot)
+        return snapshot
+
+    @api.model
+    def _load_snapshot(self, odoo_version_id):
+        """Load all candidate versions of an Odoo series.
+
+        Returns:
+            dict {technical_name: tuple of candidate dicts, best candidate first}
+        """
+        series = self.env['odoo.version'].browse(odoo_version_id).name or ''
+        self.env.cr.execute(SQL("""
+            SELECT r.id, t.technical_name, r.version, r.github_branch, r.installable,
+                   r.library_id, l.name, g.full_name,
+                   ARRAY(SELECT d.depends_name FROM module_dependency d
+                          WHERE d.registry_id = r.id ORDER BY d.depends_name)
+              FROM module_registry r
+              JOIN module_template t ON t.id = r.template_id
+         LEFT JOIN module_library l ON l.id = r.library_id
+         LEFT JOIN github_repository g ON g.id = r.github_repository_id
+             WHERE r.odoo_version_id = %s
+        """, odoo_version_id))
+
+        parse_version = self.env['module.registry']._parse_version
+        candidates = defaultdict(list)
+        for (registry_id, technical_name, version, branch, installable,
+             library_id, library_name, repository, depends) in self.env.cr.fetchall():
+            candidates[technical_name].append({
+                'registry_id': registry_id,
+                'technical_name': technical_name,
+                'version': version,
+                'branch': branch,
+                'branch_rank': self._get_branch_rank(branch, series),
+                'installable': bool(installable),
+                'library_id': library_id,
+                'library': library_name,
+                'repository': repository,
+                'depends': tuple(depends),
+                'version_key': parse_version(version),
+            })
+        snapshot = {
+            name: tuple(sorted(versions, key=self._candidate_sort_key, reverse=True))
+            for name, versions in candidates.items()
+        }
+        _logger.info(f"Loaded resolver snapshot for Odoo {series}: {len(snapshot)} modules")
+        return snapshot
+
+    @api.model
+    def _get_branch_rank(self, branch, series):
+        """Higher is better: the series branch itself, then a branch of the series, then anything else"""
+        if not branch or not series:
+            return 0
+        if branch == series:
+            return 2
+        if branch.lstrip('v').startswith(series):
+            return 1
+        return 0
+
+    @staticmethod
+    def _candidate_sort_key(candidate):
+        return (candidate['installable'], candidate['branch_rank'], candidate['version_key'], candidate['registry_id'])
+
+    @api.model
+    def _get_assumed_available(self):
+        """Modules shipped with Odoo itself that are never looked up in the registry"""
+        value = self.env['ir.config_parameter'].sudo().get_param(
+            'me_module_registry.resolver_assume_available', 'base')
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    @api.model
+    def _get_odoo_version(self, odoo_version):
+        if isinstance(odoo_version, int):
+            version = self.env['odoo.version'].browse(odoo_version).exists()
+        else:
+            version = self.env['odoo.version'].find_version(odoo_version)
+        if not version:
+            raise UserError(_('Unknown Odoo version: %s') % odoo_version)
+        return version
+
+    @api.model
+    def resolve(self, technical_names, odoo_version, library_ids=None, assume_available=None):
+        """Check whether a set of modules can be installed together on an Odoo series.
+
+        Args:
+            technical_names: technical names of the modules to install
+            odoo_version: odoo.version id or version string (e.g. "17.0")
+            library_ids: only pick versions from these module.library records (all when None)
+            assume_available: technical names provided by the target database itself,
+                defaults to the me_module_registry.resolver_assume_available parameter
+        Returns:
+            dict with the chosen version per module, the install order and the missing,
+            not installable, conflicting and circular dependencies
+        """
+        start = time.perf_counter()
+        version = self._get_odoo_version(odoo_version)
+        snapshot = self._get_snapshot(version.id)
+        available = set(assume_available) if assume_available is not None else self._get_assumed_available()
+        library_ids = set(library_ids) if library_ids else None
+
+        chosen = {}
+        missing = set()
+        not_installable = {}
+        conflicts = {}
+        required_by = defaultdict(set)
+        queue = deque(technical_names)
+        seen = set()
+        while queue:
+            name = queue.popleft()
+            if name in seen or name in available:
+                continue
+            seen.add(name)
+            candidates = snapshot.get(name, ())
+            if library_ids is not None:
+                candidates = [c for c in candidates if c['library_id'] in library_ids]
+            if not candidates:
+                missing.add(name)
+                continue
+            best = candidates[0]
+            if not best['installable']:
+                not_installable[name] = best
+                continue
+            # The same technical name from several repositories clashes on the addons path
+            rivals = [c for c in candidates if c['installable'] and c['repository'] != best['repository']]
+            if rivals:
+                conflicts[name] = [best] + list({c['repository']: c for c in reversed(rivals)}.values())
+            chosen[name] = best
+            for dependency in best['depends']:
+                required_by[dependency].add(name)
+                queue.append(dependency)
+
+        install_order, cycles = self._get_install_order(chosen, available)
+
+        def describe(candidate):
+            return {key: candidate[key] for key in (
+                'registry_id', 'technical_name', 'version', 'branch', 'library', 'repository')}
+
+        result = {
+            'odoo_version': version.name,
+            'installable': not (missing or not_installable or cycles),
+            'modules': [dict(describe(chosen[name]), required_by=sorted(required_by[name]))
+                        for name in install_order],
+            'install_order': install_order,
+            'missing': {name: sorted(required_by[name]) for name in sorted(missing)},
+            'not_installable': {name: dict(describe(candidate), required_by=sorted(required_by[name]))
+                                for name, candidate in sorted(not_installable.items())},
+            'conflicts': {name: [describe(c) for c in candidates]
+                          for name, candidates in sorted(conflicts.items())},
+            'cycles': cycles,
+        }
+        result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    @api.model
+    def _get_install_order(self, chosen, available):
+        """Topological order of the chosen modules, dependencies first.
+
+        Returns:
+            tuple (install order, sorted names of modules stuck in a dependency cycle)
+        """
+        pending = {
+            name: {dep for dep in candidate['depends'] if dep in chosen and dep not in available}
+            for name, candidate in chosen.items()
+        }
+        dependents = defaultdict(list)
+        for name, deps in pending.items():
+            for dep in deps:
+                dependents[dep].append(name)
+
+        ready = deque(sorted(name for name, deps in pending.items() if not deps))
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in sorted(dependents[name]):
+                pending[dependent].discard(name)
+                if not pending[dependent]:
+                    ready.append(dependent)
+        cycles = sorted(name for name, deps in pending.items() if deps)
+        return order + cycles, cycles
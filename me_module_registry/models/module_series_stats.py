@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+from odoo.tools.sql import create_unique_index
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class ModuleSeriesStats(models.Model):
+    _name = 'module.series.stats'
+    _description = 'Module Counts per Odoo Series and Library'
+    _order = 'odoo_version_id, module_count desc'
+
+    # Module version counts of each (Odoo series, library), plus the per series totals
+    # stored on odoo.version. Both are only written by _refresh, at the end of every
+    # sync for the libraries of the synced repository, so the Odoo version views read
+    # plain columns.
+
+    odoo_version_id = fields.Many2one('odoo.version', 'Odoo Version', required=True,
+                                      ondelete='cascade', index=True, readonly=True)
+    library_id = fields.Many2one('module.library', 'Module Library', ondelete='cascade', readonly=True)
+    module_count = fields.Integer('Modules', readonly=True)
+    active_count = fields.Integer('Active', readonly=True)
+    installable_count = fields.Integer('Installable', readonly=True)
+
+    def init(self):
+        # Upsert target of _refresh; rows without a library are one row per series too
+        create_unique_index(self.env.cr, 'module_series_stats_series_library_unique', self._table,
+                            ['odoo_version_id', '(coalesce(library_id, 0))'])
+
+    @api.model
+    def _refresh(self, library_ids=None):
+        """Recount the module versions of the given libraries with one grouped query
+
+        Only the (series, library) rows of the libraries are upserted, and only the series
+        totals they changed are updated, so syncs of repositories of other libraries do
+        not write the same rows. Concurrent syncs still share the series totals: see
+        _run_sync, which serializes this refresh.
+
+        Args:
+            library_ids: module.library ids, False standing for the modules without a
+                library; every library when None
+        """
+        self.env.flush_all()
+        cr = self.env.cr
+        if library_ids is None:
+            registry_scope = stats_scope = SQL("TRUE")
+        else:
+            keys = [library_id or 0 for library_id in library_ids]
+            registry_scope = SQL("coalesce(r.library_id, 0) = ANY(%s)", keys)
+            stats_scope = SQL("coalesce(st.library_id, 0) = ANY(%s)", keys)
+        cr.execute(SQL("""
+            INSERT INTO module_series_stats AS st (odoo_version_id, library_id, module_count, active_count,
+                                                   installable_count, create_uid, create_date, write_uid, write_date)
+            SELECT r.odoo_version_id, r.library_id, count(*),
+                   count(*) FILTER (WHERE r.version_status = 'active'),
+                   count(*) FILTER (WHERE r.installable),
+                   %(uid)s, %(now)s, %(uid)s, %(now)s
+              FROM module_registry r
+             WHERE r.odoo_version_id IS NOT NULL AND %(registry_scope)s
+          GROUP BY r.odoo_version_id, r.library_id
+                ON CONFLICT (odoo_version_id, (coalesce(library_id, 0))) DO UPDATE
+               SET module_count = EXCLUDED.module_count,
+                   active_count = EXCLUDED.active_count,
+                   installable_count = EXCLUDED.installable_count,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+             WHERE (st.module_count, st.active_count, st.installable_count)
+                   IS DISTINCT FROM (EXCLUDED.module_count, EXCLUDED.active_count, EXCLUDED.installable_count)
+         RETURNING st.odoo_version_id
+        """, uid=self.env.uid, now=cr.now(), registry_scope=registry_scope))
+        series_ids = {series_id for series_id, in cr.fetchall()}
+        cr.execute(SQL("""
+            DELETE FROM module_series_stats st
+             WHERE %s
+               AND NOT EXISTS (SELECT 1 FROM module_registry r
+                                WHERE r.odoo_version_id = st.odoo_version_id
+                                  AND r.library_id IS NOT DISTINCT FROM st.library_id)
+         RETURNING st.odoo_version_id
+        """, stats_scope))
+        series_ids.update(series_id for series_id, in cr.fetchall())
+        changed = 0
+        if library_ids is None or series_ids:
+            series_scope = SQL("TRUE") if library_ids is None else SQL("o.id = ANY(%s)", list(series_ids))
+            cr.execute(SQL("""
+                UPDATE odoo_version v
+                   SET module_count = s.module_count,
+                       active_module_count = s.active_count,
+                       installable_module_count = s.installable_count
+                  FROM (SELECT o.id, coalesce(sum(st.module_count), 0) AS module_count,
+                               coalesce(sum(st.active_count), 0) AS active_count,
+                               coalesce(sum(st.installable_count), 0) AS installable_count
+                          FROM odoo_version o
+                     LEFT JOIN module_series_stats st ON st.odoo_version_id = o.id
+                         WHERE %s
+                      GROUP BY o.id) s
+                 WHERE v.id = s.id
+                   AND (v.module_count, v.active_module_count, v.installable_module_count)
+                       IS DISTINCT FROM (s.module_count, s.active_count, s.installable_count)
+            """, series_scope))
+            changed = cr.rowcount
+        self.invalidate_model()
+        self.env['odoo.version'].invalidate_model(
+            ['module_count', 'active_module_count', 'installable_module_count'])
+        _logger.info(f"Refreshed module counts per Odoo series: {changed} series changed")
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+from odoo.tools.sql import create_index
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# A full copy of the branch contents every this many snapshots of a branch, so reading
+# the contents at any point applies at most this many deltas
+SNAPSHOT_CHECKPOINT_INTERVAL = 20
+
+
+class ModuleSnapshot(models.Model):
+    _name = 'module.snapshot'
+    _description = 'Module Registry Branch Snapshot'
+    _order = 'id desc'
+
+    # The contents of a repository branch ({technical name: module version}) as seen by
+    # a sync run, append-only. module.registry rows are updated in place, these rows keep
+    # the history: a snapshot is only written when the branch head or its contents moved
+    # since the previous snapshot of the branch, and holds the changed modules only
+    # (removed ones as null). Every SNAPSHOT_CHECKPOINT_INTERVAL snapshots, a checkpoint
+    # holds the full contents instead.
+
+    run_id = fields.Many2one('module.sync.run', 'Sync Run', ondelete='set null', index=True, readonly=True)
+    repository_id = fields.Many2one('github.repository', 'Repository', required=True,
+                                    ondelete='cascade', readonly=True)
+    github_branch = fields.Char('GitHub Branch', required=True, readonly=True)
+    head_sha = fields.Char('Head Commit', readonly=True)
+    is_checkpoint = fields.Boolean('Checkpoint', readonly=True)
+    depth = fields.Integer('Deltas Since Checkpoint', readonly=True)
+    changes = fields.Json('Changes', readonly=True)
+    change_count = fields.Integer('Changed Modules', readonly=True)
+    module_count = fields.Integer('Modules', readonly=True)
+
+    def init(self):
+        # Snapshots are always looked up per branch, latest first
+        create_index(self.env.cr, 'module_snapshot_repository_branch_index', self._table,
+                     ['repository_id', 'github_branch', 'id'])
+
+    @api.depends('repository_id', 'github_branch', 'head_sha')
+    def _compute_display_name(self):
+        for snapshot in self:
+            snapshot.display_name = (f"{snapshot.repository_id.full_name or ''} "
+                                     f"{snapshot.github_branch}@{(snapshot.head_sha or '')[:8]}")
+
+    @api.model
+    def _record(self, run, branch, modules_found, head_sha=None):
+        """Snapshot the modules found in a branch by a sync run
+
+        Returns:
+            the new snapshot, or the previous one when nothing moved
+        """
+        contents = {module_data['technical_name']: module_data['version'] for module_data in modules_found}
+        previous = self.search([
+            ('repository_id', '=', run.repository_id.id),
+            ('github_branch', '=', branch),
+        ], limit=1)
+        if previous:
+            previous_contents = previous._get_contents()
+            changes = {name: version for name, version in contents.items()
+                       if previous_contents.get(name) != version}
+            changes.update((name, None) for name in previous_contents if name not in contents)
+            if not changes and (not head_sha or head_sha == previous.head_sha):
+                return previous
+            self._log_removed_events(run.repository_id, branch, {
+                name: previous_contents[name] for name, version in changes.items() if version is None})
+            is_checkpoint = previous.depth + 1 >= SNAPSHOT_CHECKPOINT_INTERVAL
+        else:
+            changes = contents
+            is_checkpoint = True
+        return self.create({
+            'run_id': run.id,
+            'repository_id': run.repository_id.id,
+            'github_branch': branch,
+            'head_sha': head_sha,
+            'is_checkpoint': is_checkpoint,
+            'depth': 0 if is_checkpoint else previous.depth + 1,
+            'changes': contents if is_checkpoint else changes,
+            'change_count': len(changes),
+            'module_count': len(contents),
+        })
+
+    def _log_removed_events(self, repository, branch, removed):
+        """Change feed events of the modules gone from a branch, removed: {name: last version}"""
+        if not removed:
+            return
+        versions = self.env['module.registry'].search([
+            ('github_repository_id', '=', repository.id),
+            ('github_branch', '=', branch),
+            ('template_id.technical_name', 'in', list(removed)),
+        ]).filtered(lambda version: removed.get(version.template_id.technical_name) == version.version)
+        self.env['module.registry.event']._append('removed', versions)
+
+    def _get_contents(self):
+        """Branch contents at this snapshot: the last checkpoint with the deltas since applied
+
+        Returns:
+            dict {technical name: module version}
+        """
+        self.ensure_one()
+        domain = [
+            ('repository_id', '=', self.repository_id.id),
+            ('github_branch', '=', self.github_branch),
+            ('id', '<=', self.id),
+        ]
+        checkpoint = self.search(domain + [('is_checkpoint', '=', True)], limit=1)
+        contents = {}
+        for snapshot in self.search_fetch(domain + [('id', '>=', checkpoint.id)], ['changes'], order='id'):
+            for name, version in (snapshot.changes or {}).items():
+                if version is None:
+                    contents.pop(name, None)
+                else:
+                    contents[name] = version
+        return contents
+
+    @api.model
+    def get_repository_contents(self, repository, at=None, branch=None, run=None):
+        """Contents of the branches of a repository at a point in time, or as of a sync run
+
+        Args:
+            repository: github.repository record
+            at: datetime, defaults to now
+            branch: only this branch
+            run: module.sync.run of the repository, the contents at its end; the syncs of
+                a repository never overlap, so its runs end in the order of their ids
+        Returns:
+            dict {branch: {technical name: module version}}, without branches not synced by then
+        """
+        domain = [('repository_id', '=', repository.id)]
+        if at:
+            domain.append(('create_date', '<=', at))
+        if run:
+            domain.append(('run_id', '<=', run.id))
+        if branch:
+            domain.append(('github_branch', '=', branch))
+        latest = self._read_group(domain, ['github_branch'], ['id:max'])
+        return {name: self.browse(snapshot_id)._get_contents() for name, snapshot_id in latest}
+
+    @api.model
+    def diff_runs(self, run_from, run_to):
+        """Modules added, removed, bumped and downgraded in the repository between two sync runs
+
+        Each run stands for the registry contents at its end, so any two runs of the
+        same repository can be compared, in either order.
+
+        Returns:
+            dict {branch: {'added': {name: version}, 'removed': {name: version},
+                           'bumped': {name: [old version, new version]},
+                           'downgraded': {name: [old version, new version]}}}
+            for the branches that changed; versions are compared with
+            module.registry._parse_version
+        """
+        if run_from.repository_id != run_to.repository_id:
+            raise UserError(_('Sync runs %s and %s are not of the same repository')
+                            % (run_from.display_name, run_to.display_name))
+        repository = run_to.repository_id
+        before = self.get_repository_contents(repository, run=run_from)
+        after = self.get_repository_contents(repository, run=run_to)
+        parse_version = self.env['module.registry']._parse_version
+        diff = {}
+        for branch in sorted(before.keys() | after.keys()):
+            old, new = before.get(branch, {}), after.get(branch, {})
+            branch_diff = {
+                'added': {name: version for name, version in new.items() if name not in old},
+                'removed': {name: version for name, version in old.items() if name not in new},
+                'bumped': {},
+                'downgraded': {},
+            }
+            for name, version in new.items():
+                if name in old and old[name] != version:
+                    change = 'downgraded' if parse_version(version) < parse_version(old[name]) else 'bumped'
+                    branch_diff[change][name] = [old[name], version]
+            if any(branch_diff.values()):
+                diff[branch] = branch_diff
+        return diff
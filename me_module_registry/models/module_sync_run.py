@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models
+from collections import Counter
+from contextlib import contextmanager
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+SYNC_PHASES = ('clone', 'branches', 'scan', 'parse', 'upsert', 'recompute')
+SYNC_COUNTS = ('created', 'updated', 'unchanged', 'error')
+# Progress is pushed on the bus channel of this group, only its members receive it
+SYNC_BUS_GROUP = 'base.group_system'
+
+
+class SyncTracker:
+    """Phase timings and module counts of one running sync.
+
+    phase() and count() may be called from the branch scan threads; only the thread
+    owning the cursor flushes the totals to the module.sync.run record. Phases running
+    in several threads at once (scan, parse) add up the time spent in each thread.
+    Branches whose scan completed are recorded with their head commit in heads.
+    """
+
+    def __init__(self, run):
+        self.run = run
+        self.timings = dict.fromkeys(SYNC_PHASES, 0.0)
+        self.counts = Counter()
+        self.heads = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.timings[name] += elapsed
+
+    def count(self, status, number=1):
+        with self._lock:
+            self.counts[status] += number
+
+    def scanned(self, branch, head_sha=None):
+        """Record a completely scanned branch, with its head commit when known"""
+        with self._lock:
+            self.heads[branch] = head_sha
+
+    def flush(self, **values):
+        """Write the totals so far (plus any extra run values) and notify the UI"""
+        with self._lock:
+            values.update({f'{phase}_time': seconds for phase, seconds in self.timings.items()})
+            values.update({f'{status}_count': self.counts[status] for status in SYNC_COUNTS})
+        self.run.write(values)
+        self.run._notify_progress()
+
+
+class ModuleSyncRun(models.Model):
+    _name = 'module.sync.run'
+    _description = 'Module Registry Sync Run'
+    _order = 'start_date desc, id desc'
+
+    # One record per execution of module.registry._run_sync: a repository sync or the
+    # import of one repository of a catalogue file. The record is written after every
+    # branch, and each write is pushed to the administrators on the bus so a running
+    # sync can be followed live.
+
+    repository_id = fields.Many2one('github.repository', 'Repository', required=True,
+                                    ondelete='cascade', index=True)
+    library_id = fields.Many2one('module.library', 'Library', ondelete='set null', index=True)
+    mode = fields.Selection([
+        ('clone', 'Local Clone'),
+        ('api', 'GitHub API'),
+        ('import', 'Import'),
+    ], 'Mode', default='clone')
+    state = fields.Selection([
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], 'Status', default='running', required=True, index=True)
+    start_date = fields.Datetime('Started', default=fields.Datetime.now, required=True)
+    end_date = fields.Datetime('Finished')
+    duration = fields.Float('Duration (s)', digits=(16, 2))
+    error_message = fields.Text('Error')
+
+    # Progress
+    branch_count = fields.Integer('Branches')
+    branches_done = fields.Integer('Branches Done')
+    current_branch = fields.Char('Last Branch')
+    module_count = fields.Integer('Modules Found')
+    progress = fields.Float('Progress', compute='_compute_progress')
+
+    # Phase timings, in seconds
+    clone_time = fields.Float('Clone / Fetch (s)', digits=(16, 3))
+    branches_time = fields.Float('Branch Listing (s)', digits=(16, 3))
+    scan_time = fields.Float('Tree Scan (s)', digits=(16, 3),
+                             help='Summed over the branch scan threads')
+    parse_time = fields.Float('Manifest Parse (s)', digits=(16, 3),
+                              help='Summed over the branch scan threads')
+    upsert_time = fields.Float('DB Upsert (s)', digits=(16, 3))
+    recompute_time = fields.Float('Recompute (s)', digits=(16, 3))
+
+    # Module version counts
+    created_count = fields.Integer('Created')
+    updated_count = fields.Integer('Updated')
+    unchanged_count = fields.Integer('Unchanged')
+    error_count = fields.Integer('Errors')
+
+    snapshot_ids = fields.One2many('module.snapshot', 'run_id', 'Branch Snapshots')
+
+    @api.depends('branch_count', 'branches_done', 'state')
+    def _compute_progress(self):
+        for run in self:
+            if run.state != 'running':
+                run.progress = 100.0
+            elif run.branch_count:
+                run.progress = 100.0 * run.branches_done / run.branch_count
+            else:
+                run.progress = 0.0
+
+    @api.depends('repository_id', 'start_date')
+    def _compute_display_name(self):
+        for run in self:
+            run.display_name = f"{run.repository_id.full_name or ''} @ {run.start_date or ''}"
+
+    @api.model
+    def _start(self, repository, library):
+        """Create the run of a sync and return its tracker"""
+        run = self.create({
+            'repository_id': repository.id,
+            'library_id': library.id,
+        })
+        run._notify_progress()
+        return SyncTracker(run)
+
+    def _finish(self, tracker, error=None):
+        """Record the final totals and state of the run"""
+        self.ensure_one()
+        end_date = fields.Datetime.now()
+        tracker.flush(
+            state='failed' if error else 'done',
+            end_date=end_date,
+            duration=(end_date - self.start_date).total_seconds(),
+            error_message=error or False,
+        )
+        timings = ', '.join(f"{phase} {tracker.timings[phase]:.2f}s" for phase in SYNC_PHASES)
+        _logger.info(f"Sync run {self.id} of {self.repository_id.full_name} {self.state} in "
+                     f"{self.duration:.2f}s ({timings}); created {self.created_count}, "
+                     f"updated {self.updated_count}, unchanged {self.unchanged_count}, "
+                     f"errors {self.error_count}")
+
+    def _get_progress_payload(self):
+        self.ensure_one()
+        return {
+            'id': self.id,
+            'repository': self.repository_id.full_name,
+            'state': self.state,
+            'progress': round(self.progress, 1),
+            'branch_count': self.branch_count,
+            'branches_done': self.branches_done,
+            'current_branch': self.current_branch or '',
+            'module_count': self.module_count,
+            'created': self.created_count,
+            'updated': self.updated_count,
+            'unchanged': self.unchanged_count,
+            'errors': self.error_count,
+            'error_message': self.error_message or '',
+        }
+
+    def _notify_progress(self):
+        """Push the run state to the administrators' clients; delivered when the sync commits"""
+        group = self.env.ref(SYNC_BUS_GROUP)
+        for run in self:
+            self.env['bus.bus']._sendone(group, 'module_sync_run/progress', run._get_progress_payload())
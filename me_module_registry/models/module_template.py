@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
 from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index, escape_psql
 import logging
 import json
 import re
@@ -8,6 +11,10 @@ import re
 _logger = logging.getLogger(__name__)
 
 
+CATALOGUE_SEARCH_OPERATORS = ('ilike', 'like', '=ilike', '=like', '=')
+CATALOGUE_SEARCH_NEGATIVE_OPERATORS = ('not ilike', 'not like', '!=')
+
+
 class ModuleTemplate(models.Model):
     _name = 'module.template'
     _description = 'Module Template (Static Information)'
@@ -16,7 +23,7 @@ class ModuleTemplate(models.Model):
 
     # Basic module information (static across versions)
     sequence = fields.Integer('Sequence')
-    name = fields.Char('Module Name', required=True, index=True, readonly=True)
+    name = fields.Char('Module Name', required=True, index='trigram', readonly=True)
     technical_name = fields.Char('Technical Name', required=True, index=True, readonly=True)
     summary = fields.Text('Summary', readonly=True)
     description = fields.Html('Description', readonly=True)
@@ -45,10 +52,10 @@ class ModuleTemplate(models.Model):
     active_versions_count = fields.Integer('Active Versions', compute='_compute_version_stats', store=True)
     supported_odoo_versions = fields.Char('Supported Odoo Versions', 
                                         compute='_compute_version_stats', store=True)
-    odoo_version_ids = fields.Many2many('odoo.version', compute='_compute_odoo_versions', 
+    odoo_version_ids = fields.Many2many('odoo.version', compute='_compute_version_stats', 
                                        string='Odoo Versions', store=True)
     major_versions = fields.Char('Major Versions', 
-                                compute='_compute_major_versions', store=True)
+                                compute='_compute_version_stats', store=True)
     
     # Sync metadata
     last_sync = fields.Datetime('Last Sync', default=fields.Datetime.now, readonly=True)
@@ -59,11 +66,118 @@ class ModuleTemplate(models.Model):
     ], 'Sync Status', default='pending', readonly=True)
     sync_error = fields.Text('Sync Error', readonly=True)
     
+    # Catalogue search (backed by the search_vector column and trigram indexes, see init)
+    catalogue_search = fields.Char('Catalogue Search', compute='_compute_catalogue_search',
+                                   search='_search_catalogue_search')
+    
     _sql_constraints = [
         ('unique_technical_name_repo', 'unique(technical_name, github_repository_id)', 
          'Technical name must be unique per repository!'),
     ]
 
+    def init(self):
+        # Weighted full-text document: name and technical name > summary > description.
+        # A generated column keeps it up to date on every write, sync included.
+        self.env.cr.execute(SQL("""
+            ALTER TABLE module_template ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(technical_name, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+                setweight(to_tsvector('english', regexp_replace(coalesce(description, ''), '<[^>]*>', ' ', 'g')), 'C')
+            ) STORED
+        """))
+        create_index(self.env.cr, 'module_template_search_vector_index', self._table,
+                     ['search_vector'], method='gin')
+        if self.env.registry.has_trigram:
+            # Fuzzy technical name matching; the btree index stays for exact lookups during sync
+            create_index(self.env.cr, 'module_template_technical_name_trigram_index', self._table,
+                         ['technical_name gin_trgm_ops'], method='gin')
+
+    def unlink(self):
+        # Their versions go with them, deleted by the database
+        self.env['module.resolver']._invalidate_snapshots()
+        return super().unlink()
+
+    def _compute_catalogue_search(self):
+        self.catalogue_search = False
+
+    def _search_catalogue_search(self, operator, value):
+        return self._get_catalogue_search_domain('id', operator, value)
+
+    @api.model
+    def _get_catalogue_search_domain(self, field_name, operator, value):
+        """Domain on field_name (a module.template id field) for a catalogue_search condition"""
+        if operator not in CATALOGUE_SEARCH_OPERATORS + CATALOGUE_SEARCH_NEGATIVE_OPERATORS:
+            raise UserError(_('Unsupported operator %s for the catalogue search') % operator)
+        negative = operator in CATALOGUE_SEARCH_NEGATIVE_OPERATORS
+        text = value.strip() if isinstance(value, str) else ''
+        if not text:
+            # An empty search matches every template, its negation none
+            return [('id', '=', False)] if negative else []
+        return [(field_name, 'not in' if negative else 'in', self._get_catalogue_match_query(text))]
+
+    @api.model
+    def _get_catalogue_tsquery(self, text):
+        # Names are indexed unstemmed, summaries and descriptions stemmed: match either form
+        return SQL("(websearch_to_tsquery('simple', %(text)s) || websearch_to_tsquery('english', %(text)s))",
+                   text=text)
+
+    @api.model
+    def _get_catalogue_match_query(self, text):
+        """SQL subquery selecting the ids of templates matching a catalogue search"""
+        # Substring matches on the names are served by the trigram indexes. The text is
+        # matched literally, like the ilike operator of domains does
+        pattern = f"%{escape_psql(text)}%"
+        return SQL("""
+            SELECT id FROM module_template
+             WHERE search_vector @@ %s OR technical_name ILIKE %s OR name ILIKE %s
+        """, self._get_catalogue_tsquery(text), pattern, pattern)
+
+    @api.model
+    def search_catalogue(self, text, limit=50, offset=0, odoo_version_id=None):
+        """Ranked catalogue search over name, technical name, summary and description.
+
+        Args:
+            text: search text, web search syntax ("sale -stock", quoted phrases, or)
+            limit: maximum number of results
+            offset: number of results to skip
+            odoo_version_id: only return templates with a version for this Odoo series
+        Returns:
+            list of dicts with id, name, technical_name, summary and rank, best match first
+        """
+        text = (text or '').strip()
+        if not text:
+            return []
+        self.env.flush_all()
+        tsquery = self._get_catalogue_tsquery(text)
+        if self.env.registry.has_trigram:
+            similarity = SQL("greatest(similarity(t.technical_name, %(text)s), similarity(t.name, %(text)s))",
+                             text=text)
+        else:
+            similarity = SQL("0")
+        version_filter = SQL()
+        if odoo_version_id:
+            version_filter = SQL("""AND EXISTS (SELECT 1 FROM module_registry r
+                                      WHERE r.template_id = t.id AND r.odoo_version_id = %s)""",
+                                 odoo_version_id)
+        self.env.cr.execute(SQL("""
+            SELECT t.id, t.name, t.technical_name, t.summary,
+                   ts_rank_cd(t.search_vector, %(tsquery)s) + %(similarity)s AS rank
+              FROM module_template t
+             WHERE t.id IN (%(matches)s)
+               %(version_filter)s
+          ORDER BY rank DESC, t.name, t.id
+             LIMIT %(limit)s OFFSET %(offset)s
+        """, tsquery=tsquery, similarity=similarity, matches=self._get_catalogue_match_query(text),
+            version_filter=version_filter, limit=limit, offset=offset))
+        rows = self.env.cr.fetchall()
+        # Apply access rights and record rules on top of the raw ranking
+        allowed = set(self.search([('id', 'in', [row[0] for row in rows])]).ids)
+        return [
+            {'id': row[0], 'name': row[1], 'technical_name': row[2], 'summary': row[3], 'rank': row[4]}
+            for row in rows if row[0] in allowed
+        ]
+
     @api.depends('github_repository_id', 'github_path')
     def _compute_github_url(self):
         for template in self:
@@ -78,53 +192,79 @@ class ModuleTemplate(models.Model):
             template.full_name = (f"{repo.full_name}/{template.technical_name}" if repo 
                                 else template.technical_name or template.name)
 
-    @api.depends('version_ids.version_status', 'version_ids.version', 'version_ids.odoo_version_id')
+    @api.depends('version_ids.version_status', 'version_ids.version', 'version_ids.odoo_version_id',
+                 'version_ids.major_version')
     def _compute_version_stats(self):
         """
-        Compute and update statistics for module versions, including total count, active count, latest version, and supported Odoo versions.
+        Compute the statistics of the module versions of many templates at once, with grouped SQL aggregates.
         
         Updates the following fields for each module template:
         - `version_count`: Total number of related versions.
         - `active_versions_count`: Number of versions with status 'active'.
         - `latest_version_id`: The most recent version, determined by parsed version string.
         - `supported_odoo_versions`: Comma-separated list of unique Odoo version names supported by the module.
+        - `odoo_version_ids`: The Odoo versions of the related versions.
+        - `major_versions`: Comma-separated list of the major versions of the related versions.
         """
+        stats = self._read_version_stats()
         for template in self:
-            versions = template.version_ids
-            template.version_count = len(versions)
-            
-            # Count active versions
-            active_versions = versions.filtered(lambda v: v.version_status == 'active')
-            template.active_versions_count = len(active_versions)
-            
-            # Find latest version
-            template.latest_version_id = (versions.sorted(
-                key=lambda v: self._parse_version(v.version), 
-                reverse=True)[0].id if versions else False)
-            
-            # Get supported Odoo versions
-            odoo_versions = versions.mapped('odoo_version_id.name')
-            template.supported_odoo_versions = ', '.join(sorted(set(filter(None, odoo_versions))))
-
-    @api.depends('version_ids.odoo_version_id')
-    def _compute_odoo_versions(self):
-        """
-        Compute and assign the set of Odoo versions associated with each module template based on its related versions.
-        """
-        for template in self:
-            template.odoo_version_ids = template.version_ids.mapped('odoo_version_id')
+            values = stats.get(template._origin.id, {})
+            template.version_count = values.get('count', 0)
+            template.active_versions_count = values.get('active_count', 0)
+            template.latest_version_id = values.get('latest_id', False)
+            template.supported_odoo_versions = ', '.join(sorted(values.get('odoo_version_names', [])))
+            template.odoo_version_ids = [(6, 0, values.get('odoo_version_ids', []))]
+            template.major_versions = ', '.join(sorted(
+                values.get('major_versions', []),
+                key=lambda x: float(x) if x.replace('.', '').isdigit() else 0))
 
-    @api.depends('version_ids.major_version')
-    def _compute_major_versions(self):
+    def _read_version_stats(self):
         """
-        Compute major versions from related module registry entries.
+        Aggregate the versions of the templates in SQL, without loading the version records.
+        
+        The latest version is ordered like `_parse_version`, see
+        `module.registry._get_version_order_sql`.
+        
+        Returns:
+            dict: {template id: {'count', 'active_count', 'latest_id', 'odoo_version_ids',
+            'odoo_version_names', 'major_versions'}} for the templates having versions.
         """
-        for template in self:
-            major_versions = set()
-            for version in template.version_ids:
-                if version.major_version:
-                    major_versions.add(version.major_version)
-            template.major_versions = ', '.join(sorted(major_versions, key=lambda x: float(x) if x.replace('.', '').isdigit() else 0))
+        template_ids = [template_id for template_id in self._origin.ids if template_id]
+        if not template_ids:
+            return {}
+        self.env['module.registry'].flush_model(
+            ['template_id', 'version', 'version_status', 'odoo_version_id', 'major_version'])
+        self.env['odoo.version'].flush_model(['name'])
+        self.env.cr.execute(SQL("""
+            SELECT r.template_id, count(*), count(*) FILTER (WHERE r.version_status = 'active'),
+                   array_agg(DISTINCT r.odoo_version_id) FILTER (WHERE r.odoo_version_id IS NOT NULL),
+                   array_agg(DISTINCT v.name) FILTER (WHERE v.name IS NOT NULL),
+                   array_agg(DISTINCT r.major_version) FILTER (WHERE r.major_version IS NOT NULL)
+              FROM module_registry r
+         LEFT JOIN odoo_version v ON v.id = r.odoo_version_id
+             WHERE r.template_id = ANY(%s)
+          GROUP BY r.template_id
+        """, template_ids))
+        stats = {
+            template_id: {
+                'count': count,
+                'active_count': active_count,
+                'odoo_version_ids': odoo_version_ids or [],
+                'odoo_version_names': odoo_version_names or [],
+                'major_versions': major_versions or [],
+            }
+            for template_id, count, active_count, odoo_version_ids, odoo_version_names, major_versions
+            in self.env.cr.fetchall()
+        }
+        self.env.cr.execute(SQL("""
+            SELECT DISTINCT ON (r.template_id) r.template_id, r.id
+              FROM module_registry r
+             WHERE r.template_id = ANY(%s)
+          ORDER BY r.template_id, %s, r.id DESC
+        """, template_ids, self.env['module.registry']._get_version_order_sql('r')))
+        for template_id, latest_id in self.env.cr.fetchall():
+            stats[template_id]['latest_id'] = latest_id
+        return stats
 
     def _parse_version(self, version_str):
         """
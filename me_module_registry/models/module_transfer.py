@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+from itertools import groupby
+from operator import itemgetter
+import gzip
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+TRANSFER_FORMAT = 'me_module_registry.catalogue'
+TRANSFER_FORMAT_VERSION = 1
+GZIP_MAGIC = b'\x1f\x8b'
+EXPORT_BATCH_SIZE = 1000
+
+ODOO_VERSION_FIELDS = ('name', 'full_name', 'major_version', 'minor_version', 'release_date',
+                       'end_of_support', 'is_lts')
+REPOSITORY_FIELDS = ('name', 'full_name', 'owner', 'description', 'html_url', 'clone_url', 'default_branch')
+TEMPLATE_FIELDS = ('technical_name', 'name', 'summary', 'description', 'author', 'website', 'license',
+                   'category', 'application', 'github_path')
+VERSION_FIELDS = ('version', 'github_branch', 'installable', 'auto_install', 'manifest_url', 'readme_url')
+
+
+class ModuleTransfer(models.AbstractModel):
+    _name = 'module.transfer'
+    _description = 'Module Catalogue Export/Import'
+
+    # The catalogue travels as newline-delimited JSON, one object per line with a "type":
+    #   header        format and version of the file
+    #   odoo_version  Odoo series, matched on major/minor version on import
+    #   repository    GitHub repositories, matched on full name
+    #   template      module templates, keyed by (repository, technical_name)
+    #   manifest      manifest content, written once per checksum before its first version
+    #   version       module versions with their dependency names, grouped by repository
+    # Both directions stream: the export reads the registry in batches, the import
+    # feeds the versions of each repository through the regular sync upsert path.
+
+    @api.model
+    def export_ndjson(self, fileobj, compress=False):
+        """Write the whole catalogue to a binary file object
+
+        Args:
+            fileobj: writable binary file object
+            compress: gzip the output
+        Returns:
+            number of module versions written
+        """
+        stream = gzip.GzipFile(fileobj=fileobj, mode='wb') if compress else fileobj
+
+        def write(record_type, values):
+            stream.write(json.dumps(dict(values, type=record_type), ensure_ascii=False,
+                                    separators=(',', ':'), default=str).encode('utf-8') + b'\n')
+
+        try:
+            write('header', {'format': TRANSFER_FORMAT, 'version': TRANSFER_FORMAT_VERSION,
+                             'exported_at': fields.Datetime.now()})
+            for version in self.env['odoo.version'].search([]):
+                write('odoo_version', {name: version[name] for name in ODOO_VERSION_FIELDS})
+            repositories = self.env['module.template'].search([]).github_repository_id
+            for repository in repositories.sorted('full_name'):
+                write('repository', {name: repository[name] for name in REPOSITORY_FIELDS})
+
+            for templates in self._iter_batches('module.template', 'github_repository_id, technical_name'):
+                for template in templates:
+                    if not template.github_repository_id:
+                        # Imported through the sync of their repository only
+                        continue
+                    write('template', dict({name: template[name] for name in TEMPLATE_FIELDS},
+                                           repository=template.github_repository_id.full_name))
+
+            count = 0
+            written_manifests = set()
+            for versions in self._iter_batches('module.registry', 'github_repository_id, github_branch, id'):
+                for version in versions:
+                    if not version.template_id.github_repository_id:
+                        continue
+                    manifest = version.manifest_id
+                    if manifest and manifest.checksum not in written_manifests:
+                        write('manifest', {'checksum': manifest.checksum, 'data': manifest.manifest_data})
+                        written_manifests.add(manifest.checksum)
+                    write('version', dict(
+                        {name: version[name] for name in VERSION_FIELDS},
+                        repository=version.template_id.github_repository_id.full_name,
+                        technical_name=version.template_id.technical_name,
+                        odoo_version=version.odoo_version_id.name,
+                        manifest=manifest.checksum or None,
+                        depends=version._get_depends_list(),
+                    ))
+                    count += 1
+        finally:
+            if compress:
+                stream.close()
+        _logger.info(f"Exported {count} module versions and {len(written_manifests)} manifests")
+        return count
+
+    def _iter_batches(self, model_name, order):
+        """All records of a model in batches, keeping the cache down to one batch at a time"""
+        self.env.flush_all()
+        records = self.env[model_name].search([], order=order)
+        for offset in range(0, len(records), EXPORT_BATCH_SIZE):
+            yield records[offset:offset + EXPORT_BATCH_SIZE]
+            self.env.invalidate_all()
+
+    @api.model
+    def import_ndjson(self, fileobj):
+        """Load a catalogue written by export_ndjson, plain or gzipped
+
+        Versions are upserted per repository and branch with the sync upsert path, each
+        repository as one module.sync.run in "import" mode.
+
+        Args:
+            fileobj: seekable binary file object
+        Returns:
+            dict {repository full name: True when its import completed, None when the
+            repository was being synced and its versions were skipped}
+        """
+        magic = fileobj.read(2)
+        fileobj.seek(0)
+        stream = gzip.GzipFile(fileobj=fileobj, mode='rb') if magic == GZIP_MAGIC else fileobj
+        context = {'repositories': {}, 'templates': {}, 'manifests': {}}
+        registry = self.env['module.registry']
+        results = {}
+        versions = self._iter_import_versions(stream, context)
+        for full_name, repository_versions in groupby(versions, key=itemgetter('repository')):
+            repository = context['repositories'][full_name]
+
+            def sync(tracker, repository=repository, repository_versions=repository_versions):
+                self._import_repository_versions(repository, repository_versions, tracker)
+
+            results[full_name] = registry._run_sync(repository, sync)
+        return results
+
+    def _iter_import_versions(self, stream, context):
+        """Module data of the version lines; the other lines are loaded as they come
+
+        Versions of a repository or template missing from the file are skipped and logged.
+        """
+        skipped = 0
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                values = json.loads(line)
+                record_type = values.pop('type')
+            except (ValueError, KeyError, AttributeError) as e:
+                raise UserError(_('Invalid catalogue line %s: %s') % (line_number, e))
+            if record_type == 'header':
+                if values.get('format') != TRANSFER_FORMAT or values.get('version') != TRANSFER_FORMAT_VERSION:
+                    raise UserError(_('Unsupported catalogue format %s version %s')
+                                    % (values.get('format'), values.get('version')))
+            elif record_type == 'odoo_version':
+                self._import_odoo_version(values)
+            elif record_type == 'repository':
+                context['repositories'][values['full_name']] = self._import_repository(values)
+            elif record_type == 'template':
+                context['templates'][values.pop('repository', None), values['technical_name']] = values
+            elif record_type == 'manifest':
+                context['manifests'][values['checksum']] = values['data']
+            elif record_type == 'version':
+                template = context['templates'].get((values.get('repository'), values.get('technical_name')))
+                if not template or values.get('repository') not in context['repositories']:
+                    _logger.warning(f"Skipping version {values.get('version')} of {values.get('technical_name')} "
+                                    f"at line {line_number}: its repository or template is not in the catalogue")
+                    skipped += 1
+                    continue
+                yield dict(
+                    template,
+                    **{name: values[name] for name in VERSION_FIELDS},
+                    repository=values['repository'],
+                    odoo_version=values['odoo_version'],
+                    manifest_data=context['manifests'].get(values['manifest'], {}),
+                )
+            else:
+                _logger.warning(f"Skipping unknown catalogue line type {record_type} at line {line_number}")
+        if skipped:
+            _logger.warning(f"Skipped {skipped} module versions without repository or template")
+
+    def _import_odoo_version(self, values):
+        version = self.env['odoo.version'].find_version(values['name'])
+        if not version:
+            version = self.env['odoo.version'].create(values)
+        return version
+
+    def _import_repository(self, values):
+        repository = self.env['github.repository'].search([('full_name', '=', values['full_name'])], limit=1)
+        if not repository:
+            repository = self.env['github.repository'].create(dict(values, odoo_module_repo=True))
+        return repository
+
+    def _import_repository_versions(self, repository, versions, tracker):
+        """Upsert the versions of one repository, one branch at a time"""
+        tracker.flush(mode='import')
+        registry = self.env['module.registry']
+        for branch, branch_versions in groupby(versions, key=itemgetter('github_branch')):
+            tracker.scanned(branch)
+            registry._write_branch_modules(list(branch_versions), branch, repository, tracker)
+        with tracker.phase('recompute'):
+            self.env['module.dependency']._resolve_targets()
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields, models
+
+
+class OdooVersion(models.Model):
+    _inherit = 'odoo.version'
+
+    # Totals written by module.series.stats._refresh
+    module_count = fields.Integer('Module Count', readonly=True, index=True,
+                                  help='Number of module versions for this version')
+    active_module_count = fields.Integer('Active Modules', readonly=True)
+    installable_module_count = fields.Integer('Installable Modules', readonly=True)
+    series_stats_ids = fields.One2many('module.series.stats', 'odoo_version_id', 'Modules per Library')
@@ -0,0 +1,58 @@
+/** @odoo-module **/
+import { registry } from "@web/core/registry";
+import { user } from "@web/core/user";
+import { _t } from "@web/core/l10n/translation";
+
+/**
+ * Shows the progress of running module registry syncs to administrators.
+ *
+ * The server pushes the module.sync.run state on the bus channel of the Settings group,
+ * which the clients of its members listen to already, after every branch; each push
+ * replaces the previous notification of the run.
+ */
+export const moduleSyncProgressService = {
+    dependencies: ["bus_service", "notification"],
+
+    start(env, { bus_service, notification }) {
+        if (!user.isSystem) {
+            return;
+        }
+        const closeByRun = new Map();
+        bus_service.subscribe("module_sync_run/progress", (run) => {
+            closeByRun.get(run.id)?.();
+            closeByRun.delete(run.id);
+
+            let message;
+            let type = "info";
+            if (run.state === "running") {
+                message = _t("%(done)s/%(total)s branches (%(progress)s), last: %(branch)s", {
+                    done: run.branches_done,
+                    total: run.branch_count,
+                    progress: `${run.progress}%`,
+                    branch: run.current_branch || "-",
+                });
+            } else if (run.state === "failed") {
+                message = run.error_message;
+                type = "danger";
+            } else {
+                message = _t("%(created)s created, %(updated)s updated, %(unchanged)s unchanged, %(errors)s errors", {
+                    created: run.created,
+                    updated: run.updated,
+                    unchanged: run.unchanged,
+                    errors: run.errors,
+                });
+                type = run.errors ? "warning" : "success";
+            }
+            const close = notification.add(message, {
+                title: _t("Syncing %s", run.repository),
+                type,
+                sticky: run.state === "running",
+            });
+            if (run.state === "running") {
+                closeByRun.set(run.id, close);
+            }
+        });
+    },
+};
+
+registry.category("services").add("me_module_registry.sync_progress", moduleSyncProgressService);
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+from . import test_manifest_parser
+from . import test_manifest_parser_benchmark
+from . import test_module_snapshot
+from . import test_module_catalogue
+from . import test_module_transfer
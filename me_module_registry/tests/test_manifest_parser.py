@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import BaseCase, tagged
+
+from ..tools import manifest_parser
+from ..tools.manifest_parser import MAX_DEPTH, ManifestParseError, parse_manifest
+
+
+@tagged('post_install', '-at_install')
+class TestManifestParser(BaseCase):
+
+    def test_comments_and_hashes_in_strings(self):
+        manifest = parse_manifest("""# -*- coding: utf-8 -*-
+{
+    'name': "Colours #1",  # trailing comment
+    'website': 'https://example.com/docs#install',
+    'assets': {'web.assets_backend': ['my_module/static/src/*.scss']},
+    # 'depends': ['commented_out'],
+    'depends': ['base', 'web'],
+}
+""")
+        self.assertEqual(manifest['name'], 'Colours #1')
+        self.assertEqual(manifest['website'], 'https://example.com/docs#install')
+        self.assertEqual(manifest['depends'], ['base', 'web'])
+
+    def test_typed_fields(self):
+        manifest = parse_manifest(b"{'name': 'X', 'version': 18.0, 'depends': ('base',), "
+                                  b"'auto_install': ['web'], 'installable': 0, 'description': 'a' 'b' + 'c'}")
+        self.assertEqual(manifest['version'], '18.0')
+        self.assertEqual(manifest['depends'], ['base'])
+        self.assertEqual(manifest['auto_install'], ['web'])
+        self.assertIs(manifest['installable'], False)
+        self.assertIs(manifest['application'], False)
+        self.assertEqual(manifest['description'], 'abc')
+        self.assertEqual(manifest['data'], [])
+        self.assertEqual(manifest['external_dependencies'], {})
+
+    def test_results_are_not_shared(self):
+        source = "{'name': 'X', 'depends': ['base']}"
+        parse_manifest(source)['depends'].append('mutated')
+        self.assertEqual(parse_manifest(source)['depends'], ['base'])
+
+    def test_rejects_code(self):
+        for source in (
+            "__import__('os').system('true')",
+            "{'name': open('/etc/passwd').read()}",
+            "{**{'name': 'X'}}",
+            "{'name': 'X'}; print(1)",
+            "['not', 'a', 'dict']",
+        ):
+            with self.subTest(source=source), self.assertRaises(ManifestParseError):
+                parse_manifest(source)
+
+    def test_limits(self):
+        nested = "{'a': " + "[" * (MAX_DEPTH + 2) + "]" * (MAX_DEPTH + 2) + "}"
+        with self.assertRaises(ManifestParseError):
+            parse_manifest(nested)
+        with self.assertRaises(ManifestParseError):
+            parse_manifest("{'description': '%s'}" % ('x' * 1000), max_size=100)
+
+    def test_invalid_keys_and_sets(self):
+        for source in (
+            "{'a': {1, 'x'}}",
+            "{1: 2}",
+            "{None: 'x'}",
+            "{'a': 1 'b': 2}",
+            "  {'a': 1}",
+        ):
+            with self.subTest(source=source), self.assertRaises(ManifestParseError):
+                parse_manifest(source)
+        # Only the manifest keys are passed as keyword arguments
+        self.assertEqual(parse_manifest("{'assets': {1: 'x'}}")['assets'], {1: 'x'})
+
+    def test_plain_literal_path(self):
+        for source in (
+            "# header\n{'name': 'X', 'depends': ['base',], 'data': ('a.xml')}  # trailing",
+            "{'description': \"\"\"It's \"quoted\" # not a comment\"\"\" 'concatenated',\n 'version': 18.0}",
+            "{'assets': {'bundle': {'b.js', 'a.js'}}, 'installable': False, 'icon': None, 'n': 10.25}",
+            "{'name': '''x''' '', 'website': '#', 'images': ()}",
+        ):
+            with self.subTest(source=source):
+                self.assertEqual(manifest_parser._scan_literal(source), manifest_parser._parse_tree(source))
+        # Anything else is left to the ast path
+        for source in ("{'a': -1}", "{'a': 'x\\n'}", "{'a': r'x'}", "{'a': 1e3}", "{'a': 'x' + 'y'}", "{'a': 1}}"):
+            with self.subTest(source=source), self.assertRaises(manifest_parser._Unsupported):
+                manifest_parser._scan_literal(source)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import ast
+import glob
+import logging
+import os
+import re
+import time
+
+import odoo.addons
+from odoo.tests import BaseCase, tagged
+
+from ..tools import manifest_parser
+
+_logger = logging.getLogger(__name__)
+
+
+def _legacy_parse(source):
+    """The parser used before manifest_parser (comment stripping plus literal_eval)"""
+    return ast.literal_eval(re.sub(r'#.*', '', source))
+
+
+@tagged('-standard', 'me_module_registry_benchmark')
+class TestManifestParserBenchmark(BaseCase):
+    """Micro-benchmark over every manifest on the addons path
+
+    Run with: odoo-bin --test-tags me_module_registry_benchmark -d <db>
+    """
+
+    ROUNDS = 5
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.corpus = []
+        for addons_path in odoo.addons.__path__:
+            for path in sorted(glob.glob(os.path.join(addons_path, '*', '__manifest__.py'))):
+                with open(path, encoding='utf-8') as manifest_file:
+                    cls.corpus.append((path, manifest_file.read()))
+
+    def _time(self, parse, corpus=None):
+        """Time per manifest in microseconds of the fastest round, and failures per round"""
+        corpus = corpus or self.corpus
+        failures = 0
+        best = float('inf')
+        for _round in range(self.ROUNDS):
+            start = time.perf_counter()
+            for _path, source in corpus:
+                try:
+                    parse(source)
+                except Exception:
+                    failures += 1
+            best = min(best, time.perf_counter() - start)
+        return best / len(corpus) * 1e6, failures // self.ROUNDS
+
+    def test_benchmark(self):
+        self.assertTrue(self.corpus, "No manifests found on the addons path")
+        for path, source in self.corpus:
+            with self.subTest(manifest=path):
+                manifest_parser.parse_manifest(source)
+
+        manifest_parser._parse_source.cache_clear()
+        legacy, legacy_failures = self._time(_legacy_parse)
+        cold, _failures = self._time(lambda source: manifest_parser._parse_source.__wrapped__(source))
+        # As many manifests as the cache holds: the fastest round is served from the cache
+        warm, _failures = self._time(manifest_parser.parse_manifest, self.corpus[-manifest_parser.CACHE_SIZE:])
+        _logger.info(
+            "Manifest parser over %d manifests: legacy %.1f us (%d failures), "
+            "cold %.1f us, warm %.1f us per manifest",
+            len(self.corpus), legacy, legacy_failures, cold, warm)
+        # Uncached too: a sync mostly reads manifests it has not parsed yet
+        self.assertLess(cold, legacy)
+        self.assertLess(warm, legacy)
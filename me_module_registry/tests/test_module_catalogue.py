@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestModuleCatalogue(TransactionCase):
+
+    def test_get_rows_negative_paging(self):
+        Catalogue = self.env['module.catalogue']
+        first_page = Catalogue.get_rows()
+        # Negative values come straight from the query string of the JSON endpoint
+        self.assertEqual(Catalogue.get_rows(offset=-5), first_page)
+        self.assertEqual(Catalogue.get_rows(limit=-1), {'total': first_page['total'], 'rows': []})
+        self.assertEqual(Catalogue.get_rows(limit=0)['rows'], [])
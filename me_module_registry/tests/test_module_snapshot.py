@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+from odoo.exceptions import UserError
+from odoo.tests import TransactionCase, tagged
+
+from ..models.module_snapshot import SNAPSHOT_CHECKPOINT_INTERVAL
+
+
+@tagged('post_install', '-at_install')
+class TestModuleSnapshot(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Snapshot = cls.env['module.snapshot']
+        cls.repository = cls._create_repository('addons')
+
+    @classmethod
+    def _create_repository(cls, name):
+        return cls.env['github.repository'].create({
+            'name': name,
+            'full_name': f'egeskov/{name}',
+            'owner': 'egeskov',
+            'html_url': f'https://github.com/egeskov/{name}',
+        })
+
+    def _run(self, repository=None):
+        return self.env['module.sync.run'].create({'repository_id': (repository or self.repository).id})
+
+    def _record(self, run, contents, branch='18.0', head_sha=None):
+        modules_found = [{'technical_name': name, 'version': version} for name, version in contents.items()]
+        return self.Snapshot._record(run, branch, modules_found, head_sha)
+
+    def test_record_only_changes(self):
+        first = self._record(self._run(), {'sale_x': '18.0.1.0.0', 'stock_x': '18.0.1.0.0'}, head_sha='a' * 40)
+        self.assertTrue(first.is_checkpoint)
+        self.assertEqual(first.module_count, 2)
+
+        # Same contents and head: nothing recorded
+        self.assertEqual(self._record(self._run(), {'sale_x': '18.0.1.0.0', 'stock_x': '18.0.1.0.0'},
+                                      head_sha='a' * 40), first)
+        # The head moved without changing the modules: an empty delta
+        moved = self._record(self._run(), {'sale_x': '18.0.1.0.0', 'stock_x': '18.0.1.0.0'}, head_sha='b' * 40)
+        self.assertNotEqual(moved, first)
+        self.assertEqual((moved.changes, moved.change_count, moved.depth), ({}, 0, 1))
+
+        delta = self._record(self._run(), {'sale_x': '18.0.1.1.0', 'mrp_x': '18.0.1.0.0'}, head_sha='c' * 40)
+        self.assertFalse(delta.is_checkpoint)
+        self.assertEqual(delta.depth, 2)
+        self.assertEqual(delta.changes, {'sale_x': '18.0.1.1.0', 'mrp_x': '18.0.1.0.0', 'stock_x': None})
+        self.assertEqual(delta.change_count, 3)
+        self.assertEqual(delta.module_count, 2)
+        self.assertEqual(delta._get_contents(), {'sale_x': '18.0.1.1.0', 'mrp_x': '18.0.1.0.0'})
+        self.assertEqual(first._get_contents(), {'sale_x': '18.0.1.0.0', 'stock_x': '18.0.1.0.0'})
+
+    def test_branches_are_separate(self):
+        run = self._run()
+        self._record(run, {'sale_x': '17.0.1.0.0'}, branch='17.0')
+        snapshot = self._record(run, {'sale_x': '18.0.1.0.0'})
+        self.assertTrue(snapshot.is_checkpoint)
+        self.assertEqual(self.Snapshot.get_repository_contents(self.repository), {
+            '17.0': {'sale_x': '17.0.1.0.0'},
+            '18.0': {'sale_x': '18.0.1.0.0'},
+        })
+        self.assertEqual(self.Snapshot.get_repository_contents(self.repository, branch='17.0'),
+                         {'17.0': {'sale_x': '17.0.1.0.0'}})
+
+    def test_checkpoint_replay(self):
+        snapshots = self.Snapshot
+        for patch in range(SNAPSHOT_CHECKPOINT_INTERVAL + 2):
+            snapshots |= self._record(self._run(), {'sale_x': f'18.0.1.0.{patch}', f'module_{patch}': '18.0.1.0.0'})
+        self.assertEqual(snapshots.mapped('is_checkpoint'),
+                         [True] + [False] * (SNAPSHOT_CHECKPOINT_INTERVAL - 1) + [True, False])
+        self.assertEqual(snapshots.mapped('depth'), list(range(SNAPSHOT_CHECKPOINT_INTERVAL)) + [0, 1])
+        # A checkpoint holds the full contents, the deltas on both sides of it replay the same
+        checkpoint = snapshots[SNAPSHOT_CHECKPOINT_INTERVAL]
+        self.assertEqual(checkpoint.changes, {'sale_x': f'18.0.1.0.{SNAPSHOT_CHECKPOINT_INTERVAL}',
+                                              f'module_{SNAPSHOT_CHECKPOINT_INTERVAL}': '18.0.1.0.0'})
+        for patch, snapshot in enumerate(snapshots):
+            self.assertEqual(snapshot._get_contents(), {'sale_x': f'18.0.1.0.{patch}', f'module_{patch}': '18.0.1.0.0'})
+
+    def test_diff_runs(self):
+        first_run, second_run, third_run = self._run(), self._run(), self._run()
+        self._record(first_run, {'sale_x': '18.0.1.0.0', 'stock_x': '18.0.1.0.0'})
+        self._record(first_run, {'sale_x': '17.0.1.0.0'}, branch='17.0')
+        self._record(second_run, {'sale_x': '18.0.1.1.0', 'mrp_x': '18.0.1.0.0'})
+        # The third run changed nothing: its contents are those of the second one
+        self._record(third_run, {'sale_x': '18.0.1.1.0', 'mrp_x': '18.0.1.0.0'})
+        self._record(third_run, {'sale_x': '17.0.1.0.0'}, branch='17.0')
+
+        diff = {'18.0': {
+            'added': {'mrp_x': '18.0.1.0.0'},
+            'removed': {'stock_x': '18.0.1.0.0'},
+            'bumped': {'sale_x': ['18.0.1.0.0', '18.0.1.1.0']},
+            'downgraded': {},
+        }}
+        self.assertEqual(self.Snapshot.diff_runs(first_run, second_run), diff)
+        self.assertEqual(self.Snapshot.diff_runs(first_run, third_run), diff)
+        self.assertEqual(self.Snapshot.diff_runs(second_run, third_run), {})
+        self.assertEqual(self.Snapshot.diff_runs(third_run, first_run), {'18.0': {
+            'added': {'stock_x': '18.0.1.0.0'},
+            'removed': {'mrp_x': '18.0.1.0.0'},
+            'bumped': {},
+            'downgraded': {'sale_x': ['18.0.1.1.0', '18.0.1.0.0']},
+        }})
+
+    def test_diff_runs_other_repository(self):
+        with self.assertRaises(UserError):
+            self.Snapshot.diff_runs(self._run(), self._run(self._create_repository('tools')))
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+
+from odoo.tests import TransactionCase, tagged
+
+from ..models.module_transfer import TRANSFER_FORMAT, TRANSFER_FORMAT_VERSION
+
+
+@tagged('post_install', '-at_install')
+class TestModuleTransfer(TransactionCase):
+
+    def test_import_versions_without_repository(self):
+        lines = [
+            {'type': 'header', 'format': TRANSFER_FORMAT, 'version': TRANSFER_FORMAT_VERSION},
+            {'type': 'template', 'technical_name': 'orphan_x', 'name': 'Orphan', 'repository': False},
+            {'type': 'template', 'technical_name': 'unknown_x', 'name': 'Unknown'},
+            {'type': 'version', 'repository': False, 'technical_name': 'orphan_x', 'version': '18.0.1.0.0'},
+            {'type': 'version', 'repository': 'egeskov/missing', 'technical_name': 'unknown_x',
+             'version': '18.0.1.0.0'},
+        ]
+        stream = io.BytesIO(b''.join(json.dumps(line).encode() + b'\n' for line in lines))
+        self.assertEqual(self.env['module.transfer'].import_ndjson(stream), {})
+        self.assertFalse(self.env['module.template'].search([('technical_name', 'in', ['orphan_x', 'unknown_x'])]))
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from . import manifest_parser
+from . import sync_lock
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""Safe parser for Odoo ``__manifest__.py`` files.
+
+Manifests come from arbitrary repositories, so they are never executed. Sources made
+of plain literals only (the vast majority) are read from a single regular expression
+tokenization, much cheaper than building a syntax tree; any other source is parsed by
+``ast.parse`` (which handles comments and ``#`` inside strings correctly) and the
+literal tree is converted with explicit size, depth and node limits. Both give the
+same values. Known keys are then normalized to the types Odoo expects.
+"""
+
+import ast
+import copy
+import functools
+import re
+
+MAX_MANIFEST_SIZE = 256 * 1024
+MAX_DEPTH = 16
+MAX_NODES = 50000
+# Sources are up to MAX_MANIFEST_SIZE: keep the per process cache small
+CACHE_SIZE = 256
+
+# Known manifest keys and their normalized type
+STRING_FIELDS = (
+    'name', 'version', 'summary', 'description', 'author', 'maintainer', 'website',
+    'license', 'category', 'currency', 'icon', 'countries', 'bootstrap',
+)
+LIST_FIELDS = ('depends', 'data', 'demo', 'qweb', 'images', 'excludes', 'test')
+BOOLEAN_FIELDS = ('installable', 'application')
+DEFAULTS = {
+    'depends': [],
+    'data': [],
+    'demo': [],
+    'external_dependencies': {},
+    'assets': {},
+    'installable': True,
+    'auto_install': False,
+    'application': False,
+}
+
+
+class ManifestParseError(ValueError):
+    """The manifest source is not a valid, bounded Python dict literal"""
+
+
+# One (string, token, other) match per token of the plain literals most manifests are
+# made of: strings without prefix or backslash, decimal numbers, True/False/None and
+# brackets. Any other character is matched as other, and the end of the source as
+# ('', '', ''): every position is matched, so findall never skips a part of the source.
+# Comments run to the end of the line, so the end of a comment is never read as a token.
+_TOKEN = re.compile(r'''
+    (?:[ \t\n\f]+|\#[^\n]*(?![^\n]))*
+    (?:
+        ( """[^"\\]*(?:"(?!"")[^"\\]*)*"""
+        | \'\'\'[^'\\]*(?:'(?!'')[^'\\]*)*\'\'\'
+        | "(?!"")[^"\\\n]*"
+        | '(?!'')[^'\\\n]*'
+        )
+      | ( [][{}(),:] | True\b | False\b | None\b | (?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?![\w.]) )
+      | (.) | \Z
+    )''', re.VERBOSE | re.DOTALL)
+# Blank and comment lines, then the opening brace: an indented first line is an error
+_START = re.compile(r'(?:[ \t\f]*(?:\#[^\n]*)?\n)*\{')
+_END = ('', '', '')
+_CONSTANTS = {'True': True, 'False': False, 'None': None}
+_CLOSING = {'[': ']', '(': ')'}
+
+
+class _Unsupported(Exception):
+    """The source is not made of plain literals only, see _TOKEN"""
+
+
+def _scan_value(tokens, index, depth):
+    """Value starting at tokens[index], as _convert would build it, and the index after it"""
+    string, token, _other = tokens[index]
+    if string:
+        # Adjacent strings are concatenated
+        parts = []
+        while string:
+            parts.append(string[3:-3] if string[1:3] == string[:1] * 2 else string[1:-1])
+            index += 1
+            string = tokens[index][0]
+        return ''.join(parts), index
+    if not token:
+        raise _Unsupported
+    if token in _CONSTANTS:
+        return _CONSTANTS[token], index + 1
+    if token[0].isdigit():
+        return (float(token) if '.' in token else int(token)), index + 1
+    if depth >= MAX_DEPTH:
+        raise _Unsupported
+    if token == '{':
+        if tokens[index + 1][1] == '}':
+            return {}, index + 2
+        key, index = _scan_value(tokens, index + 1, depth + 1)
+        if tokens[index][1] != ':':
+            return _scan_set(tokens, key, index, depth)
+        result = {}
+        while True:
+            if depth == 0 and type(key) is not str:
+                raise _Unsupported
+            result[key], index = _scan_value(tokens, index + 1, depth + 1)
+            token = tokens[index][1]
+            if token == ',':
+                index += 1
+                token = tokens[index][1]
+            elif token != '}':
+                raise _Unsupported
+            if token == '}':
+                return result, index + 1
+            key, index = _scan_value(tokens, index, depth + 1)
+            if tokens[index][1] != ':':
+                raise _Unsupported
+    closing = _CLOSING.get(token)
+    if closing is None:
+        raise _Unsupported
+    result = []
+    index += 1
+    comma = False
+    while tokens[index][1] != closing:
+        item, index = _scan_value(tokens, index, depth + 1)
+        result.append(item)
+        if tokens[index][1] == ',':
+            comma = True
+            index += 1
+        elif tokens[index][1] != closing:
+            raise _Unsupported
+    if token == '(' and len(result) == 1 and not comma:
+        # Parentheses around a single value, not a tuple
+        return result[0], index + 1
+    return result, index + 1
+
+
+def _scan_set(tokens, first, index, depth):
+    result = [first]
+    while tokens[index][1] == ',':
+        index += 1
+        if tokens[index][1] == '}':
+            break
+        item, index = _scan_value(tokens, index, depth + 1)
+        result.append(item)
+    if tokens[index][1] != '}':
+        raise _Unsupported
+    try:
+        return sorted(result), index + 1
+    except TypeError:
+        raise _Unsupported from None
+
+
+def _scan_literal(source):
+    """Fast path of _parse_source: the value of a source made of plain literals only
+
+    Raises:
+        _Unsupported: anything the tokens above do not cover, or any malformed input,
+            for the ast path to parse or to reject with its own error
+    """
+    if '\r' in source or '\0' in source or not _START.match(source):
+        # Newlines are normalized and null bytes rejected by the Python tokenizer
+        raise _Unsupported
+    # Ends with the match of the end of the source, which fails like any other
+    # unexpected token when the literal is not complete
+    tokens = _TOKEN.findall(source)
+    if len(tokens) > MAX_NODES:
+        raise _Unsupported
+    try:
+        result, index = _scan_value(tokens, 0, 0)
+    except (IndexError, TypeError, RecursionError):
+        raise _Unsupported from None
+    if tokens[index] != _END or type(result) is not dict:
+        raise _Unsupported
+    return result
+
+
+def _convert(node, depth, budget):
+    """Convert a literal AST node to a Python value (tuples and sets become lists)"""
+    if depth > MAX_DEPTH:
+        raise ManifestParseError(f"manifest nesting exceeds {MAX_DEPTH} levels")
+    node_type = type(node)
+    if node_type is ast.Constant:
+        return node.value
+
+    budget[0] -= 1
+    if budget[0] < 0:
+        raise ManifestParseError(f"manifest has more than {MAX_NODES} values")
+    if node_type is ast.Dict:
+        result = {}
+        for key, value in zip(node.keys, node.values):
+            if type(key) is not ast.Constant:
+                raise ManifestParseError("manifest keys must be literals")
+            # The manifest itself is used as keyword arguments
+            if depth == 0 and type(key.value) is not str:
+                raise ManifestParseError(f"manifest key {key.value!r} is not a string")
+            result[key.value] = value.value if type(value) is ast.Constant else _convert(value, depth + 1, budget)
+        return result
+    if node_type is ast.List or node_type is ast.Tuple or node_type is ast.Set:
+        elements = node.elts
+        budget[0] -= len(elements)
+        if budget[0] < 0:
+            raise ManifestParseError(f"manifest has more than {MAX_NODES} values")
+        # Lists of plain strings (depends, data files) are the common case
+        result = [element.value if type(element) is ast.Constant else _convert(element, depth + 1, budget)
+                  for element in elements]
+        if node_type is not ast.Set:
+            return result
+        try:
+            return sorted(result)
+        except TypeError:
+            raise ManifestParseError(f"set of mixed types at line {node.lineno}") from None
+    if node_type is ast.UnaryOp and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _convert(node.operand, depth + 1, budget)
+        if isinstance(operand, (int, float)) and not isinstance(operand, bool):
+            return -operand if isinstance(node.op, ast.USub) else operand
+    if node_type is ast.BinOp and isinstance(node.op, ast.Add):
+        # Explicit string concatenation ('a' + 'b') is common in long descriptions
+        left = _convert(node.left, depth + 1, budget)
+        right = _convert(node.right, depth + 1, budget)
+        if isinstance(left, str) and isinstance(right, str):
+            return left + right
+    raise ManifestParseError(f"unsupported expression {node_type.__name__} at line {getattr(node, 'lineno', '?')}")
+
+
+def _as_string(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return ', '.join(str(item) for item in value)
+    return str(value)
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def _as_string_list(value):
+    return [item for item in _as_list(value) if isinstance(item, str)]
+
+
+# Normalizer of each known key, looked up once per key present in the manifest
+NORMALIZERS = dict(
+    dict.fromkeys(STRING_FIELDS, _as_string),
+    **dict.fromkeys(LIST_FIELDS, _as_string_list),
+    **dict.fromkeys(BOOLEAN_FIELDS, bool),
+)
+
+
+def normalize_manifest(manifest):
+    """Give the known manifest keys their expected types, leaving unknown keys untouched"""
+    result = dict(DEFAULTS)
+    result.update(manifest)
+    for key, value in result.items():
+        normalizer = NORMALIZERS.get(key)
+        if normalizer is not None:
+            result[key] = normalizer(value)
+    # auto_install is either a boolean or the list of dependencies triggering it
+    if isinstance(result['auto_install'], list):
+        result['auto_install'] = [item for item in result['auto_install'] if isinstance(item, str)]
+    else:
+        result['auto_install'] = bool(result['auto_install'])
+    if not isinstance(result['external_dependencies'], dict):
+        result['external_dependencies'] = {}
+    else:
+        result['external_dependencies'] = {
+            str(kind): [item for item in _as_list(names) if isinstance(item, str)]
+            for kind, names in result['external_dependencies'].items()
+        }
+    if not isinstance(result['assets'], dict):
+        result['assets'] = {}
+    return result
+
+
+def _parse_tree(source):
+    try:
+        tree = ast.parse(source, mode='eval')
+    except (SyntaxError, ValueError, MemoryError, RecursionError) as e:
+        raise ManifestParseError(f"invalid manifest syntax: {e}") from None
+    if not isinstance(tree.body, ast.Dict):
+        raise ManifestParseError("manifest is not a dict literal")
+    return _convert(tree.body, 0, [MAX_NODES])
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _parse_source(source):
+    try:
+        manifest = _scan_literal(source)
+    except _Unsupported:
+        manifest = _parse_tree(source)
+    return normalize_manifest(manifest)
+
+
+def parse_manifest(source, max_size=MAX_MANIFEST_SIZE):
+    """Parse the source of a ``__manifest__.py`` file.
+
+    Results are memoized on the source text: the same manifest on several branches, or
+    unchanged since the previous sync, is only parsed once per process.
+
+    Args:
+        source: manifest source, str or utf-8 bytes
+        max_size: maximum accepted source size in characters
+    Returns:
+        dict of the manifest with known keys normalized (see normalize_manifest)
+    Raises:
+        ManifestParseError: the source is too large, not a dict literal or too deeply nested
+    """
+    if isinstance(source, bytes):
+        source = source.decode('utf-8-sig', 'replace')
+    if len(source) > max_size:
+        raise ManifestParseError(f"manifest is larger than {max_size} characters")
+    return copy.deepcopy(_parse_source(source.lstrip('\ufeff')))
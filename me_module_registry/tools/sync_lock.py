@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Try-locks serializing the syncs of a repository.
+
+A sync holds two locks for its whole duration:
+
+* a PostgreSQL session level advisory lock on the repository id, shared by every
+  worker and cron process of the database and kept across the commits of the sync;
+* an exclusive ``flock`` on ``<clone dir>.lock``, next to the local clone (not in it,
+  so removing the clone does not remove the lock), which also covers processes
+  working on the same filestore from another database connection.
+
+Neither lock waits: a request finding the repository busy is meant to give up and
+leave the work to the sync already running.
+
+The end of a sync also writes rows shared with the syncs of other repositories (the
+module counts of the Odoo series); that part waits for its turn in serialized_section.
+
+Syncs share the stored manifests too: each transaction picking a manifest holds a
+shared lock on MANIFEST_GC_LOCK until its commit, and the garbage collection of unused
+manifests only runs when it gets the exclusive lock, see try_serialized_section.
+"""
+
+import fcntl
+import os
+from contextlib import ExitStack, contextmanager
+
+from odoo.tools import SQL
+
+# First key of the two-key advisory locks taken on repository ids
+SYNC_LOCK_NAMESPACE = 0x6d72
+# Single key advisory lock of the module counts per Odoo series, see serialized_section
+SERIES_STATS_LOCK = 0x6d725f7374
+# Single key advisory lock between the manifest lookups of syncs (shared) and the
+# garbage collection of unused manifests (exclusive)
+MANIFEST_GC_LOCK = 0x6d725f6763
+
+
+@contextmanager
+def advisory_lock(cr, key):
+    """Session level pg_try_advisory_lock on (SYNC_LOCK_NAMESPACE, key); yields whether it was acquired"""
+    cr.execute(SQL("SELECT pg_try_advisory_lock(%s, %s)", SYNC_LOCK_NAMESPACE, key))
+    if not cr.fetchone()[0]:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        try:
+            cr.execute(SQL("SELECT pg_advisory_unlock(%s, %s)", SYNC_LOCK_NAMESPACE, key))
+        except Exception:
+            # Statements fail in an aborted transaction, the lock would outlive the
+            # cursor on its pooled connection
+            cr.rollback()
+            cr.execute(SQL("SELECT pg_advisory_unlock(%s, %s)", SYNC_LOCK_NAMESPACE, key))
+
+
+@contextmanager
+def serialized_section(cr, key):
+    """Wait for the session level advisory lock on key and hold it over the block
+
+    The pending work of the transaction is committed before waiting, and the transaction
+    is committed again once the lock is held: under REPEATABLE READ, a snapshot taken
+    before the wait would not see the rows written by the previous holder, and updating
+    them would fail with a serialization error. The block commits its own work.
+    """
+    cr.commit()
+    cr.execute(SQL("SELECT pg_advisory_lock(%s)", key))
+    cr.commit()
+    try:
+        yield
+    finally:
+        try:
+            cr.execute(SQL("SELECT pg_advisory_unlock(%s)", key))
+        except Exception:
+            cr.rollback()
+            cr.execute(SQL("SELECT pg_advisory_unlock(%s)", key))
+
+
+@contextmanager
+def try_serialized_section(cr, key):
+    """serialized_section without waiting: yields whether the lock on key was acquired
+
+    The transaction is committed once the lock is held, so the block works on a snapshot
+    that sees every transaction which held the lock before.
+    """
+    cr.execute(SQL("SELECT pg_try_advisory_lock(%s)", key))
+    if not cr.fetchone()[0]:
+        yield False
+        return
+    cr.commit()
+    try:
+        yield True
+    finally:
+        try:
+            cr.execute(SQL("SELECT pg_advisory_unlock(%s)", key))
+        except Exception:
+            cr.rollback()
+            cr.execute(SQL("SELECT pg_advisory_unlock(%s)", key))
+
+
+@contextmanager
+def file_lock(path):
+    """Non-blocking exclusive flock on path + '.lock'; yields whether it was acquired"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f'{path}.lock', 'a') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def repository_lock(cr, repository_id, clone_path):
+    """Both locks of a repository sync; yields whether both were acquired"""
+    with ExitStack() as stack:
+        yield (stack.enter_context(advisory_lock(cr, repository_id))
+               and stack.enter_context(file_lock(clone_path)))
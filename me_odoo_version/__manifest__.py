@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': "Odoo Version Management",
-    'version': '18.0.1.0.0',
+    'version': '18.0.1.1.0',
     'license': "OPL-1",
 
     'summary': """
@@ -1,4 +1,4 @@
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 import logging
 import re
 from datetime import datetime, date
@@ -53,9 +53,6 @@ class OdooVersion(models.Model):
     is_enterprise = fields.Boolean('Enterprise Available', default=True, help='Is Enterprise edition available?')
     is_community = fields.Boolean('Community Available', default=True, help='Is Community edition available?')
     
-    # Statistics (for module registry integration)
-    module_count = fields.Integer('Module Count', compute='_compute_module_count', help='Number of modules for this version')
-    
     _sql_constraints = [
         ('unique_name', 'unique(name)', 'Version name must be unique!'),
         ('unique_major_minor', 'unique(major_version, minor_version)', 'Major.Minor version combination must be unique!'),
@@ -91,16 +88,6 @@ class OdooVersion(models.Model):
             else:
                 version.is_supported = version.status in ['development', 'beta', 'stable', 'maintenance']
 
-    def _compute_module_count(self):
-        for version in self:
-            # Count modules from module registry if available
-            if hasattr(self.env, 'module.registry'):
-                version.module_count = self.env['module.registry'].search_count([
-                    ('odoo_version_id', '=', version.id)
-                ])
-            else:
-                version.module_count = 0
-
     @api.model
     def get_current_version(self):
         """Get the current stable version"""
@@ -172,8 +159,31 @@ class OdooVersion(models.Model):
         major = int(match.group(1))
         minor = float(match.group(2))
 
-        return self.search([('major_version', '=', major), ('minor_version', '=', minor)], limit=1)
-        
+        return self.browse(self._get_version_id(major, minor))
+
+    @api.model
+    @tools.ormcache('major', 'minor')
+    def _get_version_id(self, major, minor):
+        """Id of the version (False when unknown), cached: the registry sync resolves
+        the same few series for every module it processes"""
+        return self.search([('major_version', '=', major), ('minor_version', '=', minor)], limit=1).id
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        versions = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return versions
+
+    def write(self, vals):
+        result = super().write(vals)
+        if 'major_version' in vals or 'minor_version' in vals:
+            self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
 
     def action_open_release_notes(self):
         """Open release notes URL"""